@@ -0,0 +1,339 @@
+"""
+Pagination classes used by the SIA API.
+"""
+import base64
+import binascii
+import datetime
+import json
+from collections import OrderedDict
+
+from datapunt_api.pagination import HALPagination
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.db.models.constants import LOOKUP_SEP
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework import response
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import replace_query_param
+
+
+def _json_default(value):
+    # Do not use the DjangoJSONEncoder, it truncates datetimes to milliseconds which breaks the
+    # equality checks on the cursor position.
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+class EstimatedCountPage(Page):
+    """Page for the `EstimatedCountPaginator`."""
+
+    def __init__(self, object_list, number, paginator, has_next=None):
+        self._has_next = has_next
+        super(EstimatedCountPage, self).__init__(object_list, number, paginator)
+
+    def has_next(self):
+        if self._has_next is None:
+            return super(EstimatedCountPage, self).has_next()
+        return self._has_next
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that does not count more than `count_threshold` rows.
+
+    When the (filtered) queryset contains more rows than the threshold the count is replaced by an
+    estimate. For unfiltered querysets the estimate is taken from the table statistics
+    (`pg_class.reltuples`), otherwise the row estimate of the query planner is used. Because the
+    number of pages is unknown for estimated counts, every page fetches one extra row to determine
+    if there is a next page.
+    """
+    count_threshold = 10000
+
+    count_is_estimate = False
+
+    @cached_property
+    def count(self):
+        if not isinstance(self.object_list, QuerySet):
+            return super(EstimatedCountPaginator, self).count
+
+        queryset = self.object_list.order_by()
+        if not queryset.query.where and not queryset.query.distinct:
+            estimate = self._get_table_estimate(queryset)
+            if estimate > self.count_threshold:
+                self.count_is_estimate = True
+                return estimate
+
+        count = queryset[:self.count_threshold + 1].count()
+        if count > self.count_threshold:
+            self.count_is_estimate = True
+            return max(self._get_planner_estimate(queryset), count)
+        return count
+
+    def validate_number(self, number):
+        if not self.count_is_estimate:
+            return super(EstimatedCountPaginator, self).validate_number(number)
+
+        # The number of pages is unknown, pages after the estimated last page are allowed (and
+        # are empty when the estimate was too high).
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(_('That page number is not an integer'))
+        if number < 1:
+            raise EmptyPage(_('That page number is less than 1'))
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.count_is_estimate:
+            return super(EstimatedCountPaginator, self).page(number)
+
+        bottom = (number - 1) * self.per_page
+        object_list = list(self.object_list[bottom:bottom + self.per_page + 1])
+        return EstimatedCountPage(object_list[:self.per_page], number, self,
+                                  has_next=len(object_list) > self.per_page)
+
+    @staticmethod
+    def _get_table_estimate(queryset):
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute('SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                           [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+        return int(row[0]) if row else 0
+
+    @staticmethod
+    def _get_planner_estimate(queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+
+class HALEstimatedCountPagination(HALPagination):
+    """
+    HAL-JSON pagination that uses the `EstimatedCountPaginator`.
+
+    The response contains a `count_is_estimate` flag next to the `count`. Views that need the exact
+    count can add the `CountModelMixin` which provides a separate `count` endpoint.
+    """
+    django_paginator_class = EstimatedCountPaginator
+
+    def get_paginated_response(self, data):
+        paginated_response = super(HALEstimatedCountPagination, self).get_paginated_response(data)
+        paginated_response.data = OrderedDict([
+            ('_links', paginated_response.data['_links']),
+            ('count', paginated_response.data['count']),
+            ('count_is_estimate', self.page.paginator.count_is_estimate),
+            ('results', paginated_response.data['results']),
+        ])
+        return paginated_response
+
+
+class HALKeysetPagination(HALEstimatedCountPagination):
+    """
+    HAL-JSON pagination with an opt-in keyset (cursor) mode.
+
+    Without the `cursor` query parameter this behaves like the `HALEstimatedCountPagination`. When
+    the `cursor` query parameter is present (an empty value requests the first page) the queryset is
+    paginated on the values of the ordering fields of the last row on the page, with the primary
+    key as tiebreaker. No COUNT query is executed in this mode and the cost of fetching a page does
+    not depend on its depth.
+
+    The cursor in the next/previous links is opaque to clients, it contains the ordering the page
+    was generated with, so a cursor can only be used with the ordering it was created for.
+    """
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    cursor_mode = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            self.cursor_mode = False
+            return super(HALKeysetPagination, self).paginate_queryset(queryset, request, view=view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.cursor_mode = True
+        self.request = request
+        self.model = queryset.model
+
+        self.ordering = self.get_ordering(queryset)
+        position, is_reversed = self.decode_cursor(request)
+
+        ordering = self._reverse_ordering(self.ordering) if is_reversed else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._get_position_filter(ordering, position))
+
+        results = list(queryset[:page_size + 1])
+        has_following = len(results) > page_size
+        results = results[:page_size]
+
+        if is_reversed:
+            results.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = position is not None
+
+        self.page_results = results
+        return results
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super(HALKeysetPagination, self).get_paginated_response(data)
+
+        self_link = self.request.build_absolute_uri()
+        if self_link.endswith('.api'):
+            self_link = self_link[:-4]
+
+        return response.Response(OrderedDict([
+            ('_links', OrderedDict([
+                ('self', dict(href=self_link)),
+                ('next', dict(href=self.get_next_link())),
+                ('previous', dict(href=self.get_previous_link())),
+            ])),
+            ('results', data)
+        ]))
+
+    def get_next_link(self):
+        if not self.cursor_mode:
+            return super(HALKeysetPagination, self).get_next_link()
+
+        if not self.has_next or not self.page_results:
+            return None
+        return self.encode_cursor(self._get_position(self.page_results[-1]), is_reversed=False)
+
+    def get_previous_link(self):
+        if not self.cursor_mode:
+            return super(HALKeysetPagination, self).get_previous_link()
+
+        if not self.has_previous or not self.page_results:
+            return None
+        return self.encode_cursor(self._get_position(self.page_results[0]), is_reversed=True)
+
+    def get_ordering(self, queryset):
+        """
+        Get the ordering of the queryset (as set by the ordering filter backends) with the primary
+        key appended as tiebreaker, so that every row has a unique position.
+        """
+        ordering = [field for field in queryset.query.order_by if isinstance(field, str)]
+        if not ordering:
+            ordering = list(self.model._meta.ordering)
+
+        pk_name = self.model._meta.pk.name
+        if not {pk_name, 'pk'} & {field.lstrip('-') for field in ordering}:
+            descending = ordering[0].startswith('-') if ordering else False
+            ordering.append(f'-{pk_name}' if descending else pk_name)
+
+        return ordering
+
+    def encode_cursor(self, position, is_reversed):
+        payload = json.dumps({'o': self.ordering, 'p': position, 'r': int(is_reversed)},
+                             default=_json_default, separators=(',', ':'))
+        cursor = base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        """
+        Decode the cursor from the request, returns a tuple with the position (or None when the
+        first page is requested) and a boolean indicating the paging direction.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            ordering, position, is_reversed = payload['o'], payload['p'], bool(payload['r'])
+        except (TypeError, ValueError, KeyError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+        if ordering != self.ordering or not isinstance(position, list) or \
+                len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, is_reversed
+
+    @staticmethod
+    def _reverse_ordering(ordering):
+        return [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+
+    def _get_position(self, instance):
+        position = []
+        for field in self.ordering:
+            value = instance
+            for attr in field.lstrip('-').split(LOOKUP_SEP):
+                value = getattr(value, attr, None)
+                if value is None:
+                    break
+            position.append(value)
+        return position
+
+    def _is_nullable(self, field_name):
+        """
+        Check if the value of the (possibly related) field can be NULL in the ordered queryset.
+        """
+        model = self.model
+        for attr in field_name.split(LOOKUP_SEP):
+            try:
+                field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                return True
+            if field.null:
+                return True
+            model = field.related_model
+        return False
+
+    def _get_position_filter(self, ordering, position):
+        """
+        Build the filter selecting all rows that follow the given position.
+
+        PostgreSQL sorts NULL values last in ascending and first in descending order, the filter
+        takes that into account for nullable (related) fields.
+        """
+        position_filter = None
+        equal_filter = Q()
+
+        for field, value in zip(ordering, position):
+            descending = field.startswith('-')
+            name = field.lstrip('-')
+            nullable = self._is_nullable(name)
+
+            if value is None:
+                after = Q(**{f'{name}__isnull': False}) if descending else None
+                equal = Q(**{f'{name}__isnull': True})
+            else:
+                after = Q(**{f'{name}__lt' if descending else f'{name}__gt': value})
+                if nullable and not descending:
+                    after |= Q(**{f'{name}__isnull': True})
+                equal = Q(**{name: value})
+
+            if after is not None:
+                after = equal_filter & after
+                position_filter = after if position_filter is None else position_filter | after
+            equal_filter &= equal
+
+        if position_filter is None:
+            # The position is the last possible row, nothing follows
+            return Q(pk__in=[])
+
+        # Add a range condition on the leading ordering field, this allows the database to start
+        # an index scan at the cursor position
+        field, value = ordering[0], position[0]
+        name = field.lstrip('-')
+        if value is not None and (field.startswith('-') or not self._is_nullable(name)):
+            position_filter &= Q(**{f'{name}__lte' if field.startswith('-') else f'{name}__gte': value})
+
+        return position_filter
@@ -2,6 +2,8 @@ from django.conf import settings
 from rest_framework import exceptions
 from rest_framework.permissions import BasePermission, DjangoModelPermissions
 
+from signals.apps.signals.category_tree import get_visible_category_ids
+
 
 class SIABasePermission(BasePermission):
     perms_map = {
@@ -86,6 +88,7 @@ class SignalChangeStatusPermission(SIABasePermission):
         'GET': ['signals.sia_read'],
         'OPTIONS': [],
         'HEAD': [],
+        'POST': ['signals.sia_write', 'signals.sia_signal_change_status'],
         'PUT': ['signals.sia_write', 'signals.sia_signal_change_status'],
         'PATCH': ['signals.sia_write', 'signals.sia_signal_change_status'],
     }
@@ -101,6 +104,14 @@ class SignalChangeCategoryPermission(SIABasePermission):
     }
 
 
+class SignalExportPermission(SIABasePermission):
+    perms_map = {
+        'GET': ['signals.sia_read', 'signals.sia_signal_export'],
+        'OPTIONS': [],
+        'HEAD': ['signals.sia_read', 'signals.sia_signal_export'],
+    }
+
+
 class ModelWritePermissions(DjangoModelPermissions):
     """
     In SIA we have binary permissions instead of the default add, change, delete permissions
@@ -127,20 +138,9 @@ class SignalViewObjectPermission(DjangoModelPermissions):
             return True
 
         if settings.FEATURE_FLAGS.get('PERMISSION_DEPARTMENTS', False):
-            has_category_read_permission = set(
-                request.user.profile.departments.values_list(
-                    'pk',
-                    flat=True
-                )
-            ).intersection(
-                obj.category_assignment.category.departments.filter(
-                    categorydepartment__can_view=True
-                ).values_list(
-                    'pk',
-                    flat=True
-                )
-            )
-
-            return bool(has_category_read_permission) and request.user.has_perm('signals.sia_read')
+            has_category_read_permission = (obj.category_assignment.category_id in
+                                            get_visible_category_ids(request.user))
+
+            return has_category_read_permission and request.user.has_perm('signals.sia_read')
         else:
             return request.user.has_perm('signals.sia_read')
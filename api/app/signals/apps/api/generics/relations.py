@@ -1,6 +1,8 @@
 from rest_framework import relations
 from rest_framework.reverse import reverse
 
+from signals.apps.api.generics.links import get_link_builder
+
 
 class ParameterisedHyperlinkedRelatedField(relations.HyperlinkedRelatedField):
     lookup_fields = (('pk', 'pk'),)
@@ -56,7 +58,10 @@ class ParameterisedHyperlinkedRelatedField(relations.HyperlinkedRelatedField):
                 if hasattr(attr, field):
                     attr = getattr(attr, field)
             kwargs[url_param] = attr
-        return reverse(view_name, kwargs=kwargs, request=request, format=format)
+
+        if format is not None:
+            return reverse(view_name, kwargs=kwargs, request=request, format=format)
+        return get_link_builder(request).url(view_name, **kwargs)
 
 
 class ParameterisedHyperLinkedIdentityField(ParameterisedHyperlinkedRelatedField):
@@ -0,0 +1,88 @@
+"""
+Renderers of the streaming exports.
+
+The exported rows are written by `render_rows`, a generator that is consumed while the response
+is streamed. The rows are written in batches, the header is yielded before the first row is
+fetched so the client gets the first bytes right away. `render` is only used for error responses,
+which are rendered as JSON.
+"""
+import abc
+import csv
+import io
+import json
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Spreadsheet applications evaluate cells starting with these characters as a formula
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class ExportRenderer(BaseRenderer, metaclass=abc.ABCMeta):
+    charset = 'utf-8'
+    batch_size = 1000
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        json_renderer = JSONRenderer()
+        response = (renderer_context or {}).get('response')
+        if response is not None:
+            response['Content-Type'] = json_renderer.media_type
+        return json_renderer.render(data, json_renderer.media_type, renderer_context)
+
+    def write_header(self, buffer, columns):
+        pass
+
+    @abc.abstractmethod
+    def write_row(self, buffer, columns, row):
+        pass
+
+    def render_rows(self, columns, rows):
+        buffer = io.StringIO()
+
+        def flush():
+            value = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return value
+
+        self.write_header(buffer, columns)
+        yield flush()
+
+        for index, row in enumerate(rows, start=1):
+            self.write_row(buffer, columns, row)
+            if index % self.batch_size == 0:
+                yield flush()
+
+        yield flush()
+
+
+class CSVExportRenderer(ExportRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+    def _to_csv_value(self, value):
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, cls=JSONEncoder)
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+            return f"'{value}"
+        return value
+
+    def write_header(self, buffer, columns):
+        csv.writer(buffer).writerow(columns)
+
+    def write_row(self, buffer, columns, row):
+        csv.writer(buffer).writerow([self._to_csv_value(value) for value in row])
+
+
+class NDJSONExportRenderer(ExportRenderer):
+    """
+    Newline delimited JSON, one JSON object per row.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def write_row(self, buffer, columns, row):
+        buffer.write(json.dumps(dict(zip(columns, row)), cls=JSONEncoder))
+        buffer.write('\n')
@@ -37,3 +37,19 @@ class SIAModelSerializer(serializers.ModelSerializer):
         self.check_permissions()
 
         return super(SIAModelSerializer, self).validate(attrs=attrs)
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin that only serializes the given `fields`, or all fields except `exclude`.
+    """
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        exclude = kwargs.pop('exclude', None)
+        super(SparseFieldsMixin, self).__init__(*args, **kwargs)
+
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+        for field_name in exclude or ():
+            self.fields.pop(field_name, None)
@@ -1,7 +1,12 @@
+import hashlib
+
 from django.conf import settings
 from django.core.exceptions import ValidationError as DjangoValidationError
-from rest_framework import mixins
+from django.utils.cache import get_conditional_response
+from rest_framework import mixins, status
+from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError as DRFValidationError
+from rest_framework.response import Response
 
 
 def convert_validation_error(error):
@@ -27,6 +32,17 @@ class ListModelMixin(mixins.ListModelMixin):
     pass
 
 
+class CountModelMixin:
+    """
+    Adds a `count` endpoint to a list view, returning the exact number of objects in the filtered
+    queryset. Used together with the `HALEstimatedCountPagination` that only estimates large counts.
+    """
+    @action(detail=False, url_path='count')
+    def count(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response({'count': queryset.count()})
+
+
 class RetrieveModelMixin(mixins.RetrieveModelMixin):
     pass
 
@@ -47,6 +63,38 @@ class UpdateModelMixin(mixins.UpdateModelMixin):
             raise convert_validation_error(e)
 
 
+class ConditionalGetMixin:
+    """
+    Conditional GET with weak ETags, for endpoints that clients poll.
+
+    The version given to `conditional_response` is compared with the `If-None-Match` header before
+    the view loads and serializes anything, so getting the version must be cheap (one small query
+    or a cache lookup). When nothing changed the client gets `304 Not Modified`.
+    """
+    def get_etag(self, request, version):
+        # The same object rendered by another renderer (JSON, browsable API) is another entity
+        value = '{}:{}'.format(version, getattr(request.accepted_renderer, 'format', ''))
+        return 'W/"{}"'.format(hashlib.md5(value.encode()).hexdigest())
+
+    def conditional_response(self, request, version, get_response):
+        """
+        Return `304 Not Modified` when the ETag of the version matches, otherwise the response of
+        `get_response()`. A version of None (e.g. the object does not exist) is never matched.
+        """
+        if version is None or request.method not in ('GET', 'HEAD'):
+            return get_response()
+
+        etag = self.get_etag(request, version)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = get_response()
+            if response.status_code != status.HTTP_200_OK:
+                return response
+
+        response['ETag'] = etag
+        return response
+
+
 class FeatureFlagMixin:
     feature_flag_setting_kwarg = None
 
@@ -3,6 +3,7 @@ from urllib.parse import urlparse
 from django.urls import resolve
 from rest_framework.reverse import reverse
 
+from signals.apps.signals.category_tree import get_category_tree
 from signals.apps.signals.models import Category
 
 
@@ -11,13 +12,9 @@ def get_category_from_prediction(category_url):
     if not hasattr(resolved, 'kwargs'):
         return category_url, False
 
-    slug = resolved.kwargs['sub_slug'] if 'sub_slug' in resolved.kwargs else resolved.kwargs['slug']
-    parent_isnull = False if 'sub_slug' in resolved.kwargs else True
-
-    category = Category.objects.get(slug=slug, parent__isnull=parent_isnull)
-    if category.is_translated():
-        return category.translated_to()
-    return category
+    category_tree = get_category_tree()
+    category = category_tree.get_by_slugs(resolved.kwargs['slug'], resolved.kwargs.get('sub_slug'))
+    return category_tree.translated_to(category) or category
 
 
 def translate_prediction_category_url(category_url, request=None):
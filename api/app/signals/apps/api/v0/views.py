@@ -23,6 +23,7 @@ from signals.apps.api.generics.filters import (
     SignalFilter,
     StatusFilter
 )
+from signals.apps.api.generics.pagination import HALEstimatedCountPagination
 from signals.apps.api.generics.permissions import (
     CategoryPermission,
     LocationPermission,
@@ -30,6 +31,7 @@ from signals.apps.api.generics.permissions import (
     PriorityPermission,
     StatusPermission
 )
+from signals.apps.api.mixins import CountModelMixin
 from signals.apps.api.ml_tool.proxy.client import MLToolClient
 from signals.apps.api.ml_tool.utils import translate_prediction_category_url, url_from_category
 from signals.apps.api.v0.serializers import (
@@ -124,8 +126,9 @@ class SignalViewSet(mixins.CreateModelMixin,
     lookup_field = 'signal_id'
 
 
-class SignalAuthViewSet(DatapuntViewSet):
+class SignalAuthViewSet(CountModelMixin, DatapuntViewSet):
     authentication_classes = (JWTAuthBackend, )
+    pagination_class = HALEstimatedCountPagination
     queryset = Signal.objects.all()
     serializer_detail_class = SignalAuthHALSerializerDetail
     serializer_class = SignalAuthHALSerializerList
@@ -167,8 +170,9 @@ class SignalAuthViewSet(DatapuntViewSet):
         return queryset
 
 
-class LocationAuthViewSet(mixins.CreateModelMixin, DatapuntViewSet):
+class LocationAuthViewSet(mixins.CreateModelMixin, CountModelMixin, DatapuntViewSet):
     authentication_classes = (JWTAuthBackend, )
+    pagination_class = HALEstimatedCountPagination
     permission_classes = (LocationPermission, )
     queryset = Location.objects.all().order_by('created_at').prefetch_related('signal')
     serializer_detail_class = LocationHALSerializer
@@ -177,8 +181,9 @@ class LocationAuthViewSet(mixins.CreateModelMixin, DatapuntViewSet):
     filterset_class = LocationFilter
 
 
-class StatusAuthViewSet(mixins.CreateModelMixin, DatapuntViewSet):
+class StatusAuthViewSet(mixins.CreateModelMixin, CountModelMixin, DatapuntViewSet):
     authentication_classes = (JWTAuthBackend, )
+    pagination_class = HALEstimatedCountPagination
     permission_classes = (StatusPermission, )
     queryset = Status.objects.all().order_by('created_at')
     serializer_detail_class = StatusHALSerializer
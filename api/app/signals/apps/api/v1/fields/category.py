@@ -1,23 +1,34 @@
 from collections import OrderedDict
 
 from rest_framework import serializers
-from rest_framework.reverse import reverse
 
+from signals.apps.api.generics.links import get_link_builder
 from signals.apps.api.generics.relations import (
     ParameterisedHyperLinkedIdentityField,
     ParameterisedHyperlinkedRelatedField
 )
+from signals.apps.signals.category_tree import get_category_tree
 from signals.apps.signals.models import Category
 
 
+def _get_slug_kwargs(category):
+    """
+    Return the URL kwargs of the public category URL, the parent is taken from the category tree.
+    """
+    if category.parent_id is None:
+        return {'slug': category.slug}
+    parent = get_category_tree().get(category.parent_id)
+    return {'slug': parent.slug, 'sub_slug': category.slug}
+
+
 class ParentCategoryHyperlinkedIdentityField(serializers.HyperlinkedIdentityField):
     lookup_field = 'slug'
 
     def to_representation(self, value):
-        request = self.context.get('request')
+        links = get_link_builder(self.context.get('request'))
         result = OrderedDict([
-            ('curies', dict(name='sia', href=self.reverse('signal-namespace', request=request))),
-            ('self', dict(href=self.get_url(value, 'category-detail', request, None))),
+            ('curies', dict(name='sia', href=links.url('signal-namespace'))),
+            ('self', dict(href=links.url('category-detail', slug=value.slug))),
         ])
 
         return result
@@ -27,10 +38,10 @@ class CategoryHyperlinkedIdentityField(ParameterisedHyperLinkedIdentityField):
     lookup_fields = (('parent.slug', 'slug'), ('slug', 'sub_slug'),)
 
     def to_representation(self, value):
-        request = self.context.get('request')
+        links = get_link_builder(self.context.get('request'))
         hyperlink = super(ParameterisedHyperlinkedRelatedField, self).to_representation(value=value)
         result = OrderedDict([
-            ('curies', dict(name='sia', href=self.reverse('signal-namespace', request=request))),
+            ('curies', dict(name='sia', href=links.url('signal-namespace'))),
             ('self', {'href': hyperlink})
         ])
 
@@ -43,6 +54,9 @@ class CategoryHyperlinkedRelatedField(ParameterisedHyperlinkedRelatedField):
     view_name = 'category-detail'
     queryset = Category.objects.all()
 
+    def get_object(self, view_name, view_args, view_kwargs):
+        return get_category_tree().get_by_slugs(view_kwargs['slug'], view_kwargs.get('sub_slug'))
+
 
 class LegacyCategoryHyperlinkedRelatedField(serializers.HyperlinkedRelatedField):
     view_name = 'category-detail'
@@ -61,66 +75,38 @@ class LegacyCategoryHyperlinkedRelatedField(serializers.HyperlinkedRelatedField)
         return value
 
     def get_url(self, obj: Category, view_name, request, format):
-
-        if obj.is_child():
-            url_kwargs = {
-                'slug': obj.parent.slug,
-                'sub_slug': obj.slug,
-            }
-        else:
-            url_kwargs = {
-                'slug': obj.slug,
-            }
-
-        # Tricking DRF to use API version `v1` because our `category-detail` view lives in API
-        # version 1. Afterwards we revert back to the origional API version from the request.
-        original_version = request.version
-        request.version = 'v1'
-        url = reverse(view_name, kwargs=url_kwargs, request=request, format=format)
-        request.version = original_version
-
-        return url
+        # Our `category-detail` view lives in API version 1, whatever the version of the request
+        return get_link_builder(request).url(f'v1:{view_name}', **_get_slug_kwargs(obj))
 
     def get_object(self, view_name, view_args, view_kwargs):
-        return self.get_queryset().get(
-            parent__slug=view_kwargs['slug'],
-            slug=view_kwargs['sub_slug'])
+        return get_category_tree().get_by_slugs(view_kwargs['slug'], view_kwargs['sub_slug'])
 
 
 class PrivateCategoryHyperlinkedIdentityField(serializers.HyperlinkedIdentityField):
-    def _get_public_url(self, obj, request=None):
-        if obj.is_child():
-            kwargs = {'slug': obj.parent.slug, 'sub_slug': obj.slug}
-        else:
-            kwargs = {'slug': obj.slug}
-        return self.reverse('category-detail', kwargs=kwargs, request=request)
-
-    def _get_status_message_templates_url(self, obj, request=None):
-        if obj.is_child():
-            kwargs = {'slug': obj.parent.slug, 'sub_slug': obj.slug}
-            return self.reverse('private-status-message-templates-child', kwargs=kwargs, request=request)
-        else:
-            kwargs = {'slug': obj.slug}
-            return self.reverse('private-status-message-templates-parent', kwargs=kwargs, request=request)
-
     def to_representation(self, value):
-        request = self.context.get('request')
+        links = get_link_builder(self.context.get('request'))
+        slug_kwargs = _get_slug_kwargs(value)
+        if value.parent_id is None:
+            status_message_templates_url = links.url('private-status-message-templates-parent',
+                                                     **slug_kwargs)
+        else:
+            status_message_templates_url = links.url('private-status-message-templates-child',
+                                                     **slug_kwargs)
 
         result = OrderedDict([
-            ('curies', dict(name='sia', href=self.reverse('signal-namespace', request=request))),
+            ('curies', dict(name='sia', href=links.url('signal-namespace'))),
             ('self', dict(
-                href=self.get_url(value, 'private-category-detail', request, None),
-                public=self._get_public_url(obj=value, request=request),
+                href=links.url('private-category-detail', pk=value.pk),
+                public=links.url('category-detail', **slug_kwargs),
              )),
-            ('sia:status-message-templates', dict(
-                href=self._get_status_message_templates_url(obj=value, request=request)
-            ))
+            ('sia:status-message-templates', dict(href=status_message_templates_url))
         ])
 
-        if value.is_child():
+        if value.parent_id is not None:
+            parent = get_category_tree().get(value.parent_id)
             result.update({'sia:parent': dict(
-                href=self.get_url(value.parent, 'private-category-detail', request, None),
-                public=self._get_public_url(obj=value.parent, request=request))
+                href=links.url('private-category-detail', pk=parent.pk),
+                public=links.url('category-detail', slug=parent.slug))
             })
 
         return result
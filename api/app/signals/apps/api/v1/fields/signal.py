@@ -2,30 +2,32 @@ from collections import OrderedDict
 
 from rest_framework import serializers
 
+from signals.apps.api.generics.links import get_link_builder
+
 
 class PrivateSignalLinksFieldWithArchives(serializers.HyperlinkedIdentityField):
     def to_representation(self, value):
-        request = self.context.get('request')
+        links = get_link_builder(self.context.get('request'))
 
         result = OrderedDict([
-            ('curies', dict(name='sia', href=self.reverse("signal-namespace", request=request))),
-            ('self', dict(href=self.get_url(value, "private-signals-detail", request, None))),
-            ('archives', dict(href=self.get_url(value, "private-signals-history", request, None))),
-            ('sia:attachments',
-             dict(href=self.get_url(value, "private-signals-attachments", request, None))),
-            ('sia:pdf', dict(href=self.get_url(value, "signal-pdf-download", request, None))),
+            ('curies', dict(name='sia', href=links.url('signal-namespace'))),
+            ('self', dict(href=links.url('private-signals-detail', pk=value.pk))),
+            ('archives', dict(href=links.url('private-signals-history', pk=value.pk))),
+            ('sia:attachments', dict(href=links.url('private-signals-attachments', pk=value.pk))),
+            ('sia:pdf', dict(href=links.url('signal-pdf-download', pk=value.pk))),
         ])
 
-        if value.is_child():
+        # `is_child` and `is_parent` query the database, the parent id and the prefetched children
+        # are enough for the links
+        if value.parent_id is not None:
             result.update({
-                'sia:parent':
-                dict(href=self.get_url(value.parent, "private-signals-detail", request, None))
+                'sia:parent': dict(href=links.url('private-signals-detail', pk=value.parent_id))
             })
 
-        if value.is_parent():
+        children = value.children.all()
+        if children:
             result.update({'sia:children': [
-                dict(href=self.get_url(child, "private-signals-detail", request, None))
-                for child in value.children.all()
+                dict(href=links.url('private-signals-detail', pk=child.pk)) for child in children
             ]})
 
         return result
@@ -34,10 +36,10 @@ class PrivateSignalLinksFieldWithArchives(serializers.HyperlinkedIdentityField):
 class PrivateSignalLinksField(serializers.HyperlinkedIdentityField):
 
     def to_representation(self, value):
-        request = self.context.get('request')
+        links = get_link_builder(self.context.get('request'))
 
         result = OrderedDict([
-            ('self', dict(href=self.get_url(value, "v1:private-signals-detail", request, None))),
+            ('self', dict(href=links.url('v1:private-signals-detail', pk=value.pk))),
         ])
 
         return result
@@ -47,10 +49,10 @@ class PublicSignalLinksField(serializers.HyperlinkedIdentityField):
     lookup_field = 'signal_id'
 
     def to_representation(self, value):
-        request = self.context.get('request')
+        links = get_link_builder(self.context.get('request'))
 
         result = OrderedDict([
-            ('self', dict(href=self.get_url(value, "public-signals-detail", request, None))),
+            ('self', dict(href=links.url('public-signals-detail', signal_id=value.signal_id))),
         ])
 
         return result
@@ -140,6 +140,42 @@ class SignalFilter(FilterSet):
         return queryset.exclude(reporter__email='', reporter__phone='')
 
 
+class SignalReadModelFilter(SignalFilter):
+    """
+    `SignalFilter` that filters on the denormalized `SignalReadModel` instead of joining the
+    location, status, category, priority and reporter tables.
+    """
+    created_before = filters.IsoDateTimeFilter(field_name='read_model__created_at',
+                                               lookup_expr='lte')
+    created_after = filters.IsoDateTimeFilter(field_name='read_model__created_at',
+                                              lookup_expr='gte')
+
+    status = filters.MultipleChoiceFilter(field_name='read_model__state', choices=status_choices)
+
+    priority = filters.ChoiceFilter(field_name='read_model__priority',
+                                    choices=Priority.PRIORITY_CHOICES)
+
+    stadsdeel = filters.MultipleChoiceFilter(field_name='read_model__stadsdeel',
+                                             choices=stadsdelen)
+    buurt_code = filters.MultipleChoiceFilter(field_name='read_model__buurt_code',
+                                              choices=buurt_choices)
+    address_text = filters.CharFilter(field_name='read_model__address_text',
+                                      lookup_expr='icontains')
+
+    def _categories_filter(self, queryset, main_categories, sub_categories):
+        if not main_categories and not sub_categories:
+            return queryset
+
+        queryset = queryset.filter(
+            Q(read_model__main_category_id__in=[c.pk for c in main_categories]) |
+            Q(read_model__category_id__in=[c.pk for c in sub_categories])
+        )
+        return queryset
+
+    def is_anonymous_filter(self, queryset, name, value):
+        return queryset.filter(read_model__is_anonymous=value)
+
+
 class SignalCategoryRemovedAfterFilter(FilterSet):
     before = filters.IsoDateTimeFilter(field_name='category_assignment__created_at',
                                        lookup_expr='lte')
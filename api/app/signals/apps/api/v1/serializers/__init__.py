@@ -9,6 +9,7 @@ from signals.apps.api.v1.serializers.attachment import (
 from signals.apps.api.v1.serializers.category import (
     CategoryHALSerializer,
     ParentCategoryHALSerializer,
+    ParentCategoryTreeSerializer,
     PrivateCategorySerializer
 )
 from signals.apps.api.v1.serializers.departments import (
@@ -24,6 +25,7 @@ from signals.apps.api.v1.serializers.signal import (
 )
 from signals.apps.api.v1.serializers.signal_history import HistoryHalSerializer
 from signals.apps.api.v1.serializers.signal_split import PrivateSplitSignalSerializer
+from signals.apps.api.v1.serializers.signal_status_bulk import PrivateSignalStatusBulkSerializer
 from signals.apps.api.v1.serializers.status_message_template import (
     StateStatusMessageTemplateListSerializer,
     StateStatusMessageTemplateSerializer
@@ -38,6 +40,7 @@ __all__ = [
     'StateStatusMessageTemplateSerializer',
     'CategoryHALSerializer',
     'ParentCategoryHALSerializer',
+    'ParentCategoryTreeSerializer',
     'HistoryHalSerializer',
     'PrivateDepartmentSerializerDetail',
     'PrivateDepartmentSerializerList',
@@ -46,6 +49,7 @@ __all__ = [
     'PublicSignalSerializerDetail',
     'PublicSignalCreateSerializer',
     'PrivateSplitSignalSerializer',
+    'PrivateSignalStatusBulkSerializer',
     'SignalIdListSerializer',
     'StoredSignalFilterSerializer',
     'PrivateCategorySerializer',
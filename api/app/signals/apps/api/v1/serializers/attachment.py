@@ -41,7 +41,8 @@ class SignalAttachmentSerializer(HALSerializer):
 
         if self.context['request'].user:
             attachment.created_by = self.context['request'].user.email
-            attachment.save()
+            # The renditions may have been stored in the background already
+            attachment.save(update_fields=['created_by', 'updated_at'])
 
         return attachment
 
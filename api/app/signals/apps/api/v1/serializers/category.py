@@ -52,6 +52,18 @@ class ParentCategoryHALSerializer(HALSerializer):
         )
 
 
+class ParentCategoryTreeSerializer(ParentCategoryHALSerializer):
+    """
+    Main category with its sub categories, used to serialize the category tree in memory. The sub
+    categories are given by main category id in the `sub_categories` of the context.
+    """
+    sub_categories = serializers.SerializerMethodField()
+
+    def get_sub_categories(self, obj):
+        sub_categories = self.context['sub_categories'].get(obj.id, [])
+        return CategoryHALSerializer(sub_categories, many=True, context=self.context).data
+
+
 class PrivateCategorySLASerializer(serializers.ModelSerializer):
     class Meta:
         model = ServiceLevelObjective
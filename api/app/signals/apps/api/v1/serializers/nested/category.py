@@ -5,6 +5,7 @@ from signals.apps.api.v1.fields import (
     CategoryHyperlinkedRelatedField,
     LegacyCategoryHyperlinkedRelatedField
 )
+from signals.apps.signals.category_tree import get_category_tree
 from signals.apps.signals.models import CategoryAssignment
 
 
@@ -46,4 +47,5 @@ class _NestedCategoryModelSerializer(SIAModelSerializer):
         )
 
     def get_departments(self, obj):
-        return ', '.join(obj.category.departments.values_list('code', flat=True))
+        category = get_category_tree().get(obj.category_id)
+        return ', '.join(department.code for department in category.departments.all())
@@ -10,6 +10,7 @@ from signals.apps.api.generics.permissions.base import (
     SignalCreateInitialPermission,
     SignalCreateNotePermission
 )
+from signals.apps.api.generics.serializers import SparseFieldsMixin
 from signals.apps.api.generics.validators import SignalSourceValidator
 from signals.apps.api.v1.fields import (
     PrivateSignalLinksField,
@@ -137,9 +138,22 @@ class PrivateSignalSerializerDetail(HALSerializer, AddressValidationMixin):
         return signal
 
 
-class PrivateSignalSerializerList(HALSerializer, AddressValidationMixin):
+class PrivateSignalBulkCreateListSerializer(serializers.ListSerializer):
+    """
+    Creates all signals with one `Signal.actions.create_initial_bulk` call, used with `many=True`.
+    """
+    def create(self, validated_data):
+        return Signal.actions.create_initial_bulk(
+            [self.child.get_create_initial_data(item) for item in validated_data]
+        )
+
+
+class PrivateSignalSerializerList(SparseFieldsMixin, HALSerializer, AddressValidationMixin):
     """
     This serializer is used for the list endpoint and when creating a new instance
+
+    The list endpoint annotates `has_attachments` and `notes_count`, and only loads the newest
+    notes (see `PrivateSignalViewSet.get_list_queryset`).
     """
     serializer_url_field = PrivateSignalLinksField
     _display = DisplayField()
@@ -174,6 +188,7 @@ class PrivateSignalSerializerList(HALSerializer, AddressValidationMixin):
     )
 
     has_attachments = serializers.SerializerMethodField()
+    notes_count = serializers.SerializerMethodField()
 
     extra_properties = SignalExtraPropertiesField(
         required=False,
@@ -208,20 +223,31 @@ class PrivateSignalSerializerList(HALSerializer, AddressValidationMixin):
             'has_attachments',
             'extra_properties',
             'notes',
+            'notes_count',
         )
         read_only_fields = (
             'created_at',
             'updated_at',
             'has_attachments',
+            'notes_count',
         )
         extra_kwargs = {
             'source': {'validators': [SignalSourceValidator()]},
         }
+        list_serializer_class = PrivateSignalBulkCreateListSerializer
 
     def get_has_attachments(self, obj):
+        if hasattr(obj, 'has_attachments'):
+            return obj.has_attachments
         return obj.attachments.exists()
 
-    def create(self, validated_data):
+    def get_notes_count(self, obj):
+        if hasattr(obj, 'notes_count'):
+            return obj.notes_count
+        return obj.notes.count()
+
+    def get_create_initial_data(self, validated_data):
+        """Get the keyword arguments for `Signal.actions.create_initial` from validated data."""
         if validated_data.get('status') is not None:
             raise serializers.ValidationError("Status cannot be set on initial creation")
 
@@ -248,14 +274,17 @@ class PrivateSignalSerializerList(HALSerializer, AddressValidationMixin):
         })
         priority_data['created_by'] = logged_in_user.email
 
-        signal = Signal.actions.create_initial(
-            validated_data,
-            location_data,
-            INITIAL_STATUS,
-            category_assignment_data,
-            reporter_data,
-            priority_data
-        )
+        return {
+            'signal_data': validated_data,
+            'location_data': location_data,
+            'status_data': INITIAL_STATUS,
+            'category_assignment_data': category_assignment_data,
+            'reporter_data': reporter_data,
+            'priority_data': priority_data,
+        }
+
+    def create(self, validated_data):
+        signal = Signal.actions.create_initial(**self.get_create_initial_data(validated_data))
         return signal
 
 
@@ -0,0 +1,17 @@
+"""
+Serializer for changing the status of multiple `api.Signal` instances at once.
+"""
+from rest_framework import serializers
+
+from signals.apps.api.v1.serializers.nested import _NestedStatusModelSerializer
+
+
+class PrivateSignalStatusBulkSerializer(serializers.Serializer):
+    signal_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        allow_empty=False,
+        help_text='Signals to update, when left out the signals matching the filter parameters '
+                  'are updated',
+    )
+    status = _NestedStatusModelSerializer()
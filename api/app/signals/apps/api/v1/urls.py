@@ -88,6 +88,9 @@ urlpatterns = [
         path('signals/category/removed',
              SignalCategoryRemovedAfterViewSet.as_view({'get': 'list'}),
              name='signal-category-changed-since'),
+        path('signals/category/removed/count',
+             SignalCategoryRemovedAfterViewSet.as_view({'get': 'count'}),
+             name='signal-category-changed-since-count'),
 
         # Search
         path('search', SearchView.as_view({'get': 'list'}), name='elastic-search')
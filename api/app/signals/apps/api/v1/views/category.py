@@ -1,27 +1,97 @@
+from collections import defaultdict
+from functools import partial
+
 from datapunt_api.pagination import HALPagination
 from datapunt_api.rest import DatapuntViewSet
+from django.core.cache import cache
+from rest_framework.decorators import action
 from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
 from signals.apps.api.generics.permissions import ModelWritePermissions, SIAPermissions
-from signals.apps.api.mixins import RetrieveModelMixin, UpdateModelMixin
+from signals.apps.api.mixins import ConditionalGetMixin, RetrieveModelMixin, UpdateModelMixin
 from signals.apps.api.v1.serializers import (
     CategoryHALSerializer,
     ParentCategoryHALSerializer,
+    ParentCategoryTreeSerializer,
     PrivateCategorySerializer
 )
+from signals.apps.signals.category_tree import get_category_tree
 from signals.apps.signals.models import Category
 from signals.auth.backend import JWTAuthBackend
 
+# The serialized tree is cached per category tree version, old versions are never used again
+CATEGORY_TREE_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class CategoryTreeConditionalGetMixin(ConditionalGetMixin):
+    """
+    The categories are versioned by the category tree, its version changes with every change to a
+    category, its departments or its service level objectives.
+    """
+    def list(self, request, *args, **kwargs):
+        get_response = partial(super(CategoryTreeConditionalGetMixin, self).list,
+                               request, *args, **kwargs)
+        return self.conditional_response(request, get_category_tree().version, get_response)
 
-class ParentCategoryViewSet(DatapuntViewSet):
+    def retrieve(self, request, *args, **kwargs):
+        get_response = partial(super(CategoryTreeConditionalGetMixin, self).retrieve,
+                               request, *args, **kwargs)
+        return self.conditional_response(request, get_category_tree().version, get_response)
+
+
+class ParentCategoryViewSet(CategoryTreeConditionalGetMixin, DatapuntViewSet):
     queryset = Category.objects.filter(parent__isnull=True)
     serializer_detail_class = ParentCategoryHALSerializer
     serializer_class = ParentCategoryHALSerializer
     lookup_field = 'slug'
 
+    @action(detail=False, url_path='tree')
+    def tree(self, request):
+        """
+        All active main categories with their active sub categories in one response, serialized
+        from the category tree in memory and cached until a category or department changes.
+        """
+        category_tree = get_category_tree()
+        get_response = partial(self._get_tree_response, request, category_tree)
+        return self.conditional_response(request, category_tree.version, get_response)
+
+    def _get_tree_response(self, request, category_tree):
+        # The tree contains absolute links, built for the URL of the request
+        cache_key = f'signals_public_category_tree_{category_tree.version}'
+        cache_version = request.build_absolute_uri()
 
-class ChildCategoryViewSet(RetrieveModelMixin, GenericViewSet):
+        if category_tree.version is not None:
+            entry = cache.get(cache_key)
+            if entry is not None and entry[0] == cache_version:
+                return Response(entry[1])
+
+        main_categories = []
+        sub_categories = defaultdict(list)
+        for category in category_tree.id_to_category.values():
+            if not category.is_active:
+                continue
+            if category.parent_id is None:
+                main_categories.append(category)
+            else:
+                sub_categories[category.parent_id].append(category)
+
+        context = self.get_serializer_context()
+        context['sub_categories'] = sub_categories
+        data = {
+            '_links': {'self': {'href': cache_version}},
+            'count': len(main_categories),
+            'results': ParentCategoryTreeSerializer(main_categories, many=True,
+                                                    context=context).data,
+        }
+
+        if category_tree.version is not None:
+            cache.set(cache_key, (cache_version, data), CATEGORY_TREE_CACHE_TIMEOUT)
+        return Response(data)
+
+
+class ChildCategoryViewSet(ConditionalGetMixin, RetrieveModelMixin, GenericViewSet):
     queryset = Category.objects.all()
     serializer_class = CategoryHALSerializer
     pagination_class = HALPagination
@@ -39,8 +109,12 @@ class ChildCategoryViewSet(RetrieveModelMixin, GenericViewSet):
         self.check_object_permissions(self.request, obj)
         return obj
 
+    def retrieve(self, request, *args, **kwargs):
+        get_response = partial(super(ChildCategoryViewSet, self).retrieve, request, *args, **kwargs)
+        return self.conditional_response(request, get_category_tree().version, get_response)
+
 
-class PrivateCategoryViewSet(UpdateModelMixin, DatapuntViewSet):
+class PrivateCategoryViewSet(UpdateModelMixin, CategoryTreeConditionalGetMixin, DatapuntViewSet):
     serializer_class = PrivateCategorySerializer
     serializer_detail_class = PrivateCategorySerializer
 
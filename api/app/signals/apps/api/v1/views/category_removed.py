@@ -1,11 +1,11 @@
 """
 ViewSet that returns `signals.Signal` instance dropped out of a category.
 """
-from datapunt_api.rest import HALPagination
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets
 
 from signals.apps.api import mixins
+from signals.apps.api.generics.pagination import HALEstimatedCountPagination
 from signals.apps.api.generics.permissions import SIAPermissions
 from signals.apps.api.v1.filters import SignalCategoryRemovedAfterFilter
 from signals.apps.api.v1.serializers import SignalIdListSerializer
@@ -13,9 +13,10 @@ from signals.apps.signals.models import Signal
 from signals.auth.backend import JWTAuthBackend
 
 
-class SignalCategoryRemovedAfterViewSet(viewsets.GenericViewSet, mixins.ListModelMixin):
+class SignalCategoryRemovedAfterViewSet(viewsets.GenericViewSet, mixins.ListModelMixin,
+                                        mixins.CountModelMixin):
     serializer_class = SignalIdListSerializer
-    pagination_class = HALPagination
+    pagination_class = HALEstimatedCountPagination
 
     authentication_classes = (JWTAuthBackend,)
     permission_classes = (SIAPermissions,)
@@ -1,24 +1,57 @@
-from datapunt_api.rest import DatapuntViewSet, HALPagination
+from functools import partial
+
+from datapunt_api.pagination import HALPagination
+from datapunt_api.rest import DatapuntViewSet
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import EMPTY_VALUES
+from django.db.models import (
+    Count,
+    Exists,
+    FloatField,
+    Func,
+    IntegerField,
+    Max,
+    OuterRef,
+    Prefetch,
+    Subquery
+)
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.functions import Coalesce
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import DateTimeField
 from rest_framework.mixins import CreateModelMixin, RetrieveModelMixin
 from rest_framework.response import Response
 from rest_framework_extensions.mixins import DetailSerializerMixin
 
 from signals.apps.api import mixins
 from signals.apps.api.generics.filters import FieldMappingOrderingFilter
+from signals.apps.api.generics.pagination import HALKeysetPagination
 from signals.apps.api.generics.permissions import SignalCreateInitialPermission
-from signals.apps.api.generics.permissions.base import SignalViewObjectPermission
-from signals.apps.api.v1.filters import SignalFilter
+from signals.apps.api.generics.permissions.base import (
+    SignalChangeStatusPermission,
+    SignalExportPermission,
+    SignalViewObjectPermission
+)
+from signals.apps.api.generics.renderers import CSVExportRenderer, NDJSONExportRenderer
+from signals.apps.api.v1.filters import SignalFilter, SignalReadModelFilter
 from signals.apps.api.v1.serializers import (
     HistoryHalSerializer,
     PrivateSignalSerializerDetail,
     PrivateSignalSerializerList,
+    PrivateSignalStatusBulkSerializer,
     PublicSignalCreateSerializer,
-    PublicSignalSerializerDetail
+    PublicSignalSerializerDetail,
+    SignalIdListSerializer
 )
 from signals.apps.api.v1.views._base import PublicSignalGenericViewSet
-from signals.apps.signals.models import History, Signal
+from signals.apps.signals.category_tree import get_category_tree
+from signals.apps.signals.detail_cache import cache_detail, get_cached_detail
+from signals.apps.signals.models import Attachment, History, Note, Signal
 from signals.auth.backend import JWTAuthBackend
 
 
@@ -28,7 +61,8 @@ class PublicSignalViewSet(CreateModelMixin, DetailSerializerMixin, RetrieveModel
     serializer_detail_class = PublicSignalSerializerDetail
 
 
-class PrivateSignalViewSet(mixins.CreateModelMixin, mixins.UpdateModelMixin, DatapuntViewSet):
+class PrivateSignalViewSet(mixins.CreateModelMixin, mixins.UpdateModelMixin, mixins.CountModelMixin,
+                           mixins.ConditionalGetMixin, DatapuntViewSet):
     """Viewset for `Signal` objects in V1 private API"""
     queryset = Signal.objects.select_related(
         'location',
@@ -48,14 +82,28 @@ class PrivateSignalViewSet(mixins.CreateModelMixin, mixins.UpdateModelMixin, Dat
     serializer_class = PrivateSignalSerializerList
     serializer_detail_class = PrivateSignalSerializerDetail
 
-    pagination_class = HALPagination
+    # The relations used to serialize the fields of the list, only the relations of the requested
+    # fields (?fields=, ?exclude=) are loaded
+    list_select_related = {
+        '_display': ('status', 'location'),
+        'status': ('status', ),
+        'location': ('location', ),
+        'category': ('category_assignment__category__parent', ),
+        'reporter': ('reporter', ),
+        'priority': ('priority', ),
+        'extra_properties': ('category_assignment__category__parent', ),
+    }
+    # The fields of the list that are not stored in a column of the signal
+    list_computed_fields = ('_links', '_display', 'has_attachments', 'notes', 'notes_count')
+
+    pagination_class = HALKeysetPagination
+    history_pagination_class = HALPagination
 
     authentication_classes = (JWTAuthBackend,)
     permission_classes = (SignalCreateInitialPermission,)
     object_permission_classes = (SignalViewObjectPermission, )
 
     filter_backends = (DjangoFilterBackend, FieldMappingOrderingFilter, )
-    filterset_class = SignalFilter
 
     ordering = ('-created_at', )
     ordering_fields = (
@@ -69,7 +117,7 @@ class PrivateSignalViewSet(mixins.CreateModelMixin, mixins.UpdateModelMixin, Dat
         'priority',
         'address',
     )
-    ordering_field_mappings = {
+    default_ordering_field_mappings = {
         'id': 'id',
         'created_at': 'created_at',
         'updated_at': 'updated_at',
@@ -80,16 +128,148 @@ class PrivateSignalViewSet(mixins.CreateModelMixin, mixins.UpdateModelMixin, Dat
         'priority': 'priority__priority',
         'address': 'location__address_text',
     }
+    read_model_ordering_field_mappings = {
+        'id': 'id',
+        'created_at': 'read_model__created_at',
+        'updated_at': 'updated_at',
+        'stadsdeel': 'read_model__stadsdeel',
+        'sub_category': 'read_model__category_slug',
+        'main_category': 'read_model__main_category_slug',
+        'status': 'read_model__state',
+        'priority': 'read_model__priority',
+        'address': 'read_model__address_text',
+    }
 
     http_method_names = ['get', 'post', 'patch', 'head', 'options', 'trace']
 
+    # The columns of the export and the lookups of their values
+    export_fields = (
+        ('id', 'id'),
+        ('signal_id', 'signal_id'),
+        ('source', 'source'),
+        ('text', 'text'),
+        ('text_extra', 'text_extra'),
+        ('status', 'status__state'),
+        ('main_category', 'category_assignment__category__parent__slug'),
+        ('sub_category', 'category_assignment__category__slug'),
+        ('priority', 'priority__priority'),
+        ('stadsdeel', 'location__stadsdeel'),
+        ('address_text', 'location__address_text'),
+        ('longitude', 'longitude'),
+        ('latitude', 'latitude'),
+        ('extra_properties', 'extra_properties'),
+        ('incident_date_start', 'incident_date_start'),
+        ('incident_date_end', 'incident_date_end'),
+        ('created_at', 'created_at'),
+        ('updated_at', 'updated_at'),
+    )
+
+    @staticmethod
+    def use_read_model():
+        # Filter and order the list on the denormalized `SignalReadModel`
+        return settings.FEATURE_FLAGS.get('API_USE_SIGNAL_READ_MODEL', False)
+
+    @property
+    def filterset_class(self):
+        return SignalReadModelFilter if self.use_read_model() else SignalFilter
+
+    @property
+    def ordering_field_mappings(self):
+        if self.use_read_model():
+            return self.read_model_ordering_field_mappings
+        return self.default_ordering_field_mappings
+
     def get_queryset(self, *args, **kwargs):
         if self._is_request_to_detail_endpoint():
             return super(PrivateSignalViewSet, self).get_queryset(*args, **kwargs)
         else:
             qs = super(PrivateSignalViewSet, self).get_queryset(*args, **kwargs)
+            if self.use_read_model():
+                qs = qs.select_related('read_model')
             return qs.filter_for_user(user=self.request.user)
 
+    def get_list_fields(self):
+        """
+        Get the fields of the list requested with the `fields` or `exclude` query parameter (comma
+        separated field names). The `_links` are always included.
+        """
+        if hasattr(self, '_list_fields'):
+            return self._list_fields
+
+        all_fields = PrivateSignalSerializerList.Meta.fields
+        fields, exclude = (
+            [name for name in self.request.query_params.get(param, '').split(',') if name]
+            for param in ('fields', 'exclude')
+        )
+
+        unknown = [name for name in fields + exclude if name not in all_fields]
+        if unknown:
+            raise ValidationError({'fields': ['Unknown field(s): {}'.format(', '.join(unknown))]})
+
+        fields = set(fields or all_fields) - set(exclude)
+        self._list_fields = [name for name in all_fields if name in fields or name == '_links']
+        return self._list_fields
+
+    def _is_list(self):
+        # The detail serializer is used for the list when `detailed` is requested
+        return self.action == 'list' and self.get_serializer_class() is PrivateSignalSerializerList
+
+    def get_serializer(self, *args, **kwargs):
+        if self._is_list():
+            kwargs['fields'] = self.get_list_fields()
+        return super(PrivateSignalViewSet, self).get_serializer(*args, **kwargs)
+
+    def get_list_queryset(self, queryset):
+        """
+        Only load the columns and relations needed for the requested fields of the list.
+
+        The relations of the ordering are loaded as well, the keyset pagination reads the ordered
+        values from the last signal of the page.
+        """
+        fields = self.get_list_fields()
+
+        select_related = {'read_model'} if self.use_read_model() else set()
+        for name in fields:
+            select_related.update(self.list_select_related.get(name, ()))
+        for ordering in queryset.query.order_by:
+            path = ordering.lstrip('-').split(LOOKUP_SEP) if isinstance(ordering, str) else []
+            if len(path) > 1:
+                select_related.add(LOOKUP_SEP.join(path[:-1]))
+
+        columns = {'id', 'created_at', 'updated_at'}
+        columns.update(name for name in fields if name not in self.list_computed_fields)
+        columns.discard('category')
+        columns.update(path.split(LOOKUP_SEP)[0] for path in select_related)
+
+        queryset = queryset.select_related(None).prefetch_related(None).select_related(
+            *select_related
+        ).only(*columns)
+
+        if 'has_attachments' in fields:
+            queryset = queryset.annotate(has_attachments=Exists(
+                Attachment.objects.filter(_signal=OuterRef('pk'))
+            ))
+        if 'notes_count' in fields:
+            queryset = queryset.annotate(notes_count=Coalesce(Subquery(
+                Note.objects.filter(_signal=OuterRef('pk')).order_by().values('_signal').annotate(
+                    count=Count('*')
+                ).values('count'),
+                output_field=IntegerField()
+            ), 0))
+        if 'notes' in fields:
+            # Only the newest notes, the notes_count tells if there are more
+            newest_notes = Note.objects.filter(_signal=OuterRef('_signal')).values('pk')
+            queryset = queryset.prefetch_related(Prefetch('notes', queryset=Note.objects.filter(
+                pk__in=Subquery(newest_notes[:settings.SIGNAL_LIST_MAX_NOTES])
+            )))
+        return queryset
+
+    def filter_queryset(self, queryset):
+        queryset = super(PrivateSignalViewSet, self).filter_queryset(queryset)
+        if self._is_list():
+            queryset = self.get_list_queryset(queryset)
+        return queryset
+
     def check_object_permissions(self, request, obj):
         for permission_class in self.object_permission_classes:
             permission = permission_class()
@@ -98,13 +278,179 @@ class PrivateSignalViewSet(mixins.CreateModelMixin, mixins.UpdateModelMixin, Dat
                     request, message=getattr(permission, 'message', None)
                 )
 
+    def get_signal_version(self):
+        """
+        Return the version of the signal for the ETag of the detail, or None when it does not exist.
+
+        Notes, status, location, priority, category and reporter changes all save the signal, the
+        attachments and the categories (departments of the category) are versioned separately.
+        The object permissions are checked on the signal loaded here.
+        """
+        try:
+            signal = Signal.objects.filter(pk=self.kwargs['pk']).select_related(
+                'category_assignment'
+            ).only(
+                # `Signal.__init__` reads the `signal_id`
+                'id', 'signal_id', 'updated_at', 'category_assignment',
+                'category_assignment__category',
+            ).annotate(
+                attachments_count=Count('attachments'),
+                attachments_created_at=Max('attachments__created_at'),
+            ).first()
+        except (TypeError, ValueError):
+            return None
+        if signal is None:
+            return None
+
+        self.check_object_permissions(self.request, signal)
+        return '{}:{}:{}:{}'.format(signal.updated_at.isoformat(), signal.attachments_count,
+                                    signal.attachments_created_at, get_category_tree().version)
+
+    def retrieve(self, request, *args, **kwargs):
+        version = self.get_signal_version()
+        get_response = partial(self.retrieve_cached, request, version, *args, **kwargs)
+        return self.conditional_response(request, version, get_response)
+
+    def retrieve_cached(self, request, version, *args, **kwargs):
+        """
+        Return the serialized detail from the cache while the signal is unchanged.
+        """
+        if version is None:
+            return super(PrivateSignalViewSet, self).retrieve(request, *args, **kwargs)
+
+        # The detail contains absolute links, built for the API version and URL of the request
+        cache_version = (version, request.version, request.build_absolute_uri())
+        signal_id = int(self.kwargs['pk'])
+
+        data = get_cached_detail(signal_id, cache_version)
+        if data is not None:
+            return Response(data)
+
+        response = super(PrivateSignalViewSet, self).retrieve(request, *args, **kwargs)
+        cache_detail(signal_id, cache_version, response.data)
+        return response
+
+    @action(detail=False, methods=['POST'], url_path='bulk')
+    def bulk(self, request, *args, **kwargs):
+        """
+        Create multiple signals at once, validation errors are reported per item. Either all
+        signals are created or none.
+        """
+        if not isinstance(request.data, list):
+            raise ValidationError('Expected a list of signals')
+        if len(request.data) > settings.SIGNAL_BULK_CREATE_MAX_ITEMS:
+            raise ValidationError('A maximum of {} signals can be created at once'.format(
+                settings.SIGNAL_BULK_CREATE_MAX_ITEMS))
+
+        serializer = PrivateSignalSerializerList(data=request.data, many=True,
+                                                 context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        try:
+            signals = serializer.save()
+        except DjangoValidationError as e:
+            raise mixins.convert_validation_error(e)
+
+        serializer = SignalIdListSerializer(signals, many=True)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def _has_filter(self, request):
+        """Return whether the query parameters contain a valid, non-empty filter of the filterset."""
+        filterset = DjangoFilterBackend().get_filterset(request, self.get_queryset(), self)
+        if filterset is None or not filterset.is_valid():
+            return False
+        return any(value not in EMPTY_VALUES for value in filterset.form.cleaned_data.values())
+
+    @action(detail=False, methods=['POST'], url_path='bulk/status',
+            permission_classes=(SignalChangeStatusPermission,))
+    def bulk_status(self, request, *args, **kwargs):
+        """
+        Change the status of the given signals, or of the signals matching the filter parameters
+        when no signal ids are given. Signals that cannot transition to the new state are skipped.
+        """
+        serializer = PrivateSignalStatusBulkSerializer(data=request.data,
+                                                       context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+
+        signal_ids = serializer.validated_data.get('signal_ids')
+        if signal_ids is None and not self._has_filter(request):
+            # Parameters that do not filter (`format`, `page_size`, misspelled filters) would
+            # otherwise select all signals
+            raise ValidationError({'signal_ids': ['Signal ids or filter parameters are required']})
+
+        queryset = self.filter_queryset(self.get_queryset())
+        if signal_ids is not None:
+            queryset = queryset.filter(id__in=signal_ids)
+        else:
+            signal_ids = list(queryset.order_by().values_list('id', flat=True))
+
+        status_data = serializer.validated_data['status']
+        status_data['user'] = request.user.email
+        try:
+            signals = Signal.actions.update_status_bulk(status_data, queryset)
+        except DjangoValidationError as e:
+            raise ValidationError({'status': e.message_dict})
+
+        updated = sorted(signal.id for signal in signals)
+        return Response({
+            'updated': updated,
+            'not_updated': sorted(set(signal_ids) - set(updated)),
+        })
+
+    @action(detail=False, url_path='export', permission_classes=(SignalExportPermission,),
+            renderer_classes=(CSVExportRenderer, NDJSONExportRenderer))
+    def export(self, request, *args, **kwargs):
+        """
+        Stream the signals matching the filter parameters as CSV (`?format=csv`, the default) or as
+        newline delimited JSON (`?format=ndjson`).
+
+        The rows are read with a server-side cursor while the response is streamed, so the memory
+        use does not grow with the number of signals.
+        """
+        queryset = self.filter_queryset(self.get_queryset()).select_related(None).prefetch_related(
+            None
+        ).annotate(
+            longitude=Func('location__geometrie', function='ST_X', output_field=FloatField()),
+            latitude=Func('location__geometrie', function='ST_Y', output_field=FloatField()),
+        )
+        columns, lookups = zip(*self.export_fields)
+        rows = queryset.values_list(*lookups).iterator(chunk_size=settings.SIGNAL_EXPORT_CHUNK_SIZE)
+
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(renderer.render_rows(columns, rows),
+                                         content_type=f'{renderer.media_type}; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="signals.{renderer.format}"'
+        return response
+
     @action(detail=True)
     def history(self, request, pk=None):
-        """History endpoint filterable by action."""
+        """
+        History endpoint filterable by action and time (`since`, only newer entries are returned).
+
+        The entries are returned as a list, unless the `page` or `page_size` query parameter is
+        given.
+        """
+        # History entries are only ever added, the newest entry and the count version the history
+        version = '{when__max}:{identifier__count}'.format(
+            **History.objects.filter(_signal__id=pk).aggregate(Max('when'), Count('identifier'))
+        )
+        return self.conditional_response(request, version, partial(self._history, request, pk))
+
+    def _history(self, request, pk):
         history_entries = History.objects.filter(_signal__id=pk)
         what = self.request.query_params.get('what', None)
         if what:
             history_entries = history_entries.filter(what=what)
 
+        since = self.request.query_params.get('since', None)
+        if since:
+            history_entries = history_entries.filter(
+                when__gt=DateTimeField().to_internal_value(since))
+
+        if {'page', 'page_size'} & set(self.request.query_params):
+            paginator = self.history_pagination_class()
+            page = paginator.paginate_queryset(history_entries, request, view=self)
+            serializer = HistoryHalSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+
         serializer = HistoryHalSerializer(history_entries, many=True)
         return Response(serializer.data)
@@ -1,19 +1,10 @@
-from django.dispatch import receiver
-
-from signals.apps.email_integrations.flex_horeca import tasks
+from signals.apps.email_integrations.flex_horeca import mail
+from signals.apps.email_integrations.flex_horeca.utils import is_signal_applicable
+from signals.apps.signals.dispatcher import register
 from signals.apps.signals.managers import create_child, create_initial, update_category_assignment
 
 
-@receiver(create_initial, dispatch_uid='flex_horeca_email_create_initial')
-def create_initial_handler(sender, signal_obj, **kwargs):
-    tasks.send_mail_flex_horeca.delay(pk=signal_obj.id)
-
-
-@receiver(create_child, dispatch_uid='flex_horeca_email_create_child')
-def create_child_handler(sender, signal_obj, **kwargs):
-    tasks.send_mail_flex_horeca.delay(pk=signal_obj.id)
-
-
-@receiver(update_category_assignment, dispatch_uid='flex_horeca_email_update_category_assignment')
-def update_category_assignment_handler(sender, signal_obj, **kwargs):
-    tasks.send_mail_flex_horeca.delay(pk=signal_obj.id)
+@register(create_initial, create_child, update_category_assignment,
+          applies=lambda signal, **kwargs: is_signal_applicable(signal))
+def send_mail_handler(signal, **kwargs):
+    mail.send_mail(signal)
@@ -2,7 +2,7 @@ from django.utils import timezone
 from django.utils.datetime_safe import datetime
 
 from signals.apps.email_integrations.settings import app_settings
-from signals.apps.signals.models import Category, Signal
+from signals.apps.signals.models import Signal
 
 
 def is_signal_applicable(signal: Signal) -> bool:
@@ -31,6 +31,5 @@ def is_signal_applicable(signal: Signal) -> bool:
     if is_today_last_applicable_weekday and is_now_gt_end_time:
         return False
 
-    eligible_categories = Category.objects.filter(parent__slug='overlast-bedrijven-en-horeca')
-
-    return signal.category_assignment.category in eligible_categories
+    category = signal.category_assignment.category
+    return category.parent is not None and category.parent.slug == 'overlast-bedrijven-en-horeca'
@@ -1,28 +1,33 @@
-from django.dispatch import receiver
-
-from signals.apps.email_integrations.reporter import tasks
+from signals.apps.email_integrations.reporter import mail
+from signals.apps.signals import workflow
+from signals.apps.signals.dispatcher import register
 from signals.apps.signals.managers import create_initial, update_status
 
+# States of which the reporter is notified, see the `send_mail_reporter_status_changed_*` mails
+NOTIFY_STATES = (
+    workflow.AFGEHANDELD,
+    workflow.GESPLITST,
+    workflow.INGEPLAND,
+    workflow.HEROPEND,
+)
+
+
+def has_reporter_email(signal, **kwargs):
+    return bool(signal.reporter.email)
 
-@receiver(create_initial, dispatch_uid='reporter_email_integrations_create_initial')
-def create_initial_handler(sender, signal_obj, *args, **kwargs):
-    tasks.send_mail_reporter_created.delay(pk=signal_obj.pk)
 
+def is_status_change_notified(signal, status, prev_status, **kwargs):
+    return has_reporter_email(signal) and status.state in NOTIFY_STATES
 
-@receiver(update_status, dispatch_uid='core_email_integrations_update_status')
-def update_status_handler(sender, signal_obj, status, prev_status, *args, **kwargs):
-    tasks.send_mail_reporter_status_changed_afgehandeld.delay(signal_pk=signal_obj.pk,
-                                                              status_pk=status.pk,
-                                                              prev_status_pk=prev_status.pk)
 
-    tasks.send_mail_reporter_status_changed_split.delay(signal_pk=signal_obj.pk,
-                                                        status_pk=status.pk,
-                                                        prev_status_pk=prev_status.pk)
+@register(create_initial, applies=has_reporter_email)
+def create_initial_handler(signal, **kwargs):
+    mail.send_mail_reporter_created(signal)
 
-    tasks.send_mail_reporter_status_changed_ingepland.delay(signal_pk=signal_obj.pk,
-                                                            status_pk=status.pk,
-                                                            prev_status_pk=prev_status.pk)
 
-    tasks.send_mail_reporter_status_changed_heropend.delay(signal_pk=signal_obj.pk,
-                                                           status_pk=status.pk,
-                                                           prev_status_pk=prev_status.pk)
+@register(update_status, applies=is_status_change_notified)
+def update_status_handler(signal, status, prev_status, **kwargs):
+    mail.send_mail_reporter_status_changed_afgehandeld(signal, status, prev_status)
+    mail.send_mail_reporter_status_changed_split(signal, status)
+    mail.send_mail_reporter_status_changed_ingepland(signal, status)
+    mail.send_mail_reporter_status_changed_heropend(signal, status)
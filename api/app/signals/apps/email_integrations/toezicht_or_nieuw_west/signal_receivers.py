@@ -1,14 +1,10 @@
-from django.dispatch import receiver
-
-from signals.apps.email_integrations.toezicht_or_nieuw_west import tasks
+from signals.apps.email_integrations.toezicht_or_nieuw_west import mail
+from signals.apps.email_integrations.toezicht_or_nieuw_west.utils import is_signal_applicable
+from signals.apps.signals.dispatcher import register
 from signals.apps.signals.managers import create_child, create_initial
 
 
-@receiver(create_initial, dispatch_uid='toezicht_or_niew_west_email_create_initial')
-def create_initial_handler(sender, signal_obj, **kwargs):
-    tasks.send_mail_toezicht_or_nieuw_west.delay(pk=signal_obj.id)
-
-
-@receiver(create_child, dispatch_uid='toezicht_or_niew_west_email_create_child')
-def create_child_handler(sender, signal_obj, **kwargs):
-    tasks.send_mail_toezicht_or_nieuw_west.delay(pk=signal_obj.id)
+@register(create_initial, create_child,
+          applies=lambda signal, **kwargs: is_signal_applicable(signal))
+def send_mail_handler(signal, **kwargs):
+    mail.send_mail(signal)
@@ -1,8 +1,19 @@
-from django.db.models import Q
 from django.utils import timezone
 
 from signals.apps.email_integrations.core.utils import is_business_hour
-from signals.apps.signals.models import STADSDEEL_NIEUWWEST, Category, Signal
+from signals.apps.signals.models import STADSDEEL_NIEUWWEST, Signal
+
+ELIGIBLE_CATEGORY_SLUGS = (
+    'parkeeroverlast',
+    'fietswrak',
+    'stank-geluidsoverlast',
+    'bouw-sloopoverlast',
+    'auto-scooter-bromfietswrak',
+    'graffiti-wildplak',
+    'hondenpoep',
+    'hinderlijk-geplaatst-object',
+    'deelfiets',
+)
 
 
 def is_signal_applicable(signal: Signal) -> bool:
@@ -20,16 +31,7 @@ def is_signal_applicable(signal: Signal) -> bool:
     if signal.location.stadsdeel != STADSDEEL_NIEUWWEST:
         return False
 
-    eligible_categories = Category.objects.filter(
-        Q(parent__slug='overlast-in-de-openbare-ruimte') & (
-            Q(slug='parkeeroverlast') |
-            Q(slug='fietswrak') |
-            Q(slug='stank-geluidsoverlast') |
-            Q(slug='bouw-sloopoverlast') |
-            Q(slug='auto-scooter-bromfietswrak') |
-            Q(slug='graffiti-wildplak') |
-            Q(slug='hondenpoep') |
-            Q(slug='hinderlijk-geplaatst-object') |
-            Q(slug='deelfiets')))
-
-    return signal.category_assignment.category in eligible_categories
+    category = signal.category_assignment.category
+    return (category.parent is not None and
+            category.parent.slug == 'overlast-in-de-openbare-ruimte' and
+            category.slug in ELIGIBLE_CATEGORY_SLUGS)
@@ -1,8 +1,15 @@
-from django.db.models import Q
 from django.utils import timezone
 
 from signals.apps.email_integrations.core.utils import is_business_hour
-from signals.apps.signals.models import STADSDEEL_NIEUWWEST, Category, Signal
+from signals.apps.signals.models import STADSDEEL_NIEUWWEST, Signal
+
+ELIGIBLE_CATEGORY_SLUGS = (
+    'geluidsoverlast-muziek',
+    'geluidsoverlast-installaties',
+    'overlast-terrassen',
+    'stankoverlast',
+    'overlast-door-bezoekers-niet-op-terras',
+)
 
 
 def is_signal_applicable(signal: Signal) -> bool:
@@ -20,12 +27,7 @@ def is_signal_applicable(signal: Signal) -> bool:
     if signal.location.stadsdeel != STADSDEEL_NIEUWWEST:
         return False
 
-    eligible_categories = Category.objects.filter(
-        Q(parent__slug='overlast-bedrijven-en-horeca') & (
-            Q(slug='geluidsoverlast-muziek') |
-            Q(slug='geluidsoverlast-installaties') |
-            Q(slug='overlast-terrassen') |
-            Q(slug='stankoverlast') |
-            Q(slug='overlast-door-bezoekers-niet-op-terras')))
-
-    return signal.category_assignment.category in eligible_categories
+    category = signal.category_assignment.category
+    return (category.parent is not None and
+            category.parent.slug == 'overlast-bedrijven-en-horeca' and
+            category.slug in ELIGIBLE_CATEGORY_SLUGS)
@@ -58,10 +58,8 @@ class Feedback(models.Model):
         return self.submitted_at is not None
 
 
-def _get_description_of_receive_feedback(feedback_id):
-    """Given a history entry for submission of feedback create descriptive text."""
-    feedback = Feedback.objects.get(token=feedback_id)
-
+def _get_description_of_receive_feedback(feedback):
+    """Given submitted feedback create descriptive text for its history entry."""
     # Craft a message for UI
     desc = 'Ja, de melder is tevreden\n' if feedback.is_satisfied else \
         'Nee, de melder is ontevreden\n'
@@ -7,7 +7,6 @@ Reports can be parametrized based on the following:
 - one or more areas
 """
 import datetime
-from collections import defaultdict
 
 from dateutil.relativedelta import relativedelta
 from django.contrib.gis.db import models
@@ -16,6 +15,7 @@ from django.core.exceptions import ValidationError as DjangoValidationError
 from jsonschema import validate
 from jsonschema.exceptions import ValidationError as JSONSchemaValidationError
 
+from signals.apps.signals.category_tree import get_category_tree
 from signals.apps.signals.models import Category
 
 MONTH = 'MONTH'
@@ -239,27 +239,14 @@ INTERVAL_DERIVATIONS = {
 
 
 def _build_category_indexes():
-    # Create an dictionary of (main_slug, sub_slug) to category_id, to check
-    # whether the requested (main_slug, sub_slug) actually exist in SIA.
-    # Do the same for main_slug to sub categories to deal with (main_slug, '*').
-
-    # Note: Assumes number of Categories is small, and can be loaded into
-    # memory at once.
-    all_categories = list(Category.objects.all())
-    id_to_category = {cat.id: cat for cat in all_categories}
-
-    slugs_to_category_id = {}
-    main_slug_to_category_ids = defaultdict(set)
-
-    for cat in all_categories:
-        if cat.parent_id is None:
-            slugs_to_category_id[(cat.slug, None)] = cat.id  # for (main_slug, None)
-        else:
-            main_cat = id_to_category[cat.parent_id]
-            slugs_to_category_id[(main_cat.slug, cat.slug)] = cat.id  # for (main_slug, sub_slug)
-            main_slug_to_category_ids[main_cat.slug].add(cat.id)  # for (main_slug, '*')
-
-    return id_to_category, slugs_to_category_id, main_slug_to_category_ids
+    # Dictionaries of (main_slug, sub_slug) to category_id, to check whether
+    # the requested (main_slug, sub_slug) actually exist in SIA, and of
+    # main_slug to sub categories to deal with (main_slug, '*'). These are
+    # kept in memory by the category tree.
+    category_tree = get_category_tree()
+    return (category_tree.id_to_category,
+            category_tree.slugs_to_category_id,
+            category_tree.main_slug_to_category_ids)
 
 
 def get_categories(value):
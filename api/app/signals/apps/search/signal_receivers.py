@@ -1,7 +1,7 @@
 from django.conf import settings
-from django.dispatch import receiver
 
 from signals.apps.search.tasks import save_to_elastic
+from signals.apps.signals.dispatcher import register
 from signals.apps.signals.managers import (
     create_child,
     create_initial,
@@ -11,12 +11,12 @@ from signals.apps.signals.managers import (
 )
 
 
-@receiver([create_initial,
-           create_child,
-           update_location,
-           update_category_assignment,
-           update_priority], dispatch_uid='search_add_to_elastic')
-def add_to_elastic_handler(sender, signal_obj, **kwargs):
+@register(create_initial,
+          create_child,
+          update_location,
+          update_category_assignment,
+          update_priority,
+          applies=lambda signal, **kwargs: settings.FEATURE_FLAGS.get('SEARCH_BUILD_INDEX', False))
+def add_to_elastic_handler(signal, **kwargs):
     # Add to elastic
-    if settings.FEATURE_FLAGS.get('SEARCH_BUILD_INDEX', False):
-        save_to_elastic.delay(signal_id=signal_obj.id)
+    save_to_elastic.delay(signal_id=signal.id)
@@ -3,14 +3,10 @@ This module contains the PDF generation code used for Sigmax.
 """
 import base64
 import logging
-from io import BytesIO
 
-import requests
 import weasyprint
 from django.template.loader import render_to_string
 from django.utils import timezone
-from PIL import Image
-from requests.exceptions import RequestException
 
 from signals.apps.signals.models import Attachment, Signal
 
@@ -22,38 +18,23 @@ logger = logging.getLogger(__name__)
 
 def _get_jpg_data_url(attachment: Attachment):
     """
-    Download image, resize it, base 64 encode it, and finally create a image data URL from it.
+    Base 64 encode the PDF rendition of the image, and create a image data URL from it.
     """
     # HOTFIX for SIG-1473
     # - Weazyprint JPG support assumes GDK Bixbuf - https://github.com/Kozea/WeasyPrint/issues/428)
-    # - long term solution must use a image resizing micro-service
 
-    MAX_SIZE = 800  # width and height no larger than this value
+    if not attachment.pdf_image:
+        # Sigmax is called from a Celery task, so a missing rendition can be generated here
+        try:
+            attachment.generate_renditions()
+        except OSError:
+            logger.warning('Could not access: {} for resizing.'.format(attachment.file.name))
+            return None
 
-    try:
-        data = BytesIO(requests.get(attachment.file.url).content)  # try/except network stuff
-    except RequestException:
-        logger.warning('Could not access: {} for resizing.'.format(attachment.file.url))
-        return None
+    with attachment.pdf_image.open('rb') as f:
+        data = f.read()
 
-    image = Image.open(data)
-
-    # Consider image orientation:
-    if image.width > image.height:
-        # landscape
-        width = MAX_SIZE
-        height = int((MAX_SIZE / image.width) * image.height)
-    else:
-        # portrait
-        width = int((MAX_SIZE / image.height) * image.width)
-        height = MAX_SIZE
-
-    resized = image.resize(size=(width, height), resample=Image.LANCZOS).convert('RGB')
-
-    buffer = BytesIO()
-    resized.save(buffer, format='JPEG')
-
-    return 'data:image/jpg;base64,' + base64.b64encode(buffer.getvalue()).decode('utf-8')
+    return 'data:image/jpg;base64,' + base64.b64encode(data).decode('utf-8')
 
 
 def _render_html(signal: Signal):
@@ -71,7 +52,7 @@ def _render_html(signal: Signal):
     )
     # HOTFIX for SIG-1473
     jpg_data_urls = []
-    for attachment in signal.attachments.all():
+    for attachment in signal.attachments.filter(is_image=True):
         data_url = _get_jpg_data_url(attachment)
         jpg_data_urls.append(data_url)
         assert data_url is None or data_url.startswith('data:image/jpg')
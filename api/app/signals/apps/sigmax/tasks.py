@@ -43,10 +43,9 @@ def fail_stuck_sending_signals():
                                           status__target_api=Status.TARGET_API_SIGMAX,
                                           status__updated_at__lte=before)
 
-    for signal in stuck_signals:
-        Signal.actions.update_status(data={
-            'state': workflow.VERZENDEN_MISLUKT,
-            'text': 'Melding stond langer dan {} minuten op TE_VERZENDEN. Mislukt'.format(
-                settings.SIGMAX_SEND_FAIL_TIMEOUT_MINUTES
-            )
-        }, signal=signal)
+    Signal.actions.update_status_bulk(data={
+        'state': workflow.VERZENDEN_MISLUKT,
+        'text': 'Melding stond langer dan {} minuten op TE_VERZENDEN. Mislukt'.format(
+            settings.SIGMAX_SEND_FAIL_TIMEOUT_MINUTES
+        )
+    }, signals=stuck_signals)
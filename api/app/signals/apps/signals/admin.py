@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from signals.apps.signals.models import Category, StatusMessageTemplate
+from signals.apps.signals.models import Category, OutboxEvent, StatusMessageTemplate
 from signals.apps.signals.models.category_translation import CategoryTranslation
 
 
@@ -39,3 +39,28 @@ class StatusMessageTemplatesAdmin(admin.ModelAdmin):
 
 
 admin.site.register(StatusMessageTemplate, StatusMessageTemplatesAdmin)
+
+
+class DeadOutboxEventFilter(admin.SimpleListFilter):
+    title = 'Dead'
+    parameter_name = 'dead'
+
+    def lookups(self, request, model_admin):
+        return [('1', 'Yes')]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset & OutboxEvent.objects.dead()
+        return queryset.all()
+
+
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ('idempotency_key', 'event', 'created_at', 'processed_at', 'attempts',
+                    'next_attempt_at',)
+    list_filter = (DeadOutboxEventFilter, 'event',)
+    search_fields = ('idempotency_key',)
+    readonly_fields = ('event', 'kwargs', 'idempotency_key', 'created_at', 'processed_at',
+                       'dispatched_at',)
+
+
+admin.site.register(OutboxEvent, OutboxEventAdmin)
@@ -0,0 +1,178 @@
+"""
+Process wide, in memory copy of the category tree.
+
+The categories are a small table that rarely changes, but they are looked up on almost every
+request. The tree is loaded once per process and kept until the version key in the Django cache
+changes. Saving or deleting a Category, CategoryDepartment, CategoryTranslation,
+ServiceLevelObjective or Department sets a new version when the transaction is committed (see
+`signal_receivers`), after which every process reloads the tree on its next lookup. Changes
+made with `QuerySet.update` send no Django signals, call `invalidate` after such an update.
+
+The processes see each other's changes through the shared cache (memcached, see the CACHES
+setting). The version key expires after `CATEGORY_TREE_VERSION_TIMEOUT` seconds, so a lost update
+of the key keeps a stale tree for at most that long.
+
+The Category instances in the tree are shared, treat them as read-only.
+"""
+import threading
+import uuid
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch, Q
+
+CATEGORY_TREE_VERSION_KEY = 'signals_category_tree_version'
+CATEGORY_TREE_VERSION_TIMEOUT = 5 * 60
+
+_tree = None
+_local = threading.local()
+
+
+class CategoryTree:
+    def __init__(self, version, categories, translations, visible_category_departments=()):
+        self.version = version
+
+        self.id_to_category = {}
+        self.slugs_to_category_id = {}
+        self.main_slug_to_category_ids = defaultdict(set)
+        self.translations = {}
+        self.department_to_category_ids = defaultdict(set)
+        self._visible_category_ids = {}
+
+        for category in categories:
+            self.id_to_category[category.id] = category
+
+        for category in categories:
+            if category.parent_id is None:
+                self.slugs_to_category_id[(category.slug, None)] = category.id
+            else:
+                # Use the parent from the tree, `category.parent` does not need a query
+                category.parent = self.id_to_category[category.parent_id]
+                self.slugs_to_category_id[(category.parent.slug, category.slug)] = category.id
+                self.main_slug_to_category_ids[category.parent.slug].add(category.id)
+
+        # Translations are ordered oldest first, the newest translation of a category wins
+        for translation in translations:
+            old_category = self.id_to_category.get(translation.old_category_id)
+            new_category = self.id_to_category.get(translation.new_category_id)
+            if old_category is not None and new_category is not None and new_category.is_active:
+                translation.old_category = old_category
+                translation.new_category = new_category
+                self.translations[translation.old_category_id] = translation
+
+        for department_id, category_id in visible_category_departments:
+            self.department_to_category_ids[department_id].add(category_id)
+
+    @classmethod
+    def load(cls, version):
+        from signals.apps.signals.models import (
+            Category,
+            CategoryDepartment,
+            CategoryTranslation,
+            ServiceLevelObjective
+        )
+
+        categories = list(Category.objects.prefetch_related(
+            'departments',
+            Prefetch('slo', queryset=ServiceLevelObjective.objects.order_by('-created_at')),
+        ))
+        translations = CategoryTranslation.objects.order_by('created_at', 'id')
+        visible_category_departments = CategoryDepartment.objects.filter(
+            Q(can_view=True) | Q(is_responsible=True)
+        ).values_list('department_id', 'category_id')
+        return cls(version, categories, translations, visible_category_departments)
+
+    def get(self, pk):
+        from signals.apps.signals.models import Category
+
+        try:
+            return self.id_to_category[pk]
+        except KeyError:
+            raise Category.DoesNotExist(f'Category with ID #{pk} does not exists')
+
+    def get_by_slugs(self, slug, sub_slug=None):
+        """
+        Return the main category with the given slug, or its sub category with the given sub_slug.
+        """
+        from signals.apps.signals.models import Category
+
+        try:
+            return self.id_to_category[self.slugs_to_category_id[(slug, sub_slug)]]
+        except KeyError:
+            raise Category.DoesNotExist(f'Category {slug}/{sub_slug or ""} does not exists')
+
+    def get_translation(self, category):
+        """
+        Return the newest CategoryTranslation of the category to an active category, or None.
+        """
+        return self.translations.get(category.id)
+
+    def translated_to(self, category):
+        """
+        Return the category an inactive category is translated to, see `Category.translated_to`.
+        """
+        if category.is_active:
+            return None
+        translation = self.get_translation(category)
+        return translation.new_category if translation is not None else None
+
+    def get_visible_category_ids(self, department_ids):
+        """
+        Return the ids of the categories the departments can view or are responsible for.
+        """
+        key = frozenset(department_ids)
+        if key not in self._visible_category_ids:
+            self._visible_category_ids[key] = frozenset().union(
+                *(self.department_to_category_ids.get(department_id, ()) for department_id in key)
+            )
+        return self._visible_category_ids[key]
+
+
+def get_version():
+    version = cache.get(CATEGORY_TREE_VERSION_KEY)
+    if version is None:
+        # Only one process may choose the version, the others use what was stored
+        cache.add(CATEGORY_TREE_VERSION_KEY, uuid.uuid4().hex, CATEGORY_TREE_VERSION_TIMEOUT)
+        version = cache.get(CATEGORY_TREE_VERSION_KEY)
+    return version
+
+
+def get_category_tree():
+    global _tree
+
+    if getattr(_local, 'uncommitted', False):
+        if transaction.get_connection().in_atomic_block:
+            # The categories were changed in the current transaction, other processes can not see
+            # these changes yet so this tree is not kept
+            return CategoryTree.load(version=None)
+        # The transaction was rolled back
+        _local.uncommitted = False
+
+    version = get_version()
+    if _tree is None or _tree.version != version:
+        _tree = CategoryTree.load(version)
+    return _tree
+
+
+def get_visible_category_ids(user):
+    """
+    Return the ids of the categories the departments of the user can view.
+    """
+    from signals.apps.users.models import Profile
+
+    return get_category_tree().get_visible_category_ids(Profile.objects.get_department_ids(user))
+
+
+def _committed():
+    _local.uncommitted = False
+    cache.set(CATEGORY_TREE_VERSION_KEY, uuid.uuid4().hex, CATEGORY_TREE_VERSION_TIMEOUT)
+
+
+def invalidate():
+    """
+    Make all processes reload the category tree once the current transaction is committed.
+    """
+    if transaction.get_connection().in_atomic_block:
+        _local.uncommitted = True
+    transaction.on_commit(_committed)
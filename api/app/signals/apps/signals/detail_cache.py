@@ -0,0 +1,41 @@
+"""
+Cache of the serialized detail of a signal.
+
+Serializing the detail of a signal with its location, status, category, reporter, priority, notes
+and links takes a handful of queries. The serialized detail is kept in the Django cache together
+with the version it was serialized from (see `PrivateSignalViewSet.get_signal_version`), and is
+only used while that version is current. The `SignalManager` actions also clear the entry of
+every signal they change.
+
+This depends on the shared cache (memcached, see `MEMCACHED_LOCATION` in the settings), which is
+bounded by its memory size and evicts the least recently used entries first. Clearing an entry
+reaches every process.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+def _get_key(signal_id):
+    return f'signals_signal_detail_{signal_id}'
+
+
+def get_cached_detail(signal_id, version):
+    """
+    Return the serialized detail of the signal if it was cached for this version, or None.
+    """
+    entry = cache.get(_get_key(signal_id))
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    return None
+
+
+def cache_detail(signal_id, version, data):
+    cache.set(_get_key(signal_id), (version, data), settings.SIGNAL_DETAIL_CACHE_TIMEOUT)
+
+
+def clear_cached_details(signal_ids):
+    keys = [_get_key(signal_id) for signal_id in signal_ids]
+    cache.delete_many(keys)
+    # Another process may have cached the detail before the change was committed
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,134 @@
+"""
+Dispatching of the `SignalManager` DjangoSignals to the integrations.
+
+Instead of every integration queueing its own Celery tasks for an event, one `dispatch` task is
+queued per event. It loads the `Signal` once and runs the registered handlers that apply to it.
+Handlers that call slow external services queue their own Celery task. The outbox relay sends
+the events at-least-once, an event with an idempotency key that was dispatched before is skipped.
+The key is only claimed when all handlers succeeded, failed handlers are retried with a backoff.
+"""
+import logging
+from collections import defaultdict
+
+from signals.apps.signals.managers import (
+    add_image,
+    create_child,
+    create_initial,
+    update_category_assignment,
+    update_location,
+    update_priority,
+    update_status
+)
+from signals.apps.signals.models import OutboxEvent, Signal, Status
+from signals.celery import app
+
+logger = logging.getLogger(__name__)
+
+EVENTS = {
+    'create_initial': create_initial,
+    'create_child': create_child,
+    'update_location': update_location,
+    'update_status': update_status,
+    'update_category_assignment': update_category_assignment,
+    'update_priority': update_priority,
+    'add_image': add_image,
+}
+EVENT_NAMES = {django_signal: event for event, django_signal in EVENTS.items()}
+
+_handlers = defaultdict(list)
+
+# Failed handlers are retried after 1, 2, 4, 8 and 16 minutes
+DISPATCH_MAX_RETRIES = 5
+DISPATCH_BACKOFF = 60
+
+
+def register(*django_signals, applies=None):
+    """
+    Register the decorated function as handler of the given `SignalManager` DjangoSignals.
+
+    The handler is called with the `Signal` (and the `status` and `prev_status` keyword arguments
+    for `update_status`), but only if `applies` returns True when called with the same arguments.
+    """
+    def decorator(handler):
+        for django_signal in django_signals:
+            _handlers[EVENT_NAMES[django_signal]].append((handler, applies))
+        return handler
+    return decorator
+
+
+def has_handlers(event):
+    return bool(_handlers[event])
+
+
+def get_signal(signal_id):
+    """
+    Load the `Signal` with all relations used to check if the handlers apply.
+    """
+    return Signal.objects.select_related(
+        'status',
+        'location',
+        'reporter',
+        'priority',
+        'category_assignment__category__parent',
+    ).get(pk=signal_id)
+
+
+def get_status_kwargs(status_id, prev_status_id):
+    statuses = Status.objects.in_bulk([status_id, prev_status_id])
+    return {'status': statuses[status_id], 'prev_status': statuses.get(prev_status_id)}
+
+
+def get_handler_name(handler):
+    return f'{handler.__module__}.{handler.__name__}'
+
+
+def run_handlers(event, signal, kwargs, handler_names=None):
+    """
+    Run the handlers of the event that apply to the `Signal`, returns the names of failed handlers.
+    """
+    failed_handler_names = []
+    for handler, applies in _handlers[event]:
+        handler_name = get_handler_name(handler)
+        if handler_names is not None and handler_name not in handler_names:
+            continue
+
+        # Like `send_robust`, a failing handler does not stop the other handlers
+        try:
+            if applies is None or applies(signal, **kwargs):
+                handler(signal, **kwargs)
+        except Exception:
+            logger.exception(f"Handler {handler_name} failed for {event} of Signal with "
+                             f"ID #{signal.pk}")
+            failed_handler_names.append(handler_name)
+    return failed_handler_names
+
+
+@app.task(bind=True, max_retries=DISPATCH_MAX_RETRIES)
+def dispatch(self, event, signal_id, status_id=None, prev_status_id=None, idempotency_key=None,
+             handler_names=None):
+    """
+    Run the handlers of the event, or only the handlers named in `handler_names` when the task is
+    retried after some handlers failed.
+    """
+    if idempotency_key and OutboxEvent.objects.is_dispatched(idempotency_key):
+        logger.info(f"Event {idempotency_key} was already dispatched")
+        return
+
+    try:
+        signal = get_signal(signal_id)
+    except Signal.DoesNotExist:
+        logger.warning(f"Signal with ID #{signal_id} does not exists")
+        return
+
+    kwargs = get_status_kwargs(status_id, prev_status_id) if status_id is not None else {}
+
+    failed_handler_names = run_handlers(event, signal, kwargs, handler_names)
+    if failed_handler_names:
+        raise self.retry(kwargs={'status_id': status_id,
+                                 'prev_status_id': prev_status_id,
+                                 'idempotency_key': idempotency_key,
+                                 'handler_names': failed_handler_names},
+                         countdown=DISPATCH_BACKOFF * 2 ** self.request.retries)
+
+    if idempotency_key:
+        OutboxEvent.objects.claim(idempotency_key)
@@ -0,0 +1,22 @@
+from django.core.management import BaseCommand
+
+from signals.apps.signals.models import History
+
+
+class Command(BaseCommand):
+    help = 'Add missing signal history entries and generate the missing descriptions.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10000,
+                            help='Number of signal ids backfilled per transaction (default: 10000)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            self.stderr.write('batch-size should be 1 or higher')
+        else:
+            entry_count = History.objects.backfill(batch_size=batch_size)
+            self.stdout.write('Added {} history entries'.format(entry_count))
+
+            description_count = History.objects.fill_descriptions()
+            self.stdout.write('Added {} history descriptions'.format(description_count))
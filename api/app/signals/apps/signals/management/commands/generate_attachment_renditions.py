@@ -0,0 +1,21 @@
+from django.core.management import BaseCommand
+from django.db.models import Q
+
+from signals.apps.signals.models import Attachment
+from signals.apps.signals.tasks import generate_attachment_renditions
+
+
+class Command(BaseCommand):
+    help = 'Queue the generation of the renditions of images that have none yet.'
+
+    def handle(self, *args, **options):
+        attachment_ids = Attachment.objects.filter(
+            Q(cropped_image__isnull=True) | Q(cropped_image=''), is_image=True
+        ).values_list('pk', flat=True)
+
+        count = 0
+        for attachment_id in attachment_ids.iterator():
+            generate_attachment_renditions.delay(attachment_id=attachment_id)
+            count += 1
+
+        self.stdout.write('Queued {} attachments'.format(count))
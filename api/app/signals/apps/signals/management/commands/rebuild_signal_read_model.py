@@ -0,0 +1,19 @@
+from django.core.management import BaseCommand
+
+from signals.apps.signals.models import SignalReadModel
+
+
+class Command(BaseCommand):
+    help = 'Recreate the denormalized signal read model, repairs any drift from the source tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10000,
+                            help='Number of signal ids updated per transaction (default: 10000)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            self.stderr.write('batch-size should be 1 or higher')
+        else:
+            row_count = SignalReadModel.objects.rebuild(batch_size=batch_size)
+            self.stdout.write('Rebuilt {} signal read model row(s)'.format(row_count))
@@ -1,13 +1,23 @@
+import logging
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+
+from django.apps import apps
 from django.contrib.gis.db import models
 from django.core.exceptions import ValidationError
-from django.db import transaction
+from django.db import connection, transaction
+from django.db.models import Q
 from django.dispatch import Signal as DjangoSignal
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
 
 # Declaring custom Django signals for our `SignalManager`.
 create_initial = DjangoSignal(providing_args=['signal_obj'])
 create_child = DjangoSignal(providing_args=['signal_obj'])
-add_image = DjangoSignal(providing_args=['signal_obj'])
-add_attachment = DjangoSignal(providing_args=['signal_obj'])
+add_image = DjangoSignal(providing_args=['signal_obj', 'attachment'])
+add_attachment = DjangoSignal(providing_args=['signal_obj', 'attachment'])
 update_location = DjangoSignal(providing_args=['signal_obj', 'location', 'prev_location'])
 update_status = DjangoSignal(providing_args=['signal_obj', 'status', 'prev_status'])
 update_category_assignment = DjangoSignal(providing_args=['signal_obj',
@@ -18,6 +28,16 @@ update_priority = DjangoSignal(providing_args=['signal_obj', 'priority', 'prev_p
 create_note = DjangoSignal(providing_args=['signal_obj', 'note'])
 
 
+def add_to_outbox(to_send):
+    """
+    Helper function, writes Django Signals to the outbox in the current transaction.
+
+    :param to_send: list of tuples of django signal name and keyword arguments
+    """
+    from .models import OutboxEvent
+    OutboxEvent.objects.add(to_send)
+
+
 def send_signals(to_send):
     """
     Helper function, sends properly instantiated Django Signals.
@@ -28,8 +48,407 @@ def send_signals(to_send):
         django_signal.send_robust(**kwargs)
 
 
+def get_idempotency_key(event, kwargs):
+    """
+    Key that identifies one sent `SignalManager` DjangoSignal, the same key for the same event.
+
+    Every event creates a new object (a `Status` for `update_status`, a child `Signal` for
+    `create_child`), the key is the event name and the pk of that object.
+
+    :param event: name of the DjangoSignal
+    :param kwargs: keyword arguments of the DjangoSignal
+    :returns: str
+    """
+    subject = next((value for name, value in kwargs.items()
+                    if name not in ('sender', 'signal', 'signal_obj')
+                    and not name.startswith('prev_')
+                    and value is not None), kwargs['signal_obj'])
+    return '{}_{}'.format(event, subject.pk)
+
+
+class OutboxEventManager(models.Manager):
+    def add(self, to_send):
+        """Write the DjangoSignals to the outbox in the current transaction.
+
+        The `relay_outbox` task that sends them is started after the transaction is committed.
+
+        :param to_send: list of tuples of django signal name and keyword arguments
+        """
+        from signals.apps.signals.tasks import relay_outbox
+
+        self.bulk_create([
+            self.model(
+                event=event,
+                kwargs={name: [value._meta.label, value.pk] if value is not None else None
+                        for name, value in kwargs.items()},
+                idempotency_key=get_idempotency_key(event, kwargs),
+            ) for event, kwargs in to_send
+        ], ignore_conflicts=True)
+
+        transaction.on_commit(lambda: relay_outbox.delay())
+
+    def _load_batch(self, outbox_events):
+        """Replace the [model label, pk] keyword arguments with the model instances."""
+        pks = defaultdict(set)
+        for outbox_event in outbox_events:
+            for value in outbox_event.kwargs.values():
+                if value is not None:
+                    pks[value[0]].add(value[1])
+
+        instances = {label: apps.get_model(label)._default_manager.in_bulk(list(label_pks))
+                     for label, label_pks in pks.items()}
+
+        to_send = []
+        for outbox_event in outbox_events:
+            kwargs = {name: instances[value[0]].get(value[1]) if value is not None else None
+                      for name, value in outbox_event.kwargs.items()}
+            if kwargs['signal_obj'] is None:
+                logger.warning(f"Signal for outbox event {outbox_event.idempotency_key} "
+                               f"does not exists")
+                continue
+            to_send.append((outbox_event, kwargs))
+        return to_send
+
+    def _claim_batch(self, batch_size, max_attempts, lease):
+        """Lock and claim a batch of events that are due, the claim is committed right away.
+
+        A claimed event is not due again before the `lease` passed, if the relay dies while
+        sending the batch the events are picked up again after that.
+        """
+        with transaction.atomic():
+            now = timezone.now()
+            outbox_events = list(
+                self.select_for_update(skip_locked=True)
+                    .filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now),
+                            processed_at__isnull=True,
+                            attempts__lt=max_attempts)
+                    .order_by('id')[:batch_size]
+            )
+            self.filter(pk__in=[outbox_event.pk for outbox_event in outbox_events]).update(
+                next_attempt_at=now + timedelta(seconds=lease))
+        return outbox_events
+
+    def relay(self, batch_size=100, max_attempts=10, backoff=60, lease=300):
+        """Send the DjangoSignals of all unprocessed outbox events, in batches.
+
+        Every batch is claimed in a short transaction (skipping rows locked by another relay),
+        the events are sent after that without holding any locks. When the relay fails before
+        the batch is marked processed it is sent again once the claim expired, receivers use the
+        idempotency key to skip events they already handled.
+
+        An event is only marked processed when none of its receivers failed. Otherwise it is sent
+        again after an exponential backoff, events that failed `max_attempts` times are logged,
+        left unprocessed and are no longer sent.
+
+        :param batch_size: number of events per batch (Default: 100)
+        :param max_attempts: number of times a failing event is sent (Default: 10)
+        :param backoff: seconds to wait after the first failed attempt (Default: 60)
+        :param lease: seconds a claimed batch is not sent by another relay (Default: 300)
+        :returns: number of events sent
+        """
+        total = 0
+        while True:
+            outbox_events = self._claim_batch(batch_size, max_attempts, lease)
+
+            failed = []
+            for outbox_event, kwargs in self._load_batch(outbox_events):
+                # The DjangoSignals are looked up by name when they are sent
+                responses = globals()[outbox_event.event].send_robust(sender=SignalManager, **kwargs)
+                errors = [response for _, response in responses if isinstance(response, Exception)]
+                if errors:
+                    logger.error(f"Receivers of outbox event {outbox_event.idempotency_key} "
+                                 f"failed: {errors!r}")
+                    outbox_event.attempts += 1
+                    outbox_event.next_attempt_at = timezone.now() + timedelta(
+                        seconds=backoff * 2 ** (outbox_event.attempts - 1))
+                    if outbox_event.attempts >= max_attempts:
+                        logger.error(f"Outbox event {outbox_event.idempotency_key} failed "
+                                     f"{outbox_event.attempts} times and is no longer sent")
+                    failed.append(outbox_event)
+
+            with transaction.atomic():
+                self.bulk_update(failed, ['attempts', 'next_attempt_at'])
+                self.filter(pk__in=[outbox_event.pk for outbox_event in outbox_events]).exclude(
+                    pk__in=[outbox_event.pk for outbox_event in failed]
+                ).update(processed_at=timezone.now())
+
+            total += len(outbox_events)
+            if len(outbox_events) < batch_size:
+                return total
+
+    def dead(self, max_attempts=10):
+        """Unprocessed events that failed `max_attempts` times and are no longer sent."""
+        return self.filter(processed_at__isnull=True, attempts__gte=max_attempts)
+
+    def purge(self, days):
+        """Delete the events processed more than the given number of days ago.
+
+        :returns: number of deleted events
+        """
+        deleted, _ = self.filter(processed_at__lt=timezone.now() - timedelta(days=days)).delete()
+        return deleted
+
+    def is_dispatched(self, idempotency_key):
+        """Return whether the event with the given idempotency key was dispatched before."""
+        return self.filter(idempotency_key=idempotency_key, dispatched_at__isnull=False).exists()
+
+    def claim(self, idempotency_key):
+        """Mark the event with the given idempotency key as dispatched, after its handlers ran.
+
+        :returns: False if the event was dispatched before, otherwise True
+        """
+        if self.filter(idempotency_key=idempotency_key,
+                       dispatched_at__isnull=True).update(dispatched_at=timezone.now()):
+            return True
+        # Events that did not go through the outbox are always dispatched
+        return not self.filter(idempotency_key=idempotency_key).exists()
+
+
+class SignalReadModelManager(models.Manager):
+    # Upsert the current state of the selected signals into the read model table, using a single
+    # statement so the write paths and the rebuild command produce exactly the same rows.
+    UPSERT_SQL = """
+        INSERT INTO signals_signalreadmodel (
+            _signal_id, created_at, state, stadsdeel, buurt_code, address_text, geometrie,
+            category_id, category_slug, main_category_id, main_category_slug, priority,
+            is_anonymous
+        )
+        SELECT
+            s.id, s.created_at, st.state, l.stadsdeel, l.buurt_code, l.address_text, l.geometrie,
+            c.id, c.slug, p.id, p.slug, pr.priority,
+            COALESCE(r.email = '' AND r.phone = '', FALSE)
+        FROM signals_signal AS s
+        LEFT JOIN signals_status AS st ON st.id = s.status_id
+        LEFT JOIN signals_location AS l ON l.id = s.location_id
+        LEFT JOIN signals_categoryassignment AS ca ON ca.id = s.category_assignment_id
+        LEFT JOIN signals_category AS c ON c.id = ca.category_id
+        LEFT JOIN signals_category AS p ON p.id = c.parent_id
+        LEFT JOIN signals_priority AS pr ON pr.id = s.priority_id
+        LEFT JOIN signals_reporter AS r ON r.id = s.reporter_id
+        WHERE {where}
+        ON CONFLICT (_signal_id) DO UPDATE SET
+            created_at = EXCLUDED.created_at,
+            state = EXCLUDED.state,
+            stadsdeel = EXCLUDED.stadsdeel,
+            buurt_code = EXCLUDED.buurt_code,
+            address_text = EXCLUDED.address_text,
+            geometrie = EXCLUDED.geometrie,
+            category_id = EXCLUDED.category_id,
+            category_slug = EXCLUDED.category_slug,
+            main_category_id = EXCLUDED.main_category_id,
+            main_category_slug = EXCLUDED.main_category_slug,
+            priority = EXCLUDED.priority,
+            is_anonymous = EXCLUDED.is_anonymous
+    """
+
+    def update_signals(self, signal_ids):
+        """Create or update the read model rows for the given `Signal` ids.
+
+        :param signal_ids: list of Signal ids
+        :returns: number of rows created or updated
+        """
+        if not signal_ids:
+            return 0
+
+        with connection.cursor() as cursor:
+            cursor.execute(self.UPSERT_SQL.format(where='s.id = ANY(%s)'), [list(signal_ids)])
+            return cursor.rowcount
+
+    def update_categories(self, category_ids):
+        """Update the read model rows of the signals in the given categories or their sub categories.
+
+        The rows copy the slugs of the category and its parent, used when a category is changed.
+
+        :param category_ids: list of Category ids
+        :returns: number of rows created or updated
+        """
+        if not category_ids:
+            return 0
+
+        with connection.cursor() as cursor:
+            cursor.execute(self.UPSERT_SQL.format(where='(c.id = ANY(%s) OR p.id = ANY(%s))'),
+                           [list(category_ids), list(category_ids)])
+            return cursor.rowcount
+
+    def rebuild(self, batch_size=10000):
+        """Recreate the read model rows for all `Signal` objects, in batches of signal ids.
+
+        :param batch_size: number of signal ids per batch (Default: 10000)
+        :returns: number of rows created or updated
+        """
+        from .models import Signal
+
+        total = 0
+        last_id = Signal.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        for start in range(0, last_id + 1, batch_size):
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(self.UPSERT_SQL.format(where='s.id >= %s AND s.id < %s'),
+                               [start, start + batch_size])
+                total += cursor.rowcount
+        return total
+
+
+class HistoryManager(models.Manager):
+    # Entries for all history sources, the descriptions of location updates and feedback are
+    # generated in Python (see `fill_descriptions`).
+    INSERT_SQL = """
+        INSERT INTO signals_history (identifier, _signal_id, "when", what, who, extra, description)
+        SELECT * FROM (
+            SELECT
+                CONCAT('UPDATE_STATUS_', s.id), s._signal_id, s.created_at, 'UPDATE_STATUS',
+                s."user", s.state, s.text
+            FROM signals_status AS s
+            UNION ALL SELECT
+                CONCAT('UPDATE_PRIORITY_', p.id), p._signal_id, p.created_at, 'UPDATE_PRIORITY',
+                p.created_by, p.priority, NULL
+            FROM signals_priority AS p
+            UNION ALL SELECT
+                CONCAT('UPDATE_CATEGORY_ASSIGNMENT_', ca.id), ca._signal_id, ca.created_at,
+                'UPDATE_CATEGORY_ASSIGNMENT', ca.created_by, c.name, ca.text
+            FROM signals_categoryassignment AS ca
+            INNER JOIN signals_category AS c ON c.id = ca.category_id
+            UNION ALL SELECT
+                CONCAT('CREATE_NOTE_', n.id), n._signal_id, n.created_at, 'CREATE_NOTE',
+                n.created_by, 'Notitie toegevoegd', n.text
+            FROM signals_note AS n
+            UNION ALL SELECT
+                CONCAT('UPDATE_LOCATION_', l.id), l._signal_id, l.created_at, 'UPDATE_LOCATION',
+                l.created_by, 'Locatie gewijzigd', NULL
+            FROM signals_location AS l
+            UNION ALL SELECT
+                CONCAT('RECEIVE_FEEDBACK_', f.token), f._signal_id, f.submitted_at,
+                'RECEIVE_FEEDBACK', NULL, 'Feedback ontvangen', NULL
+            FROM feedback_feedback AS f
+            WHERE f.submitted_at IS NOT NULL
+        ) AS entries (identifier, _signal_id, "when", what, who, extra, description)
+        WHERE _signal_id >= %s AND _signal_id < %s
+        ON CONFLICT (identifier) DO NOTHING
+    """
+
+    def build_entry(self, instance):
+        """Build the (unsaved) history entry for the given object.
+
+        :param instance: Status, Priority, CategoryAssignment, Note, Location or Feedback object
+        :returns: History object or None if the object has no history entry
+        """
+        from signals.apps.feedback.models import Feedback, _get_description_of_receive_feedback
+        from .models import CategoryAssignment, Location, Note, Priority, Status
+        from .models.location import _get_description_of_update_location
+
+        if isinstance(instance, Status):
+            entry = dict(what='UPDATE_STATUS', who=instance.user, extra=instance.state,
+                         description=instance.text)
+        elif isinstance(instance, Priority):
+            entry = dict(what='UPDATE_PRIORITY', who=instance.created_by, extra=instance.priority)
+        elif isinstance(instance, CategoryAssignment):
+            entry = dict(what='UPDATE_CATEGORY_ASSIGNMENT', who=instance.created_by,
+                         extra=instance.category.name, description=instance.text)
+        elif isinstance(instance, Note):
+            entry = dict(what='CREATE_NOTE', who=instance.created_by, extra='Notitie toegevoegd',
+                         description=instance.text)
+        elif isinstance(instance, Location):
+            entry = dict(what='UPDATE_LOCATION', who=instance.created_by, extra='Locatie gewijzigd',
+                         description=_get_description_of_update_location(instance))
+        elif isinstance(instance, Feedback) and instance.submitted_at is not None:
+            entry = dict(what='RECEIVE_FEEDBACK', when=instance.submitted_at,
+                         extra='Feedback ontvangen',
+                         description=_get_description_of_receive_feedback(instance))
+        else:
+            return None
+
+        entry.setdefault('when', instance.created_at)
+        return self.model(identifier='{}_{}'.format(entry['what'], instance.pk),
+                          _signal_id=instance._signal_id,
+                          **entry)
+
+    def add_entry(self, instance):
+        """Append the history entry for the given object, existing entries are left alone.
+
+        :param instance: Status, Priority, CategoryAssignment, Note, Location or Feedback object
+        """
+        entry = self.build_entry(instance)
+        if entry is not None:
+            self.bulk_create([entry], ignore_conflicts=True)
+
+    def backfill(self, batch_size=10000):
+        """Add the missing history entries for all `Signal` objects, in batches of signal ids.
+
+        :param batch_size: number of signal ids per batch (Default: 10000)
+        :returns: number of entries added
+        """
+        from .models import Signal
+
+        total = 0
+        last_id = Signal.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        for start in range(0, last_id + 1, batch_size):
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(self.INSERT_SQL, [start, start + batch_size])
+                total += cursor.rowcount
+        return total
+
+    def fill_descriptions(self, batch_size=1000):
+        """Generate the missing descriptions of location update and feedback entries.
+
+        :param batch_size: number of entries updated per transaction (Default: 1000)
+        :returns: number of entries updated
+        """
+        from signals.apps.feedback.models import Feedback
+        from .models import Location
+
+        sources = (
+            ('UPDATE_LOCATION', Location, int),
+            ('RECEIVE_FEEDBACK', Feedback, uuid.UUID),
+        )
+
+        total = 0
+        for what, model, to_pk in sources:
+            prefix = '{}_'.format(what)
+            while True:
+                identifiers = list(self.filter(what=what, description__isnull=True).values_list(
+                    'identifier', flat=True)[:batch_size])
+                if not identifiers:
+                    break
+
+                objects = model.objects.in_bulk([to_pk(i[len(prefix):]) for i in identifiers])
+                with transaction.atomic():
+                    for identifier in identifiers:
+                        instance = objects.get(to_pk(identifier[len(prefix):]))
+                        entry = self.build_entry(instance) if instance else None
+                        self.filter(identifier=identifier).update(
+                            description=entry.description if entry else '')
+                total += len(identifiers)
+        return total
+
+
 class SignalManager(models.Manager):
 
+    def _update_read_model(self, *signals):
+        from .models import SignalReadModel
+
+        SignalReadModel.objects.update_signals([signal.pk for signal in signals])
+
+    def _clear_cached_details(self, *signals):
+        from signals.apps.signals.detail_cache import clear_cached_details
+
+        clear_cached_details([signal.pk for signal in signals])
+
+    def _translate_category(self, category_assignment_data):
+        """Replace the category by the category it is translated to, if there is a translation.
+
+        :param category_assignment_data: deserialized data dict
+        :returns: category assignment data dict
+        """
+        from signals.apps.signals.category_tree import get_category_tree
+
+        translation = get_category_tree().get_translation(category_assignment_data['category'])
+        if translation is None:
+            return category_assignment_data
+
+        return dict(category_assignment_data,
+                    category=translation.new_category,
+                    text=translation.text,
+                    created_by=None)  # This wil show as "SIA systeem"
+
     def _create_initial_no_transaction(self, signal_data, location_data, status_data,
                                        category_assignment_data, reporter_data, priority_data=None):
         """Create a new `Signal` object with all related objects.
@@ -53,8 +472,8 @@ class SignalManager(models.Manager):
         # Create dependent model instances with correct foreign keys to Signal
         location = Location.objects.create(**location_data, _signal_id=signal.pk)
         status = Status.objects.create(**status_data, _signal_id=signal.pk)
-        category_assignment = CategoryAssignment.objects.create(**category_assignment_data,
-                                                                _signal_id=signal.pk)
+        category_assignment = CategoryAssignment.objects.create(
+            **self._translate_category(category_assignment_data), _signal_id=signal.pk)
         reporter = Reporter.objects.create(**reporter_data, _signal_id=signal.pk)
         priority = Priority.objects.create(**priority_data, _signal_id=signal.pk)
 
@@ -66,6 +485,8 @@ class SignalManager(models.Manager):
         signal.priority = priority
         signal.save()
 
+        self._update_read_model(signal)
+
         return signal
 
     def create_initial(self, signal_data, location_data, status_data, category_assignment_data,
@@ -91,120 +512,172 @@ class SignalManager(models.Manager):
                 priority_data=priority_data
             )
 
-            transaction.on_commit(lambda: create_initial.send_robust(sender=self.__class__,
-                                                                     signal_obj=signal))
+            add_to_outbox([('create_initial', {'signal_obj': signal})])
 
         return signal
 
+    def create_initial_bulk(self, signals_data):
+        """Create multiple new `Signal` objects with all related objects.
+
+        Every table is filled with one bulk insert and the `create_initial` DjangoSignals are sent
+        after the transaction is committed. Creating children (setting a parent) is not supported.
+
+        :param signals_data: list of dicts with the keyword arguments of `create_initial`
+        :returns: list of Signal objects
+        """
+        from .models import (CategoryAssignment, History, Location, Priority, Reporter, Signal,
+                             SignalReadModel, Status)
+
+        with transaction.atomic():
+            signals = Signal.objects.bulk_create(
+                [Signal(**data['signal_data']) for data in signals_data]
+            )
+
+            related = (
+                ('location', Location, 'location_data'),
+                ('status', Status, 'status_data'),
+                ('category_assignment', CategoryAssignment, 'category_assignment_data'),
+                ('reporter', Reporter, 'reporter_data'),
+                ('priority', Priority, 'priority_data'),
+            )
+            history_entries = []
+            for field_name, model, data_key in related:
+                instances = []
+                for signal, data in zip(signals, signals_data):
+                    model_data = data.get(data_key) or {}
+                    if model is CategoryAssignment:
+                        model_data = self._translate_category(model_data)
+                    instance = model(**model_data, _signal_id=signal.pk)
+                    if isinstance(instance, Location):
+                        instance.set_address_text()
+                    instances.append(instance)
+
+                for signal, instance in zip(signals, model.objects.bulk_create(instances)):
+                    setattr(signal, field_name, instance)
+                    history_entries.append(History.objects.build_entry(instance))
+
+            Signal.objects.bulk_update(signals, [field_name for field_name, _, _ in related])
+            History.objects.bulk_create(history_entries, ignore_conflicts=True)
+            SignalReadModel.objects.update_signals([signal.pk for signal in signals])
+
+            add_to_outbox([('create_initial', {'signal_obj': signal}) for signal in signals])
+
+        return signals
+
     def split(self, split_data, signal, user=None):  # noqa: C901
         """ Split the original signal into 2 or more (see settings SIGNAL_MAX_NUMBER_OF_CHILDREN)
             new signals
 
+        The children and their related objects are created with bulk inserts while the parent is
+        locked. Images of the parent are copied to the children by a Celery task that is started
+        after the transaction is committed.
+
         :param split_data: deserialized data dict containing data for new signals
         :param signal: Signal object, the original Signal
         :return: Signal object, the original Signal
         """
-        # See: https://docs.djangoproject.com/en/2.1/topics/db/queries/#copying-model-instances
-        from .models import (Attachment, CategoryAssignment, Location, Priority, Reporter,
-                             Signal, Status)
+        from django.conf import settings
+
+        from .models import (CategoryAssignment, History, Location, Note, Priority, Reporter,
+                             Signal, SignalReadModel, Status)
         from signals.apps.signals import workflow
+        from signals.apps.signals.tasks import copy_attachments_to_split_signal
 
-        loop_counter = 0
         with transaction.atomic():
             parent_signal = Signal.objects.select_for_update(nowait=True).get(pk=signal.pk)
-            for validated_data in split_data:
-                loop_counter += 1
-
-                # Create a new Signal, save it to get an ID in DB.
-                child_signal = Signal.objects.create(**{
-                    'text': validated_data['text'],
-                    'incident_date_start': parent_signal.incident_date_start,
-                    'parent': parent_signal,
-                })
-
-                # Set the relevant properties: location, status, reporter, priority, cate
-                # Deal with reverse foreign keys to child signal (for history tracking):
-                status = Status.objects.create(**{
-                    '_signal': child_signal,
-                    'state': workflow.GEMELD,
-                    'text': None,
-                    'user': None,  # i.e. SIA system
-                })
-
-                location_data = {'_signal': child_signal}
-                location_data.update({
-                    k: getattr(parent_signal.location, k) for k in [
-                        'geometrie',
-                        'stadsdeel',
-                        'buurt_code',
-                        'address',
-                        'created_by',
-                        'extra_properties',
-                        'bag_validated'
-                    ]
-                })
-                location = Location.objects.create(**location_data)
-
-                reporter_data = {'_signal': child_signal}
-                reporter_data.update({
-                    k: getattr(parent_signal.reporter, k) for k in ['email', 'phone', 'is_anonymized']  # noqa
-                })
-                reporter = Reporter.objects.create(**reporter_data)
-
-                priority = None
-                if parent_signal.priority:
-                    priority_data = {'_signal': child_signal}
-                    priority_data.update({
-                        k: getattr(parent_signal.priority, k) for k in ['priority', 'created_by']
-                    })
-                    priority = Priority.objects.create(**priority_data)
+
+            # The checks of `Signal._validate`, which is skipped by the bulk insert
+            if parent_signal.is_child():
+                raise ValidationError('A child of a child is not allowed')
+            if (parent_signal.children.count() + len(split_data) >
+                    settings.SIGNAL_MAX_NUMBER_OF_CHILDREN):
+                raise ValidationError('Maximum number of children reached for the parent Signal')
+
+            children = Signal.objects.bulk_create([Signal(
+                text=validated_data['text'],
+                incident_date_start=parent_signal.incident_date_start,
+                parent=parent_signal,
+            ) for validated_data in split_data])
+
+            # Set the relevant properties: location, status, reporter, priority, category
+            # Deal with reverse foreign keys to child signal (for history tracking):
+            location_data = {k: getattr(parent_signal.location, k) for k in [
+                'geometrie',
+                'stadsdeel',
+                'buurt_code',
+                'address',
+                'created_by',
+                'extra_properties',
+                'bag_validated'
+            ]}
+            reporter_data = {
+                k: getattr(parent_signal.reporter, k) for k in ['email', 'phone', 'is_anonymized']
+            }
+            priority_data = None
+            if parent_signal.priority:
+                priority_data = {
+                    k: getattr(parent_signal.priority, k) for k in ['priority', 'created_by']
+                }
+
+            related_models = (
+                ('status', Status),
+                ('location', Location),
+                ('reporter', Reporter),
+                ('priority', Priority),
+                ('category_assignment', CategoryAssignment),
+            )
+            related = {field_name: [] for field_name, _ in related_models}
+            for child_signal, validated_data in zip(children, split_data):
+                related['status'].append(Status(
+                    _signal=child_signal,
+                    state=workflow.GEMELD,
+                    text=None,
+                    user=None,  # i.e. SIA system
+                ))
+
+                location = Location(_signal=child_signal, **location_data)
+                location.set_address_text()
+                related['location'].append(location)
+
+                related['reporter'].append(Reporter(_signal=child_signal, **reporter_data))
+
+                if priority_data:
+                    related['priority'].append(Priority(_signal=child_signal, **priority_data))
 
                 if 'category_url' in validated_data['category']:
                     category = validated_data['category']['category_url']
                 elif 'sub_category' in validated_data['category']:
                     # Only for backwards compatibility
                     category = validated_data['category']['sub_category']
-
-                category_assignment_data = {
-                    '_signal': child_signal,
-                    'category': category,
-                }
-
-                category_assignment = CategoryAssignment.objects.create(**category_assignment_data)
-
-                # Deal with forward foreign keys from child signal
-                child_signal.location = location
-                child_signal.status = status
-                child_signal.reporter = reporter
-                child_signal.priority = priority
-                child_signal.category_assignment = category_assignment
-                child_signal.save()
-
-                # Ensure each child signal creation sends a DjangoSignal.
-                transaction.on_commit(lambda: create_child.send_robust(sender=self.__class__,
-                                                                       signal_obj=child_signal))
-
-                # Check if we need to copy the images of the parent
-                if 'reuse_parent_image' in validated_data and validated_data['reuse_parent_image']:
-                    parent_image_qs = parent_signal.attachments.filter(is_image=True)
-                    if parent_image_qs.exists():
-                        for parent_image in parent_image_qs.all():
-                            # Copy the original file and rename it by pre-pending the name with
-                            # split_{loop_counter}_{original_name}
-                            child_image_name = 'split_{}_{}'.format(
-                                loop_counter,
-                                parent_image.file.name.split('/').pop()
-                            )
-
-                            attachment = Attachment()
-                            attachment._signal = child_signal
-                            try:
-                                attachment.file.save(name=child_image_name,
-                                                     content=parent_image.file)
-                            except FileNotFoundError:
-                                pass
-                            else:
-                                attachment.save()
+                related['category_assignment'].append(CategoryAssignment(
+                    _signal=child_signal, **self._translate_category({'category': category})
+                ))
+
+            # Deal with forward foreign keys from child signal
+            history_entries = []
+            for field_name, model in related_models:
+                for instance in model.objects.bulk_create(related[field_name]):
+                    setattr(instance._signal, field_name, instance)
+                    history_entries.append(History.objects.build_entry(instance))
+            Signal.objects.bulk_update(children, list(related))
+
+            # Check if we need to copy the images of the parent
+            parent_image_ids = list(
+                parent_signal.attachments.filter(is_image=True).values_list('pk', flat=True)
+            )
+            copy_images = []
+            if parent_image_ids:
+                copy_images = [child_signal for child_signal, validated_data
+                               in zip(children, split_data)
+                               if validated_data.get('reuse_parent_image')]
+                notes = Note.objects.bulk_create([Note(
+                    _signal=child_signal,
+                    text='Afbeeldingen van de hoofdmelding worden gekopieerd.',
+                ) for child_signal in copy_images])
+                history_entries.extend(History.objects.build_entry(note) for note in notes)
+
+            History.objects.bulk_create(history_entries, ignore_conflicts=True)
+            SignalReadModel.objects.update_signals([child_signal.pk for child_signal in children])
 
             # Let's update the parent signal status to GESPLITST
             status, prev_status = self._update_status_no_transaction({
@@ -213,10 +686,22 @@ class SignalManager(models.Manager):
                 'created_by': user.email if user else None,
             }, signal=parent_signal)
 
-            transaction.on_commit(lambda: update_status.send_robust(sender=self.__class__,
-                                                                    signal_obj=parent_signal,
-                                                                    status=status,
-                                                                    prev_status=prev_status))
+            # Ensure each child signal creation sends a DjangoSignal.
+            to_send = [('create_child', {'signal_obj': child_signal}) for child_signal in children]
+            to_send.append(('update_status', {
+                'signal_obj': parent_signal,
+                'status': status,
+                'prev_status': prev_status,
+            }))
+            add_to_outbox(to_send)
+
+            for child_signal in copy_images:
+                transaction.on_commit(
+                    lambda child_pk=child_signal.pk: copy_attachments_to_split_signal.delay(
+                        signal_id=child_pk,
+                        attachment_ids=parent_image_ids,
+                    )
+                )
 
         return signal
 
@@ -225,6 +710,7 @@ class SignalManager(models.Manager):
 
     def add_attachment(self, file, signal):
         from .models import Attachment
+        from signals.apps.signals.tasks import generate_attachment_renditions
 
         with transaction.atomic():
             attachment = Attachment()
@@ -232,10 +718,14 @@ class SignalManager(models.Manager):
             attachment.file = file
             attachment.save()
 
+            to_send = [('add_attachment', {'signal_obj': signal, 'attachment': attachment})]
             if attachment.is_image:
-                add_image.send_robust(sender=self.__class__, signal_obj=signal)
+                transaction.on_commit(lambda: generate_attachment_renditions.delay(
+                    attachment_id=attachment.pk))
+                to_send.insert(0, ('add_image', {'signal_obj': signal, 'attachment': attachment}))
 
-            add_attachment.send_robust(sender=self.__class__, signal_obj=signal)
+            add_to_outbox(to_send)
+            self._clear_cached_details(signal)
 
         return attachment
 
@@ -254,6 +744,9 @@ class SignalManager(models.Manager):
         signal.location = location
         signal.save()
 
+        self._update_read_model(signal)
+        self._clear_cached_details(signal)
+
         return location, prev_location
 
     def update_location(self, data, signal):
@@ -265,10 +758,11 @@ class SignalManager(models.Manager):
         """
         with transaction.atomic():
             location, prev_location = self._update_location_no_transaction(data, signal)
-            transaction.on_commit(lambda: update_location.send_robust(sender=self.__class__,
-                                                                      signal_obj=signal,
-                                                                      location=location,
-                                                                      prev_location=prev_location))
+            add_to_outbox([('update_location', {
+                'signal_obj': signal,
+                'location': location,
+                'prev_location': prev_location,
+            })])
 
         return location
 
@@ -290,6 +784,9 @@ class SignalManager(models.Manager):
         signal.status = status
         signal.save()
 
+        self._update_read_model(signal)
+        self._clear_cached_details(signal)
+
         return status, prev_status
 
     def update_status(self, data, signal):
@@ -301,12 +798,71 @@ class SignalManager(models.Manager):
         """
         with transaction.atomic():
             status, prev_status = self._update_status_no_transaction(data=data, signal=signal)
-            transaction.on_commit(lambda: update_status.send_robust(sender=self.__class__,
-                                                                    signal_obj=signal,
-                                                                    status=status,
-                                                                    prev_status=prev_status))
+            add_to_outbox([('update_status', {
+                'signal_obj': signal,
+                'status': status,
+                'prev_status': prev_status,
+            })])
         return status
 
+    def update_status_bulk(self, data, signals):
+        """Update (create new) `Status` objects for multiple `Signal` objects.
+
+        The state transition is checked in the database query selecting the signals, signals that
+        cannot transition to the new state are skipped. The `update_status` DjangoSignals are sent
+        after the transaction is committed.
+
+        :param data: deserialized data dict, used for every new `Status`
+        :param signals: Signal queryset
+        :returns: list of updated Signal objects
+        """
+        from .models import History, Signal, SignalReadModel, Status
+        from signals.apps.signals import workflow
+
+        errors = Status(**data)._get_state_field_errors()
+        if errors:
+            raise ValidationError(errors)
+
+        from_states = [state for state, to_states in workflow.ALLOWED_STATUS_CHANGES.items()
+                       if data['state'] in to_states]
+        allowed = Q(status__state__in=from_states)
+        if workflow.LEEG in from_states:
+            allowed |= Q(status__isnull=True)
+
+        queryset = Signal.objects.filter(allowed, pk__in=signals.order_by().values('pk'))
+        if data['state'] != workflow.GESPLITST:
+            # The status of a parent Signal can only be "gesplitst"
+            queryset = queryset.exclude(
+                pk__in=Signal.objects.filter(parent__isnull=False).values('parent_id')
+            )
+
+        with transaction.atomic():
+            signals = list(queryset.select_related('status').select_for_update(of=('self',)))
+            statuses = Status.objects.bulk_create(
+                [Status(**data, _signal_id=signal.pk) for signal in signals]
+            )
+
+            to_send = []
+            now = timezone.now()
+            for signal, status in zip(signals, statuses):
+                to_send.append(('update_status', {
+                    'signal_obj': signal,
+                    'status': status,
+                    'prev_status': signal.status
+                }))
+                signal.status = status
+                signal.updated_at = now
+
+            Signal.objects.bulk_update(signals, ['status', 'updated_at'])
+            History.objects.bulk_create([History.objects.build_entry(status)
+                                         for status in statuses], ignore_conflicts=True)
+            SignalReadModel.objects.update_signals([signal.pk for signal in signals])
+            self._clear_cached_details(*signals)
+
+            add_to_outbox(to_send)
+
+        return signals
+
     def _update_category_assignment_no_transaction(self, data, signal):
         """Update (create new) `CategoryAssignment` object for given `Signal` object.
             If a transaction is needed use SignalManager.update_category_assignment
@@ -322,6 +878,9 @@ class SignalManager(models.Manager):
         signal.category_assignment = category_assignment
         signal.save()
 
+        self._update_read_model(signal)
+        self._clear_cached_details(signal)
+
         return category_assignment, prev_category_assignment
 
     def update_category_assignment(self, data, signal):
@@ -342,11 +901,11 @@ class SignalManager(models.Manager):
         with transaction.atomic():
             category_assignment, prev_category_assignment = \
                 self._update_category_assignment_no_transaction(data, signal)
-            transaction.on_commit(lambda: update_category_assignment.send_robust(
-                sender=self.__class__,
-                signal_obj=signal,
-                category_assignment=category_assignment,
-                prev_category_assignment=prev_category_assignment))
+            add_to_outbox([('update_category_assignment', {
+                'signal_obj': signal,
+                'category_assignment': category_assignment,
+                'prev_category_assignment': prev_category_assignment,
+            })])
 
         return category_assignment
 
@@ -366,10 +925,14 @@ class SignalManager(models.Manager):
             signal.reporter = reporter
             signal.save()
 
-            transaction.on_commit(lambda: update_reporter.send_robust(sender=self.__class__,
-                                                                      signal_obj=signal,
-                                                                      reporter=reporter,
-                                                                      prev_reporter=prev_reporter))
+            self._update_read_model(signal)
+            self._clear_cached_details(signal)
+
+            add_to_outbox([('update_reporter', {
+                'signal_obj': signal,
+                'reporter': reporter,
+                'prev_reporter': prev_reporter,
+            })])
 
         return reporter
 
@@ -389,6 +952,9 @@ class SignalManager(models.Manager):
         signal.priority = priority
         signal.save()
 
+        self._update_read_model(signal)
+        self._clear_cached_details(signal)
+
         return priority, prev_priority
 
     def update_priority(self, data, signal):
@@ -400,10 +966,11 @@ class SignalManager(models.Manager):
         """
         with transaction.atomic():
             priority, prev_priority = self._update_priority_no_transaction(data, signal)
-            transaction.on_commit(lambda: update_priority.send_robust(sender=self.__class__,
-                                                                      signal_obj=signal,
-                                                                      priority=priority,
-                                                                      prev_priority=prev_priority))
+            add_to_outbox([('update_priority', {
+                'signal_obj': signal,
+                'priority': priority,
+                'prev_priority': prev_priority,
+            })])
 
         return priority
 
@@ -430,10 +997,9 @@ class SignalManager(models.Manager):
         # signals upon creation of a Note.
         with transaction.atomic():
             note = self._create_note_no_transaction(data, signal)
-            transaction.on_commit(lambda: create_note.send_robust(sender=self.__class__,
-                                                                  signal_obj=signal,
-                                                                  note=note))
+            add_to_outbox([('create_note', {'signal_obj': signal, 'note': note})])
             signal.save()
+            self._clear_cached_details(signal)
 
         return note
 
@@ -450,12 +1016,10 @@ class SignalManager(models.Manager):
 
         with transaction.atomic():
             to_send = []
-            sender = self.__class__
 
             if 'location' in data:
                 location, prev_location = self._update_location_no_transaction(data['location'], signal)  # noqa: E501
-                to_send.append((update_location, {
-                    'sender': sender,
+                to_send.append(('update_location', {
                     'signal_obj': signal,
                     'location': location,
                     'prev_location': prev_location
@@ -463,8 +1027,7 @@ class SignalManager(models.Manager):
 
             if 'status' in data:
                 status, prev_status = self._update_status_no_transaction(data['status'], signal)
-                to_send.append((update_status, {
-                    'sender': sender,
+                to_send.append(('update_status', {
                     'signal_obj': signal,
                     'status': status,
                     'prev_status': prev_status
@@ -481,8 +1044,7 @@ class SignalManager(models.Manager):
                         self._update_category_assignment_no_transaction(
                             data['category_assignment'], signal)
 
-                    to_send.append((update_category_assignment, {
-                        'sender': sender,
+                    to_send.append(('update_category_assignment', {
                         'signal_obj': signal,
                         'category_assignment': category_assignment,
                         'prev_category_assignment': prev_category_assignment
@@ -491,8 +1053,7 @@ class SignalManager(models.Manager):
             if 'priority' in data:
                 priority, prev_priority = \
                     self._update_priority_no_transaction(data['priority'], signal)
-                to_send.append((update_priority, {
-                    'sender': sender,
+                to_send.append(('update_priority', {
                     'signal_obj': signal,
                     'priority': priority,
                     'prev_priority': prev_priority
@@ -502,14 +1063,16 @@ class SignalManager(models.Manager):
                 # The 0 index is there because we only allow one note to be
                 # added per PATCH.
                 note = self._create_note_no_transaction(data['notes'][0], signal)
-                to_send.append((create_note, {
-                    'sender': sender,
+                to_send.append(('create_note', {
                     'signal_obj': signal,
                     'note': note
                 }))
+                # Like `create_note`, the new note changes the signal
+                signal.save()
+                self._clear_cached_details(signal)
 
             # Send out all Django signals:
-            transaction.on_commit(lambda: send_signals(to_send))
+            add_to_outbox(to_send)
 
         signal.refresh_from_db()
         return signal
@@ -0,0 +1,17 @@
+# Generated by Django 2.2.9 on 2020-01-28 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signals', '0093_merge_20200122_1646'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='signal',
+            index=models.Index(fields=['created_at', 'id'], name='signals_sig_created_fb3cbd_idx'),
+        ),
+    ]
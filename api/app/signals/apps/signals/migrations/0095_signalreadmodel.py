@@ -0,0 +1,137 @@
+# Generated by Django 2.2.9 on 2020-01-29 09:41
+
+import django.contrib.gis.db.models.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Fill the read model for all existing signals (same statement as used by the
+# `SignalReadModelManager`, copied here so this migration does not change along with the code).
+POPULATE_SIGNAL_READ_MODEL = """
+    INSERT INTO signals_signalreadmodel (
+        _signal_id, created_at, state, stadsdeel, buurt_code, address_text, geometrie,
+        category_id, category_slug, main_category_id, main_category_slug, priority, is_anonymous
+    )
+    SELECT
+        s.id, s.created_at, st.state, l.stadsdeel, l.buurt_code, l.address_text, l.geometrie,
+        c.id, c.slug, p.id, p.slug, pr.priority, COALESCE(r.email = '' AND r.phone = '', FALSE)
+    FROM signals_signal AS s
+    LEFT JOIN signals_status AS st ON st.id = s.status_id
+    LEFT JOIN signals_location AS l ON l.id = s.location_id
+    LEFT JOIN signals_categoryassignment AS ca ON ca.id = s.category_assignment_id
+    LEFT JOIN signals_category AS c ON c.id = ca.category_id
+    LEFT JOIN signals_category AS p ON p.id = c.parent_id
+    LEFT JOIN signals_priority AS pr ON pr.id = s.priority_id
+    LEFT JOIN signals_reporter AS r ON r.id = s.reporter_id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signals', '0094_signal_created_at_id_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SignalReadModel',
+            fields=[
+                ('_signal', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE,
+                                                 primary_key=True, related_name='read_model',
+                                                 serialize=False, to='signals.Signal')),
+                ('created_at', models.DateTimeField(editable=False)),
+                ('state', models.CharField(choices=[
+                    ('m', 'Gemeld'),
+                    ('i', 'In afwachting van behandeling'),
+                    ('b', 'In behandeling'),
+                    ('h', 'On hold'),
+                    ('ingepland', 'Ingepland'),
+                    ('ready to send', 'Te verzenden naar extern systeem'),
+                    ('o', 'Afgehandeld'),
+                    ('a', 'Geannuleerd'),
+                    ('reopened', 'Heropend'),
+                    ('s', 'Gesplitst'),
+                    ('closure requested', 'Verzoek tot afhandeling'),
+                    ('sent', 'Verzonden naar extern systeem'),
+                    ('send failed', 'Verzending naar extern systeem mislukt'),
+                    ('done external', 'Melding is afgehandeld in extern systeem'),
+                    ('reopen requested', 'Verzoek tot heropenen')],
+                    max_length=20, null=True)),
+                ('stadsdeel', models.CharField(choices=[
+                    ('A', 'Centrum'),
+                    ('B', 'Westpoort'),
+                    ('E', 'West'),
+                    ('M', 'Oost'),
+                    ('N', 'Noord'),
+                    ('T', 'Zuidoost'),
+                    ('K', 'Zuid'),
+                    ('F', 'Nieuw-West')],
+                    max_length=1, null=True)),
+                ('buurt_code', models.CharField(max_length=4, null=True)),
+                ('address_text', models.CharField(max_length=256, null=True)),
+                ('geometrie', django.contrib.gis.db.models.fields.PointField(null=True, srid=4326)),
+                ('category_slug', models.CharField(max_length=50, null=True)),
+                ('main_category_slug', models.CharField(max_length=50, null=True)),
+                ('priority', models.CharField(max_length=10, null=True)),
+                ('is_anonymous', models.BooleanField(default=False)),
+                ('category', models.ForeignKey(null=True,
+                                               on_delete=django.db.models.deletion.SET_NULL,
+                                               related_name='+', to='signals.Category')),
+                ('main_category', models.ForeignKey(null=True,
+                                                    on_delete=django.db.models.deletion.SET_NULL,
+                                                    related_name='+', to='signals.Category')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='signalreadmodel',
+            index=models.Index(fields=['created_at', '_signal'],
+                               name='signals_sig_created_8c186e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='signalreadmodel',
+            index=models.Index(fields=['state', 'created_at'], name='signals_sig_state_1aa412_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='signalreadmodel',
+            index=models.Index(fields=['stadsdeel', 'created_at'],
+                               name='signals_sig_stadsde_cf62cc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='signalreadmodel',
+            index=models.Index(fields=['buurt_code', 'created_at'],
+                               name='signals_sig_buurt_c_a7f648_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='signalreadmodel',
+            index=models.Index(fields=['category', 'created_at'],
+                               name='signals_sig_categor_742945_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='signalreadmodel',
+            index=models.Index(fields=['main_category', 'created_at'],
+                               name='signals_sig_main_ca_1d7ddc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='signalreadmodel',
+            index=models.Index(fields=['priority', 'created_at'],
+                               name='signals_sig_priorit_3218b3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='signalreadmodel',
+            index=models.Index(fields=['category_slug', '_signal'],
+                               name='signals_sig_categor_d039db_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='signalreadmodel',
+            index=models.Index(fields=['main_category_slug', '_signal'],
+                               name='signals_sig_main_ca_e82852_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='signalreadmodel',
+            index=models.Index(fields=['address_text', '_signal'],
+                               name='signals_sig_address_90ffc2_idx'),
+        ),
+        migrations.RunSQL(
+            sql=POPULATE_SIGNAL_READ_MODEL,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
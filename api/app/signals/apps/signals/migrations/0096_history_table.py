@@ -0,0 +1,88 @@
+# Generated by Django 2.2.9 on 2020-02-04 10:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# All history entries of the `signals_history_view`, the descriptions of location updates and
+# feedback are left empty, they are generated by the `backfill_signal_history` command (copied
+# here so this migration does not change along with the `HistoryManager`).
+HISTORY_ENTRIES = """
+    SELECT
+        CONCAT('UPDATE_STATUS_', s.id), s._signal_id, s.created_at, 'UPDATE_STATUS', s."user",
+        s.state, s.text
+    FROM signals_status AS s
+    UNION ALL SELECT
+        CONCAT('UPDATE_PRIORITY_', p.id), p._signal_id, p.created_at, 'UPDATE_PRIORITY',
+        p.created_by, p.priority, NULL
+    FROM signals_priority AS p
+    UNION ALL SELECT
+        CONCAT('UPDATE_CATEGORY_ASSIGNMENT_', ca.id), ca._signal_id, ca.created_at,
+        'UPDATE_CATEGORY_ASSIGNMENT', ca.created_by, c.name, ca.text
+    FROM signals_categoryassignment AS ca
+    INNER JOIN signals_category AS c ON c.id = ca.category_id
+    UNION ALL SELECT
+        CONCAT('CREATE_NOTE_', n.id), n._signal_id, n.created_at, 'CREATE_NOTE', n.created_by,
+        'Notitie toegevoegd', n.text
+    FROM signals_note AS n
+    UNION ALL SELECT
+        CONCAT('UPDATE_LOCATION_', l.id), l._signal_id, l.created_at, 'UPDATE_LOCATION',
+        l.created_by, 'Locatie gewijzigd', NULL
+    FROM signals_location AS l
+    UNION ALL SELECT
+        CONCAT('RECEIVE_FEEDBACK_', f.token), f._signal_id, f.submitted_at, 'RECEIVE_FEEDBACK',
+        NULL, 'Feedback ontvangen', NULL
+    FROM feedback_feedback AS f
+    WHERE f.submitted_at IS NOT NULL
+"""
+
+POPULATE_HISTORY = """
+    INSERT INTO signals_history (identifier, _signal_id, "when", what, who, extra, description)
+    {};
+""".format(HISTORY_ENTRIES)
+
+CREATE_HISTORY_VIEW = """
+    CREATE VIEW "signals_history_view" AS
+    SELECT * FROM ({}) AS entries (identifier, _signal_id, "when", what, who, extra, description)
+    ORDER BY "when" DESC;
+""".format(HISTORY_ENTRIES)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0007_auto_20190611_1126'),
+        ('signals', '0095_signalreadmodel'),
+    ]
+
+    operations = [
+        # The unmanaged model backed by the view is replaced by a table
+        migrations.DeleteModel(
+            name='History',
+        ),
+        migrations.RunSQL(
+            'DROP VIEW IF EXISTS "signals_history_view";',
+            reverse_sql=CREATE_HISTORY_VIEW,
+        ),
+        migrations.CreateModel(
+            name='History',
+            fields=[
+                ('identifier', models.CharField(max_length=255, primary_key=True,
+                                                serialize=False)),
+                ('when', models.DateTimeField(null=True)),
+                ('what', models.CharField(max_length=255)),
+                ('who', models.CharField(max_length=255, null=True)),
+                ('extra', models.CharField(max_length=255, null=True)),
+                ('description', models.TextField(max_length=3000, null=True)),
+                ('_signal', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE,
+                                              related_name='history', to='signals.Signal')),
+            ],
+            options={
+                'ordering': ('-when', '-identifier'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='history',
+            index=models.Index(fields=['_signal', 'when'], name='signals_his__signal_8ccae9_idx'),
+        ),
+        migrations.RunSQL(POPULATE_HISTORY, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 2.2.9 on 2020-02-06 14:21
+
+from django.db import migrations, models
+
+import signals.apps.signals.models.attachment
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signals', '0096_history_table'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attachment',
+            name='sha256',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.AlterField(
+            model_name='attachment',
+            name='file',
+            field=models.FileField(
+                max_length=255,
+                upload_to=signals.apps.signals.models.attachment.attachment_upload_to
+            ),
+        ),
+    ]
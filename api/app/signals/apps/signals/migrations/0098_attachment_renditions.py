@@ -0,0 +1,31 @@
+# Generated by Django 2.2.9 on 2020-02-07 09:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signals', '0097_attachment_sha256'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attachment',
+            name='cropped_image',
+            field=models.FileField(blank=True, max_length=255, null=True,
+                                   upload_to='attachments/renditions/'),
+        ),
+        migrations.AddField(
+            model_name='attachment',
+            name='pdf_image',
+            field=models.FileField(blank=True, max_length=255, null=True,
+                                   upload_to='attachments/renditions/'),
+        ),
+        migrations.AddField(
+            model_name='attachment',
+            name='thumbnail',
+            field=models.FileField(blank=True, max_length=255, null=True,
+                                   upload_to='attachments/renditions/'),
+        ),
+    ]
@@ -20,9 +20,11 @@ from signals.apps.signals.models.location import (
 )
 from signals.apps.signals.models.mixins import CreatedUpdatedModel
 from signals.apps.signals.models.note import Note
+from signals.apps.signals.models.outbox import OutboxEvent
 from signals.apps.signals.models.priority import Priority
 from signals.apps.signals.models.reporter import Reporter
 from signals.apps.signals.models.signal import Signal
+from signals.apps.signals.models.signal_read_model import SignalReadModel
 from signals.apps.signals.models.slo import ServiceLevelObjective
 from signals.apps.signals.models.status import Status
 from signals.apps.signals.models.status_message_template import StatusMessageTemplate
@@ -50,9 +52,11 @@ __all__ = [
     'get_address_text',
     'CreatedUpdatedModel',
     'Note',
+    'OutboxEvent',
     'Priority',
     'Reporter',
     'Signal',
+    'SignalReadModel',
     'ServiceLevelObjective',
     'Status',
     'StatusMessageTemplate',
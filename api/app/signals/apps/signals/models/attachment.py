@@ -1,10 +1,13 @@
+import hashlib
 import imghdr
 import logging
+import os
 
 from django.contrib.gis.db import models
+from django.core.files.base import ContentFile
+from django.utils import timezone
 from imagekit import ImageSpec
-from imagekit.cachefiles import ImageCacheFile
-from imagekit.processors import ResizeToFit
+from imagekit.processors import ResizeToFit, Transpose
 from PIL import ImageFile
 
 from signals.apps.signals.models.mixins import CreatedUpdatedModel
@@ -16,6 +19,18 @@ logger = logging.getLogger(__name__)
 ImageFile.LOAD_TRUNCATED_IMAGES = True
 
 
+def attachment_upload_to(instance, filename):
+    """
+    Attachments are stored under their SHA-256 digest, so equal uploads share one file. The
+    dated location is only used for files saved before the digest is known.
+    """
+    if instance.sha256:
+        _, extension = os.path.splitext(filename)
+        return 'attachments/{}/{}{}'.format(instance.sha256[:2], instance.sha256,
+                                            extension.lower())
+    return timezone.now().strftime('attachments/%Y/%m/%d/{}').format(filename)
+
+
 class Attachment(CreatedUpdatedModel):
     created_by = models.EmailField(null=True, blank=True)
     _signal = models.ForeignKey(
@@ -25,14 +40,23 @@ class Attachment(CreatedUpdatedModel):
         related_name='attachments',
     )
     file = models.FileField(
-        upload_to='attachments/%Y/%m/%d/',
+        upload_to=attachment_upload_to,
         null=False,
         blank=False,
         max_length=255
     )
+    sha256 = models.CharField(max_length=64, null=True, blank=True, editable=False)
     mimetype = models.CharField(max_length=30, blank=False, null=False)
     is_image = models.BooleanField(default=False)
 
+    # Renditions of images, generated in the background after the upload
+    thumbnail = models.FileField(upload_to='attachments/renditions/', null=True, blank=True,
+                                 max_length=255)
+    cropped_image = models.FileField(upload_to='attachments/renditions/', null=True, blank=True,
+                                     max_length=255)
+    pdf_image = models.FileField(upload_to='attachments/renditions/', null=True, blank=True,
+                                 max_length=255)
+
     class Meta:
         ordering = ('created_at',)
         indexes = [
@@ -44,37 +68,107 @@ class Attachment(CreatedUpdatedModel):
     class NotAnImageException(Exception):
         pass
 
+    class Thumbnail(ImageSpec):
+        processors = [Transpose(), ResizeToFit(200, 200), ]
+        format = 'JPEG'
+        options = {'quality': 80}
+
     class CroppedImage(ImageSpec):
         processors = [ResizeToFit(800, 800), ]
         format = 'JPEG'
         options = {'quality': 80}
 
-    @property
-    def image_crop(self):
-        return self._crop_image()
+    class PdfImage(ImageSpec):
+        processors = [Transpose(), ResizeToFit(800, 800), ]
+        format = 'JPEG'
+        options = {'quality': 90}
+
+    RENDITIONS = (
+        ('thumbnail', Thumbnail),
+        ('cropped_image', CroppedImage),
+        ('pdf_image', PdfImage),
+    )
 
-    def _crop_image(self):
+    def _check_is_image(self):
         if not self.is_image:
             raise Attachment.NotAnImageException("Attachment is not an image. Use is_image to check"
                                                  " if attachment is an image before asking for the "
                                                  "cropped version.")
 
-        generator = Attachment.CroppedImage(source=self.file)
-        cache_file = ImageCacheFile(generator)
-
-        try:
-            cache_file.generate()
-        except FileNotFoundError as e:
-            logger.warn("File not found when generating cache file: " + str(e))
-
-        return cache_file
+    @property
+    def image_crop(self):
+        """
+        The 800px rendition, the original image is used until the rendition is generated.
+        """
+        self._check_is_image()
+        return self.cropped_image or self.file
+
+    def generate_renditions(self):
+        """
+        Generate the missing renditions of the image. Renditions of attachments with a digest are
+        stored under that digest, so attachments sharing a stored file also share the renditions.
+        """
+        self._check_is_image()
+
+        update_fields = []
+        for field_name, spec in self.RENDITIONS:
+            rendition = getattr(self, field_name)
+            if rendition:
+                continue
+
+            if self.sha256:
+                name = '{}/{}_{}.jpg'.format(self.sha256[:2], self.sha256, field_name)
+            else:
+                name = 'attachment_{}_{}.jpg'.format(self.pk, field_name)
+
+            stored_name = rendition.field.generate_filename(self, name)
+            if rendition.storage.exists(stored_name):
+                setattr(self, field_name, stored_name)
+            else:
+                content = spec(source=self.file).generate()
+                rendition.save(name, ContentFile(content.read()), save=False)
+            update_fields.append(field_name)
+
+        if update_fields:
+            self.save(update_fields=update_fields)
+
+    def _get_sha256(self):
+        sha256 = hashlib.sha256()
+        for chunk in self.file.chunks():
+            sha256.update(chunk)
+        return sha256.hexdigest()
+
+    def _reuse_stored_file(self):
+        """
+        Point to the stored file with the same content, if there is one, so the upload is not
+        written to the storage again.
+        """
+        name = self.file.field.generate_filename(self, self.file.name)
+        if self.file.storage.exists(name):
+            self.file = name
+
+    def copy_to(self, signal):
+        """
+        Create an attachment for the given signal that shares the stored file of this attachment.
+        """
+        return Attachment.objects.create(
+            _signal=signal,
+            file=self.file.name,
+            sha256=self.sha256,
+            mimetype=self.mimetype,
+            is_image=self.is_image,
+            **{field_name: getattr(self, field_name).name for field_name, _ in self.RENDITIONS},
+        )
 
     def save(self, *args, **kwargs):
-        if self.pk is None:
+        if self.pk is None and not self.file._committed:
             # Check if file is image
             self.is_image = imghdr.what(self.file) is not None
 
             if not self.mimetype and hasattr(self.file.file, 'content_type'):
                 self.mimetype = self.file.file.content_type
 
+            self.sha256 = self._get_sha256()
+            self._reuse_stored_file()
+
         super().save(*args, **kwargs)
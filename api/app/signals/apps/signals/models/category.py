@@ -5,14 +5,13 @@ from django.core.exceptions import ValidationError
 from django.urls import resolve
 from django_extensions.db.fields import AutoSlugField
 
+from signals.apps.signals.category_tree import get_category_tree
+
 
 class CategoryManager(models.Manager):
     def get_from_url(self, url):
         _, _, kwargs = resolve((urlparse(url)).path)
-        if 'slug' in kwargs and 'sub_slug' in kwargs:
-            return self.get_queryset().get(slug=kwargs['sub_slug'], parent__slug=kwargs['slug'])
-        else:
-            return self.get_queryset().get(slug=kwargs['slug'], parent__isnull=True)
+        return get_category_tree().get_by_slugs(kwargs['slug'], kwargs.get('sub_slug'))
 
 
 class Category(models.Model):
@@ -1,11 +1,19 @@
 from django.contrib.gis.db import models
 
-from signals.apps.feedback.models import _get_description_of_receive_feedback
-from signals.apps.signals.models.location import _get_description_of_update_location
+from signals.apps.feedback.models import Feedback, _get_description_of_receive_feedback
+from signals.apps.signals.managers import HistoryManager
+from signals.apps.signals.models.location import Location, _get_description_of_update_location
 from signals.apps.signals.workflow import STATUS_CHOICES
 
 
 class History(models.Model):
+    """
+    Append-only history of a `Signal`.
+
+    Entries are added when a `Status`, `Priority`, `CategoryAssignment`, `Note` or `Location` is
+    created and when `Feedback` is submitted (see `signal_receivers`), the description is stored
+    at that time. The `backfill_signal_history` management command adds missing entries.
+    """
     identifier = models.CharField(primary_key=True, max_length=255)
     _signal = models.ForeignKey('signals.Signal',
                                 related_name='history',
@@ -15,11 +23,15 @@ class History(models.Model):
     what = models.CharField(max_length=255)
     who = models.CharField(max_length=255, null=True)  # old entries in database may have no user
     extra = models.CharField(max_length=255, null=True)  # not relevant for every logged model.
-    description = models.TextField(max_length=3000)
+    description = models.TextField(max_length=3000, null=True)
+
+    objects = HistoryManager()
 
-    # No changes to this database view please!
+    # History entries are never changed once they are created
     def save(self, *args, **kwargs):
-        raise NotImplementedError
+        if not self._state.adding:
+            raise NotImplementedError
+        super(History, self).save(*args, **kwargs)
 
     def delete(self, *args, **kwargs):
         raise NotImplementedError
@@ -48,15 +60,21 @@ class History(models.Model):
         return self.who
 
     def get_description(self):
+        if self.description is not None:
+            return self.description
+
+        # Entries migrated from the history view have no description for location updates and
+        # feedback until the `backfill_signal_history` command has been run.
         if self.what == 'UPDATE_LOCATION':
             location_id = int(self.identifier.strip('UPDATE_LOCATION_'))
-            return _get_description_of_update_location(location_id)
+            return _get_description_of_update_location(Location.objects.get(id=location_id))
         elif self.what == 'RECEIVE_FEEDBACK':
             feedback_id = self.identifier.strip('RECEIVE_FEEDBACK_')
-            return _get_description_of_receive_feedback(feedback_id)
-        else:
-            return self.description
+            return _get_description_of_receive_feedback(Feedback.objects.get(token=feedback_id))
+        return None
 
     class Meta:
-        managed = False
-        db_table = 'signals_history_view'
+        ordering = ('-when', '-identifier')
+        indexes = [
+            models.Index(fields=['_signal', 'when']),
+        ]
@@ -95,10 +95,8 @@ class Location(CreatedUpdatedModel):
         return to_transform
 
 
-def _get_description_of_update_location(location_id):
+def _get_description_of_update_location(location):
     """Get descriptive text for location update history entries."""
-    location = Location.objects.get(id=location_id)
-
     # Craft a message for UI
     desc = 'Stadsdeel: {}\n'.format(
         location.get_stadsdeel_display()) if location.stadsdeel else ''
@@ -0,0 +1,38 @@
+from django.contrib.postgres.fields import JSONField
+from django.db import models
+
+from signals.apps.signals.managers import OutboxEventManager
+
+
+class OutboxEvent(models.Model):
+    """
+    `SignalManager` DjangoSignal that still has to be (or was) sent, the transactional outbox.
+
+    The rows are written in the same transaction as the change they describe and are sent by the
+    `relay_outbox` task once that transaction is committed. Sending is at-least-once, consumers
+    use the `idempotency_key` to skip an event they already handled. An event with failing
+    receivers stays unprocessed and is sent again after `next_attempt_at`. Processed rows are
+    deleted by the `purge_outbox` task.
+    """
+    event = models.CharField(max_length=50)
+    # Keyword arguments of the DjangoSignal, maps the argument name to [model label, pk] or None.
+    kwargs = JSONField()
+    idempotency_key = models.CharField(max_length=100, unique=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+
+    objects = OutboxEventManager()
+
+    class Meta:
+        ordering = ('id', )
+        indexes = [
+            models.Index(fields=['processed_at', 'id']),
+        ]
+
+    def __str__(self):
+        return self.idempotency_key
@@ -97,6 +97,7 @@ class Signal(CreatedUpdatedModel):
         indexes = [
             models.Index(fields=['created_at']),
             models.Index(fields=['id', 'parent']),
+            models.Index(fields=['created_at', 'id']),
         ]
 
     def __init__(self, *args, **kwargs):
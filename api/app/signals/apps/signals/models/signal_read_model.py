@@ -0,0 +1,64 @@
+from django.contrib.gis.db import models
+
+from signals.apps.signals import workflow
+from signals.apps.signals.managers import SignalReadModelManager
+from signals.apps.signals.models.location import STADSDELEN
+
+
+class SignalReadModel(models.Model):
+    """
+    Denormalized current state of a `Signal`, one row per `Signal`.
+
+    Used by the list endpoints to filter and order signals without joining the location, status,
+    category assignment, category, priority and reporter tables. The rows are updated by the
+    `SignalManager` actions and when a `Category` is saved. Changes made with `QuerySet.update`
+    (the only way to change a category slug) are not copied, run the `rebuild_signal_read_model`
+    management command after such an update.
+    """
+    _signal = models.OneToOneField('signals.Signal',
+                                   primary_key=True,
+                                   related_name='read_model',
+                                   on_delete=models.CASCADE)
+
+    # Copied from the `Signal`, allows filtering and ordering on one table.
+    created_at = models.DateTimeField(editable=False)
+
+    state = models.CharField(max_length=20, null=True, choices=workflow.STATUS_CHOICES)
+
+    stadsdeel = models.CharField(max_length=1, null=True, choices=STADSDELEN)
+    buurt_code = models.CharField(max_length=4, null=True)
+    address_text = models.CharField(max_length=256, null=True)
+    geometrie = models.PointField(null=True)
+
+    category = models.ForeignKey('signals.Category',
+                                 related_name='+',
+                                 null=True,
+                                 on_delete=models.SET_NULL)
+    category_slug = models.CharField(max_length=50, null=True)
+    main_category = models.ForeignKey('signals.Category',
+                                      related_name='+',
+                                      null=True,
+                                      on_delete=models.SET_NULL)
+    main_category_slug = models.CharField(max_length=50, null=True)
+
+    priority = models.CharField(max_length=10, null=True)
+    is_anonymous = models.BooleanField(default=False)
+
+    objects = SignalReadModelManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', '_signal']),
+            models.Index(fields=['state', 'created_at']),
+            models.Index(fields=['stadsdeel', 'created_at']),
+            models.Index(fields=['buurt_code', 'created_at']),
+            models.Index(fields=['category', 'created_at']),
+            models.Index(fields=['main_category', 'created_at']),
+            models.Index(fields=['priority', 'created_at']),
+            models.Index(fields=['category_slug', '_signal']),
+            models.Index(fields=['main_category_slug', '_signal']),
+            models.Index(fields=['address_text', '_signal']),
+        ]
+
+    def __str__(self):
+        return '{} - {} - {}'.format(self._signal_id, self.state, self.category_slug)
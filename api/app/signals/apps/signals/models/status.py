@@ -84,6 +84,22 @@ class Status(CreatedUpdatedModel):
                 to_state=new_state_display)
             errors['state'] = ValidationError(error_msg, code='invalid')
 
+        errors.update(self._get_state_field_errors())
+
+        if errors:
+            raise ValidationError(errors)
+
+    def _get_state_field_errors(self):
+        """Validate the fields that are required or not allowed for the new state.
+
+        Unlike `clean` this does not depend on the current state of the `Signal`.
+
+        :returns: dict of field names and ValidationErrors
+        """
+        errors = {}
+        new_state = self.state
+        new_state_display = self.get_state_display()
+
         # Validating state "TE_VERZENDEN".
         if new_state == workflow.TE_VERZENDEN and not self.target_api:
             error_msg = 'This field is required when changing `state` to `{new_state}`.'.format(
@@ -101,5 +117,4 @@ class Status(CreatedUpdatedModel):
                 new_state=new_state_display)
             errors['text'] = ValidationError(error_msg, code='required')
 
-        if errors:
-            raise ValidationError(errors)
+        return errors
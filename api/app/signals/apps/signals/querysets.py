@@ -1,5 +1,7 @@
 from django.conf import settings
-from django.db.models import Q, QuerySet
+from django.db.models import QuerySet
+
+from signals.apps.signals.category_tree import get_visible_category_ids
 
 
 class SignalQuerySet(QuerySet):
@@ -8,11 +10,7 @@ class SignalQuerySet(QuerySet):
             if not user.is_superuser and not user.has_perm('signals.sia_can_view_all_categories'):
                 # We are not a superuser and we do not have the "show all categories" permission
                 return self.filter(
-                    Q(category_assignment__category__categorydepartment__is_responsible=True) |
-                    Q(category_assignment__category__categorydepartment__can_view=True),
-                    category_assignment__category__departments__in=list(
-                        user.profile.departments.values_list('pk', flat=True)
-                    )
+                    category_assignment__category_id__in=list(get_visible_category_ids(user))
                 )
 
         return self.all()
@@ -1,14 +1,73 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
-from signals.apps.signals import tasks
-from signals.apps.signals.managers import create_child, create_initial
+from signals.apps.feedback.models import Feedback
+from signals.apps.signals import category_tree, dispatcher
+from signals.apps.signals.managers import get_idempotency_key
+from signals.apps.signals.models import (
+    Category,
+    CategoryAssignment,
+    CategoryDepartment,
+    CategoryTranslation,
+    Department,
+    History,
+    Location,
+    Note,
+    Priority,
+    ServiceLevelObjective,
+    SignalReadModel,
+    Status
+)
 
 
-@receiver(create_initial, dispatch_uid='signals_create_initial')
-def signals_create_initial_handler(sender, signal_obj, **kwargs):
-    tasks.translate_category(signal_obj.id)
+@receiver(list(dispatcher.EVENTS.values()), dispatch_uid='signals_dispatch')
+def signals_dispatch_handler(sender, signal, signal_obj, status=None, prev_status=None, **kwargs):
+    # One Celery task per event, it runs the handlers of all integrations
+    event = dispatcher.EVENT_NAMES[signal]
+    if dispatcher.has_handlers(event):
+        idempotency_key = get_idempotency_key(event, dict(kwargs, signal_obj=signal_obj,
+                                                          status=status, prev_status=prev_status))
+        dispatcher.dispatch.delay(event, signal_obj.pk,
+                                  status_id=status.pk if status else None,
+                                  prev_status_id=prev_status.pk if prev_status else None,
+                                  idempotency_key=idempotency_key)
 
 
-@receiver(create_child, dispatch_uid='signals_create_child')
-def signals_create_child_handler(sender, signal_obj, **kwargs):
-    tasks.translate_category(signal_obj.id)
+@receiver(post_save, sender=Status, dispatch_uid='signals_history_status')
+@receiver(post_save, sender=Priority, dispatch_uid='signals_history_priority')
+@receiver(post_save, sender=CategoryAssignment, dispatch_uid='signals_history_category_assignment')
+@receiver(post_save, sender=Note, dispatch_uid='signals_history_note')
+@receiver(post_save, sender=Location, dispatch_uid='signals_history_location')
+def signals_history_handler(sender, instance, created, **kwargs):
+    # Runs in the transaction of the write, the history entry is stored together with the change
+    if created:
+        History.objects.add_entry(instance)
+
+
+@receiver(post_save, sender=Feedback, dispatch_uid='signals_history_feedback')
+def signals_history_feedback_handler(sender, instance, **kwargs):
+    # Feedback is created when it is requested, the history entry is added on submission
+    if instance.submitted_at is not None:
+        History.objects.add_entry(instance)
+
+
+@receiver([post_save, post_delete], sender=Category, dispatch_uid='signals_category_tree_category')
+@receiver([post_save, post_delete], sender=CategoryDepartment,
+          dispatch_uid='signals_category_tree_category_department')
+@receiver([post_save, post_delete], sender=CategoryTranslation,
+          dispatch_uid='signals_category_tree_category_translation')
+@receiver([post_save, post_delete], sender=ServiceLevelObjective,
+          dispatch_uid='signals_category_tree_slo')
+@receiver([post_save, post_delete], sender=Department, dispatch_uid='signals_category_tree_department')
+@receiver(m2m_changed, sender=Category.departments.through,
+          dispatch_uid='signals_category_tree_departments')
+def signals_category_tree_handler(sender, **kwargs):
+    # Every process reloads its in memory category tree after the commit
+    category_tree.invalidate()
+
+
+@receiver(post_save, sender=Category, dispatch_uid='signals_read_model_category')
+def signals_read_model_category_handler(sender, instance, created, **kwargs):
+    # The read model copies the parent of the category and its slug, a new category has no signals
+    if not created:
+        SignalReadModel.objects.update_categories([instance.pk])
@@ -1,9 +1,10 @@
 import logging
 
+from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 
-from signals.apps.signals.models import Reporter
-from signals.apps.signals.models.category_translation import CategoryTranslation
+from signals.apps.signals.models import Attachment, OutboxEvent, Reporter
 from signals.apps.signals.models.signal import Signal
 from signals.apps.signals.workflow import (
     AFGEHANDELD,
@@ -16,25 +17,6 @@ from signals.celery import app
 log = logging.getLogger(__name__)
 
 
-@app.task
-def translate_category(signal_id):
-    signal = Signal.objects.get(pk=signal_id)
-
-    current_category = signal.category_assignment.category
-    try:
-        trans = CategoryTranslation.objects.get(old_category=current_category)
-    except CategoryTranslation.DoesNotExist:
-        return  # no need to perform a category re-assignment
-
-    data = {
-        'category': trans.new_category,
-        'text': trans.text,
-        'created_by': None,  # This wil show as "SIA systeem"
-    }
-
-    Signal.actions.update_category_assignment(data, signal)
-
-
 @app.task
 def anonymize_reporters(days=365):
     created_before = (timezone.now() - timezone.timedelta(days=days))
@@ -79,3 +61,76 @@ def anonymize_reporter(reporter_id):
             'text': text,
             'created_by': None  # This wil show as "SIA systeem"
         }, signal=reporter.signal)
+
+
+@app.task
+def copy_attachments_to_split_signal(signal_id, attachment_ids):
+    """
+    Copy the images of a parent Signal to one of its children, runs after the split is committed
+    so the parent is not locked while the attachments are copied. The copies share the stored
+    files of the parent images.
+
+    The task can run again (a retry or a redelivery): images the child already has are skipped
+    and the note is only added when images were copied.
+    """
+    try:
+        signal = Signal.objects.get(pk=signal_id)
+    except Signal.DoesNotExist:
+        log.warning(f"Signal with ID #{signal_id} does not exists")
+        return
+
+    copied = 0
+    with transaction.atomic():
+        copied_files = set(signal.attachments.values_list('file', flat=True))
+        for parent_image in Attachment.objects.filter(pk__in=attachment_ids):
+            if parent_image.file.name in copied_files:
+                continue
+
+            if parent_image.file.storage.exists(parent_image.file.name):
+                attachment = parent_image.copy_to(signal)
+                if not attachment.cropped_image:
+                    transaction.on_commit(
+                        lambda attachment_id=attachment.pk: generate_attachment_renditions.delay(
+                            attachment_id=attachment_id)
+                    )
+                copied += 1
+            else:
+                log.warning(f"Attachment with ID #{parent_image.pk} not found in storage")
+
+        if copied:
+            Signal.actions.create_note(data={
+                'text': '{} van {} afbeelding(en) van de hoofdmelding gekopieerd.'.format(
+                    copied, len(attachment_ids)
+                ),
+                'created_by': None  # This wil show as "SIA systeem"
+            }, signal=signal)
+
+    return copied
+
+
+@app.task
+def generate_attachment_renditions(attachment_id):
+    try:
+        attachment = Attachment.objects.get(pk=attachment_id)
+    except Attachment.DoesNotExist:
+        log.warning(f"Attachment with ID #{attachment_id} does not exists")
+    else:
+        attachment.generate_renditions()
+
+
+@app.task
+def relay_outbox(batch_size=100):
+    """
+    Send the DjangoSignals written to the outbox, started after every transaction that writes to
+    the outbox and periodically to pick up events of failed relays.
+    """
+    return OutboxEvent.objects.relay(batch_size=batch_size)
+
+
+@app.task
+def purge_outbox(days=None):
+    """
+    Delete the processed events from the outbox, after `SIGNAL_OUTBOX_RETENTION_DAYS`.
+    """
+    days = settings.SIGNAL_OUTBOX_RETENTION_DAYS if days is None else days
+    return OutboxEvent.objects.purge(days=days)
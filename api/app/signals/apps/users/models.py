@@ -1,10 +1,36 @@
-from django.contrib.auth.models import User
-from django.db import models
-from django.db.models.signals import post_save
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 from django.utils.translation import gettext as _
 
 from signals.apps.signals.models.mixins import CreatedUpdatedModel
+from signals.auth.backend import clear_cached_users
+
+DEPARTMENT_IDS_CACHE_KEY = 'users_profile_department_ids_{}'
+DEPARTMENT_IDS_CACHE_TIMEOUT = 60 * 60
+
+
+class ProfileManager(models.Manager):
+    def get_department_ids(self, user):
+        """
+        Return the ids of the departments of the user, kept in the cache until they are changed.
+        """
+        key = DEPARTMENT_IDS_CACHE_KEY.format(user.pk)
+        department_ids = cache.get(key)
+        if department_ids is None:
+            department_ids = list(self.model.departments.through.objects.filter(
+                profile__user_id=user.pk
+            ).values_list('department_id', flat=True))
+            cache.set(key, department_ids, DEPARTMENT_IDS_CACHE_TIMEOUT)
+        return department_ids
+
+    def clear_department_ids(self, user_ids):
+        keys = [DEPARTMENT_IDS_CACHE_KEY.format(user_id) for user_id in user_ids]
+        cache.delete_many(keys)
+        # Another process may have cached the departments before the change was committed
+        transaction.on_commit(lambda: cache.delete_many(keys))
 
 
 class Profile(CreatedUpdatedModel):
@@ -26,6 +52,8 @@ class Profile(CreatedUpdatedModel):
     # SIG-2016 Added a note field to the profile
     note = models.TextField(null=True, blank=True)
 
+    objects = ProfileManager()
+
     def __str__(self):
         return self.user.username
 
@@ -34,3 +62,64 @@ class Profile(CreatedUpdatedModel):
 def create_user_profile(sender, instance, created, **kwargs):
     if created and not hasattr(instance, 'profile'):
         Profile.objects.create(user=instance)
+
+
+@receiver(m2m_changed, sender=Profile.departments.through)
+def clear_profile_department_ids(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+
+    if not reverse:
+        user_ids = [instance.user_id]
+    elif action == 'pre_clear':
+        user_ids = Profile.objects.filter(departments=instance).values_list('user_id', flat=True)
+    else:
+        user_ids = Profile.objects.filter(pk__in=pk_set).values_list('user_id', flat=True)
+    Profile.objects.clear_department_ids(list(user_ids))
+
+
+@receiver([post_save, post_delete], sender=User, dispatch_uid='users_clear_cached_user')
+def clear_cached_user(sender, instance, **kwargs):
+    clear_cached_users([instance.username])
+
+
+@receiver(post_save, sender=Profile, dispatch_uid='users_clear_cached_profile_user')
+def clear_cached_profile_user(sender, instance, **kwargs):
+    clear_cached_users([instance.user.username])
+
+
+@receiver(m2m_changed, sender=User.groups.through, dispatch_uid='users_clear_cached_user_groups')
+@receiver(m2m_changed, sender=User.user_permissions.through,
+          dispatch_uid='users_clear_cached_user_permissions')
+def clear_cached_user_relations(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+
+    if not reverse:
+        usernames = [instance.username]
+    elif action == 'pre_clear':
+        field = 'groups' if isinstance(instance, Group) else 'user_permissions'
+        usernames = User.objects.filter(**{field: instance}).values_list('username', flat=True)
+    else:
+        usernames = User.objects.filter(pk__in=pk_set).values_list('username', flat=True)
+    clear_cached_users(usernames)
+
+
+@receiver([post_save, pre_delete], sender=Group, dispatch_uid='users_clear_cached_group')
+def clear_cached_group_users(sender, instance, **kwargs):
+    clear_cached_users(instance.user_set.values_list('username', flat=True))
+
+
+@receiver(m2m_changed, sender=Group.permissions.through,
+          dispatch_uid='users_clear_cached_group_permissions')
+def clear_cached_group_permissions_users(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+
+    if not reverse:
+        users = User.objects.filter(groups=instance)
+    elif action == 'pre_clear':
+        users = User.objects.filter(groups__permissions=instance)
+    else:
+        users = User.objects.filter(groups__in=pk_set)
+    clear_cached_users(users.values_list('username', flat=True))
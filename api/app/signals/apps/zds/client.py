@@ -1,5 +1,165 @@
+import base64
+import copy
+import json
+import threading
+import time
+from urllib.parse import urljoin, urlparse
+
+import requests
+import yaml
 from django.conf import settings
-from zds_client import Client
+from requests.adapters import HTTPAdapter
+from zds_client import Client, ClientError
+from zds_client.client import get_headers
+from zds_client.schema import get_operation_url
+
+# Multiple of 3 bytes, so every chunk is base64 encoded without padding
+BASE64_CHUNK_SIZE = 3 * 64 * 1024
+
+
+def iter_base64(file, chunk_size=BASE64_CHUNK_SIZE):
+    """
+    Base64 encode a Django `File` in chunks.
+    """
+    remainder = b''
+    for chunk in file.chunks(chunk_size):
+        # Storage backends may return shorter chunks, only whole 3 byte groups are encoded
+        chunk = remainder + chunk
+        end = len(chunk) - len(chunk) % 3
+        remainder = chunk[end:]
+        if end:
+            yield base64.b64encode(chunk[:end])
+
+    if remainder:
+        yield base64.b64encode(remainder)
+
+
+def iter_json(data, file_field, file):
+    """
+    JSON encoded `data` with the base64 encoded content of `file` as `file_field`, in chunks.
+    """
+    placeholder = '__{}__'.format(file_field)
+    prefix, suffix = json.dumps(dict(data, **{file_field: placeholder})).split(
+        json.dumps(placeholder))
+
+    yield prefix.encode() + b'"'
+    yield from iter_base64(file)
+    yield b'"' + suffix.encode()
+
+
+class RateLimiter:
+    """
+    Spaces the requests to a host at least 1 / `rate` seconds apart, for all threads of the
+    process. A `rate` of 0 disables the limit.
+    """
+
+    def __init__(self, rate=0):
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._next_request_at = {}
+
+    def wait(self, host):
+        if not self.rate:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            request_at = max(now, self._next_request_at.get(host, now))
+            self._next_request_at[host] = request_at + 1 / self.rate
+
+        if request_at > now:
+            time.sleep(request_at - now)
+
+
+class SessionClient(Client):
+    """
+    `zds_client.Client` that sends its requests with one `requests.Session`, so the connections
+    to the ZDS component are reused, and with a timeout.
+
+    `request` and `fetch_schema` follow the implementation of `zds_client.Client`, which sends
+    every request with a new connection.
+    """
+
+    def __init__(self, service, base_path='/api/v1/', timeout=None, pool_maxsize=10,
+                 rate_limiter=None):
+        super().__init__(service, base_path=base_path)
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or RateLimiter()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def request(self, path, operation, method='GET', expected_status=200, **kwargs):
+        url = urljoin(self.base_url, path)
+
+        headers = kwargs.pop('headers', {})
+        headers.setdefault('Accept', 'application/json')
+        headers.setdefault('Content-Type', 'application/json')
+        headers.update(get_headers(self.schema, operation))
+
+        if self.auth:
+            headers.update(self.auth.credentials())
+
+        kwargs['headers'] = headers
+        kwargs.setdefault('timeout', self.timeout)
+
+        self.rate_limiter.wait(urlparse(url).netloc)
+        response = self.session.request(method, url, **kwargs)
+
+        try:
+            response_json = response.json()
+        except Exception:
+            response_json = None
+
+        # Streamed request bodies are not logged
+        log_data = kwargs.get('data', kwargs.get('json', None))
+        self._log.add(
+            self.service,
+            url,
+            method,
+            headers,
+            copy.deepcopy(log_data) if isinstance(log_data, (dict, list)) else None,
+            response.status_code,
+            dict(response.headers),
+            response_json,
+            params=kwargs.get('params'),
+        )
+
+        try:
+            response.raise_for_status()
+        except requests.HTTPError as exc:
+            if response.status_code >= 500:
+                raise
+            raise ClientError(response_json) from exc
+
+        assert response.status_code == expected_status, response_json
+        return response_json
+
+    def create_with_file(self, resource, data, file_field, file, **path_kwargs):
+        """
+        Like `create`, with the base64 encoded content of `file` in `file_field`. The request body
+        is streamed, the file is never completely in memory.
+        """
+        operation_id = '{resource}_create'.format(resource=resource)
+        url = get_operation_url(self.schema, operation_id, **path_kwargs)
+        return self.request(url, operation_id, method='POST', data=iter_json(data, file_field, file),
+                            expected_status=201)
+
+    def fetch_schema(self):
+        url = urljoin(self.base_url, 'schema/openapi.yaml')
+        self.rate_limiter.wait(urlparse(url).netloc)
+        response = self.session.get(url, params={'v': '3'}, timeout=self.timeout)
+        response.raise_for_status()
+
+        spec = yaml.safe_load(response.content)
+        spec_version = response.headers.get('X-OAS-Version',
+                                            spec.get('openapi', spec.get('swagger', '')))
+        if not spec_version.startswith('3.0'):
+            raise ValueError("Unsupported spec version: {}".format(spec_version))
+
+        self._schema = spec
 
 
 class ZDSClient:
@@ -27,11 +187,27 @@ class ZDSClient:
 
         Client.load_config(**config)
 
+        # One long-lived client per component, the OpenAPI schema is only fetched once
+        self._clients = {}
+        self.rate_limiter = RateLimiter(settings.ZDS_RATE_LIMIT)
+
     def get_client(self, client_type):
-        base_path = settings.ZDS_BASE_PATH
-        base_path = base_path.format(client_type)
+        if client_type not in self._clients:
+            base_path = settings.ZDS_BASE_PATH
+            base_path = base_path.format(client_type)
+
+            self._clients[client_type] = SessionClient(client_type,
+                                                       base_path=base_path,
+                                                       timeout=settings.ZDS_TIMEOUT,
+                                                       pool_maxsize=settings.ZDS_POOL_MAXSIZE,
+                                                       rate_limiter=self.rate_limiter)
+        return self._clients[client_type]
 
-        return Client(client_type, base_path=base_path)
+    def reset(self):
+        """
+        Drop the clients, the next requests use new connections and fetch the schemas again.
+        """
+        self._clients = {}
 
     @property
     def ztc(self):
@@ -1,4 +1,8 @@
+from datetime import timedelta
+
 from django.db import models, transaction
+from django.db.models import Q
+from django.utils import timezone
 
 
 class CaseSignalManager(models.Manager):
@@ -27,14 +31,14 @@ class CaseSignalManager(models.Manager):
 
         return case_status
 
-    def add_document(self, case_signal):
+    def add_document(self, case_signal, attachment=None):
         """
         Adds a link between the case and the document. Zo that it is also known in the signals app.
         """
         from .models import CaseDocument
 
         with transaction.atomic():
-            case_document = CaseDocument(case_signal=case_signal)
+            case_document = CaseDocument(case_signal=case_signal, attachment=attachment)
             case_document.save()
 
         return case_document
@@ -59,3 +63,165 @@ class CaseSignalManager(models.Manager):
             obj.save()
 
         return obj
+
+    def create_case_signals(self, signal_ids):
+        """
+        Create the cases of multiple signals in one query, they are synced by the next
+        `sync_pending_cases` run.
+        """
+        from .models import CaseSignal
+
+        return CaseSignal.objects.bulk_create([CaseSignal(signal_id=signal_id)
+                                               for signal_id in signal_ids])
+
+    def create_missing_case_signals(self, created_before, batch_size=1000, full=False):
+        """
+        Create the cases of signals that have none, continuing after the `case_signals`
+        checkpoint (the highest signal id that was checked). The checkpoint is stored after every
+        batch, so an interrupted run continues where it stopped.
+
+        :param created_before: only signals created before this moment are checked
+        :param full: check all signals, starting from the first
+        :returns: number of cases created
+        """
+        from signals.apps.signals.models import Signal
+        from .models import CaseSignal, SyncCheckpoint
+
+        checkpoint, _ = SyncCheckpoint.objects.get_or_create(name='case_signals')
+        if full:
+            checkpoint.value = 0
+
+        created = 0
+        while True:
+            signals = list(Signal.objects.filter(id__gt=checkpoint.value).order_by('id')
+                           .values_list('id', 'created_at')[:batch_size])
+            # Stop at the first signal that is too new, it is checked in a next run
+            signal_ids = []
+            for signal_id, created_at in signals:
+                if created_at > created_before:
+                    break
+                signal_ids.append(signal_id)
+
+            if not signal_ids:
+                checkpoint.save()
+                return created
+
+            with transaction.atomic():
+                with_case = set(CaseSignal.objects.filter(signal_id__in=signal_ids)
+                                .values_list('signal_id', flat=True))
+                created += len(self.create_case_signals(
+                    [signal_id for signal_id in signal_ids if signal_id not in with_case]))
+
+                checkpoint.value = signal_ids[-1]
+                checkpoint.save()
+
+            if len(signal_ids) < batch_size:
+                return created
+
+    def request_sync(self, signal):
+        """
+        Make sure the case of the signal is synced, a completed case has new statuses or documents
+        to add and a failed case starts over.
+        """
+        from .models import CaseSignal
+
+        with transaction.atomic():
+            case_signal, created = CaseSignal.objects.select_for_update().get_or_create(
+                signal=signal)
+            if not created:
+                if case_signal.sync_state == CaseSignal.SYNC_COMPLETED:
+                    case_signal.sync_state = CaseSignal.SYNC_CONNECTED
+                elif case_signal.sync_state == CaseSignal.SYNC_FAILED:
+                    case_signal.sync_state = CaseSignal.SYNC_NEW
+                case_signal.sync_attempts = 0
+                case_signal.next_sync_at = None
+                case_signal.save()
+
+        return case_signal
+
+    def claim_sync(self, case_signal_id, lease):
+        """
+        Claim the pending case for a sync of at most `lease` seconds, other workers skip it until
+        the sync is done or the lease expired. Returns None when the case has no pending work or
+        is claimed by another worker.
+        """
+        with transaction.atomic():
+            now = timezone.now()
+            case_signal = self.pending().select_for_update(skip_locked=True, of=('self', )) \
+                .select_related('signal').filter(pk=case_signal_id).first()
+            if case_signal is None:
+                return None
+
+            case_signal.sync_locked_until = now + timedelta(seconds=lease)
+            case_signal.save()
+
+        return case_signal
+
+    def complete_sync(self, case_signal):
+        """
+        Mark the synced case completed, unless a status or image was added during the sync.
+        """
+        from .models import CaseSignal
+
+        with transaction.atomic():
+            # Locked like `request_sync`, a status added after this check moves the case back
+            case_signal.sync_state = CaseSignal.objects.select_for_update().values_list(
+                'sync_state', flat=True).get(pk=case_signal.pk)
+
+            signal = case_signal.signal
+            has_new_work = (
+                signal.statuses.exclude(case_status__zrc_link__isnull=False).exists() or
+                signal.attachments.filter(is_image=True).exclude(
+                    case_documents__connected_in_external_system=True).exists()
+            )
+            if case_signal.sync_state == CaseSignal.SYNC_CONNECTED and not has_new_work:
+                case_signal.sync_state = CaseSignal.SYNC_COMPLETED
+            case_signal.sync_attempts = 0
+            case_signal.next_sync_at = None
+            case_signal.sync_locked_until = None
+            case_signal.save()
+
+        return case_signal
+
+    def set_sync_state(self, case_signal, sync_state):
+        with transaction.atomic():
+            case_signal.sync_state = sync_state
+            case_signal.sync_attempts = 0
+            case_signal.next_sync_at = None
+            case_signal.save()
+
+        return case_signal
+
+    def sync_failed(self, case_signal, max_attempts, backoff):
+        """
+        Schedule the next attempt with an exponential backoff, or give up after `max_attempts`.
+
+        :param backoff: seconds to wait after the first failed attempt
+        """
+        from .models import CaseSignal
+
+        with transaction.atomic():
+            case_signal.sync_attempts += 1
+            if case_signal.sync_attempts >= max_attempts:
+                case_signal.sync_state = CaseSignal.SYNC_FAILED
+                case_signal.next_sync_at = None
+            else:
+                case_signal.next_sync_at = timezone.now() + timedelta(
+                    seconds=backoff * 2 ** (case_signal.sync_attempts - 1))
+            case_signal.sync_locked_until = None
+            case_signal.save()
+
+        return case_signal
+
+    def pending(self):
+        """
+        Cases with work left that are not waiting for a retry and not being synced.
+        """
+        from .models import CaseSignal
+
+        now = timezone.now()
+        return self.get_queryset().filter(
+            Q(next_sync_at__isnull=True) | Q(next_sync_at__lte=now),
+            Q(sync_locked_until__isnull=True) | Q(sync_locked_until__lte=now),
+            sync_state__in=CaseSignal.SYNC_PENDING_STATES,
+        ).order_by('id')
@@ -0,0 +1,50 @@
+# Generated by Django 2.2.9 on 2020-02-12 14:03
+
+from django.db import migrations, models
+
+
+def _set_sync_state(apps, schema_editor):
+    """
+    Cases that were completed by the sync_zds command are completed, all other cases are synced
+    again from the start (the sync skips the parts that are already known in the ZDS).
+    """
+    CaseSignal = apps.get_model('zds', 'CaseSignal')
+    CaseSignal.objects.filter(sync_completed=True).update(sync_state='completed')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zds', '0006_auto_20181213_1740'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='casesignal',
+            name='sync_state',
+            field=models.CharField(choices=[('new', 'New'), ('case_created', 'Case created'),
+                                            ('connected', 'Connected'),
+                                            ('completed', 'Completed'), ('failed', 'Failed')],
+                                   default='new', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='casesignal',
+            name='sync_attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='casesignal',
+            name='next_sync_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='casesignal',
+            index=models.Index(fields=['sync_state', 'next_sync_at'],
+                               name='zds_casesig_sync_st_f1b513_idx'),
+        ),
+        migrations.RunPython(_set_sync_state, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='casesignal',
+            name='sync_completed',
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 2.2.9 on 2020-02-14 11:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zds', '0007_casesignal_sync_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncCheckpoint',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False,
+                                        verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='casesignal',
+            name='zds_casesig_sync_st_f1b513_idx',
+        ),
+        migrations.AddIndex(
+            model_name='casesignal',
+            index=models.Index(condition=models.Q(sync_state__in=('new', 'case_created',
+                                                                  'connected')),
+                               fields=['next_sync_at', 'id'], name='zds_casesignal_pending_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 2.2.9 on 2020-02-17 09:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def _set_attachment(apps, schema_editor):
+    """
+    Existing documents were created from the first image of the signal.
+    """
+    Attachment = apps.get_model('signals', 'Attachment')
+    CaseDocument = apps.get_model('zds', 'CaseDocument')
+
+    for case_document in CaseDocument.objects.select_related('case_signal'):
+        case_document.attachment = Attachment.objects.filter(
+            _signal_id=case_document.case_signal.signal_id,
+            is_image=True,
+        ).order_by('created_at').first()
+        case_document.save()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signals', '0099_outboxevent'),
+        ('zds', '0008_pending_index_synccheckpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='casedocument',
+            name='attachment',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE,
+                                    related_name='case_documents', to='signals.Attachment'),
+        ),
+        migrations.RunPython(_set_attachment, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.9 on 2020-02-18 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zds', '0009_casedocument_attachment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='casesignal',
+            name='sync_locked_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
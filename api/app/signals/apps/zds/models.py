@@ -7,11 +7,33 @@ from .managers import CaseSignalManager
 
 
 class CaseSignal(CreatedUpdatedModel):
+    # Sync states, a case moves through these states in order. New statuses and images move a
+    # completed case back to connected, the steps skip work that is already done in the ZDS.
+    SYNC_NEW = 'new'  # The case has to be created in the ZRC
+    SYNC_CASE_CREATED = 'case_created'  # The signal has to be connected to the case
+    SYNC_CONNECTED = 'connected'  # The statuses and documents have to be added to the case
+    SYNC_COMPLETED = 'completed'
+    SYNC_FAILED = 'failed'  # Gave up after too many failed attempts
+    SYNC_STATES = (
+        (SYNC_NEW, 'New'),
+        (SYNC_CASE_CREATED, 'Case created'),
+        (SYNC_CONNECTED, 'Connected'),
+        (SYNC_COMPLETED, 'Completed'),
+        (SYNC_FAILED, 'Failed'),
+    )
+    SYNC_PENDING_STATES = (SYNC_NEW, SYNC_CASE_CREATED, SYNC_CONNECTED)
+
     signal = models.OneToOneField(
         'signals.Signal', related_name='case', on_delete=models.CASCADE)
     zrc_link = models.URLField(null=True, blank=True)
     connected_in_external_system = models.BooleanField(default=False, blank=True)
-    sync_completed = models.BooleanField(default=False, blank=True)
+
+    sync_state = models.CharField(max_length=20, choices=SYNC_STATES, default=SYNC_NEW)
+    sync_attempts = models.PositiveIntegerField(default=0)
+    # Failed syncs are retried after this moment (backoff)
+    next_sync_at = models.DateTimeField(null=True, blank=True)
+    # The case is being synced by a worker until this moment (lease)
+    sync_locked_until = models.DateTimeField(null=True, blank=True)
 
     objects = models.Manager()
     actions = CaseSignalManager()
@@ -23,6 +45,11 @@ class CaseSignal(CreatedUpdatedModel):
 
     class Meta:
         ordering = ('created_at', )
+        indexes = [
+            # Only the cases with pending work (SYNC_PENDING_STATES), most cases are completed
+            models.Index(fields=['next_sync_at', 'id'], name='zds_casesignal_pending_idx',
+                         condition=models.Q(sync_state__in=('new', 'case_created', 'connected'))),
+        ]
 
     def __str__(self):
         return self.zrc_link
@@ -82,6 +109,8 @@ class CaseStatus(CreatedUpdatedModel):
 class CaseDocument(CreatedUpdatedModel):
     case_signal = models.ForeignKey(
         'zds.CaseSignal', related_name='documents', on_delete=models.CASCADE)
+    attachment = models.ForeignKey(
+        'signals.Attachment', related_name='case_documents', on_delete=models.CASCADE, null=True)
     drc_link = models.URLField(null=True, blank=True)
     connected_in_external_system = models.BooleanField(default=False, blank=True)
 
@@ -90,3 +119,15 @@ class CaseDocument(CreatedUpdatedModel):
 
     def __str__(self):
         return self.drc_link
+
+
+class SyncCheckpoint(models.Model):
+    """
+    Progress of a `sync_zds` step, an interrupted run continues after the stored value.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return '{}: {}'.format(self.name, self.value)
@@ -1,8 +1,10 @@
-import base64
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import connection
 from django.urls import reverse
 from django.utils import timezone
 from requests.exceptions import ConnectionError, InvalidURL
@@ -16,11 +18,20 @@ from signals.apps.zds.exceptions import (
     DocumentNotCreatedException,
     StatusNotCreatedException
 )
+from signals.celery import app
 
 from .models import CaseSignal
 
 logger = logging.getLogger(__name__)
 
+# A failed sync is retried after 1, 2, 4 and 8 minutes, the case is marked failed after 5 attempts
+SYNC_MAX_ATTEMPTS = 5
+SYNC_BACKOFF = 60
+# A worker claims a case for at most 10 minutes, after that another worker can sync it again
+SYNC_LEASE = 10 * 60
+
+STATUS_TYPES_CACHE_KEY = 'zds_ztc_status_types'
+
 
 def get_all_statusses():
     """
@@ -37,16 +48,34 @@ def get_all_statusses():
     return response
 
 
+def get_status_types(refresh=False):
+    """
+    All statustypes that exist in the ZTC by omschrijving, cached for
+    `ZTC_STATUSTYPES_CACHE_TIMEOUT` seconds in the (shared) Django cache.
+
+    :param refresh: fetch the statustypes from the ZTC, also when they are cached
+    :return: dict
+    """
+    status_types = None if refresh else cache.get(STATUS_TYPES_CACHE_KEY)
+    if status_types is None:
+        status_types = {status.get('omschrijving', ''): status for status in get_all_statusses()}
+        cache.set(STATUS_TYPES_CACHE_KEY, status_types, settings.ZTC_STATUSTYPES_CACHE_TIMEOUT)
+    return status_types
+
+
+def refresh_status_types():
+    """
+    Fetch the statustypes from the ZTC again, use this when the catalogue is changed.
+    """
+    return get_status_types(refresh=True)
+
+
 def get_status(status_name):
     """
-    This will now be a local filter. This should ideally be done via the api.
+    Filtering on omschrijving is not supported by the api, the statustypes are indexed locally.
     Issue: https://github.com/VNG-Realisatie/gemma-zaken/issues/642
     """
-    statusses = get_all_statusses()
-    for status in statusses:
-        if status.get('omschrijving', '') == status_name:
-            return status
-    return {}
+    return get_status_types().get(status_name, {})
 
 
 def create_case(signal):
@@ -147,36 +176,40 @@ def add_status_to_case(signal, status):
         raise StatusNotCreatedException()
 
 
-def create_document(signal):
-    """
-    This will create a document in the DRC. This will be base of the photo upload.
+def create_document(signal, attachment=None):
     """
-    if (
-        signal.case.documents.count() == 1 and
-        signal.case.documents.order_by('created_at').first().drc_link is not None
-    ):
-        return signal.case.documents.first()
+    This will create a document in the DRC for an image of the signal (default: the first image).
 
-    case_document = CaseSignal.actions.add_document(signal.case)
-
-    with open(signal.image.path, 'br') as tmp_file:
-        image_data = tmp_file.read()
+    The image is read from the storage in chunks and streamed to the DRC.
+    """
+    case_signal = signal.case
+    if attachment is None:
+        attachment = signal.attachments.filter(is_image=True).first()
+
+    case_document = case_signal.documents.filter(attachment=attachment).first()
+    if case_document is None:
+        case_document = CaseSignal.actions.add_document(case_signal, attachment)
+    elif case_document.drc_link is not None:
+        return case_document
 
     data = {
         'bronorganisatie': settings.RSIN_NUMBER,
         'creatiedatum': timezone.now().strftime('%Y-%m-%d'),
-        'titel': signal.image.name,
+        'titel': attachment.file.name,
         'auteur': 'SIA Amsterdam',
         'taal': 'dut',
         'informatieobjecttype': settings.ZTC_INFORMATIEOBJECTTYPE_URL,
-        'inhoud': base64.b64encode(image_data),
     }
 
     try:
-        response = zds_client.drc.create(resource="enkelvoudiginformatieobject", data=data)
+        with attachment.file.open('rb') as image:
+            response = zds_client.drc.create_with_file(resource='enkelvoudiginformatieobject',
+                                                       data=data, file_field='inhoud',
+                                                       file=image)
         CaseSignal.actions.add_drc_link(response.get('url'), case_document)
         return case_document
-    except (ClientError, ConnectionError, InvalidURL) as error:
+    except (ClientError, OSError) as error:
+        # OSError includes the requests ConnectionError and errors reading the storage
         logger.exception(error)
         raise DocumentNotCreatedException()
 
@@ -189,7 +222,7 @@ def add_document_to_case(signal, case_document):
         return case_document
 
     data = {
-        'informatieobject': signal.case.document_url,
+        'informatieobject': case_document.drc_link,
         'object': signal.case.zrc_link,
         'objectType': 'zaak',
         'registratiedatum': timezone.now().isoformat(),
@@ -256,3 +289,120 @@ def get_information_object(url):
     :return: dict
     """
     return zds_client.drc.retrieve(resource='enkelvoudiginformatieobject', url=url)
+
+
+def sync_case_signal(case_signal):
+    """
+    Push the pending work of the case to the ZDS components, moving it through the sync states.
+
+    Every step stores its result in its own transaction, so the steps already done are kept when
+    a later step fails. Raises the exception of the step that failed.
+    """
+    signal = case_signal.signal
+
+    if case_signal.sync_state == CaseSignal.SYNC_NEW:
+        create_case(signal)
+        CaseSignal.actions.set_sync_state(case_signal, CaseSignal.SYNC_CASE_CREATED)
+
+    if case_signal.sync_state == CaseSignal.SYNC_CASE_CREATED:
+        connect_signal_to_case(signal)
+        CaseSignal.actions.set_sync_state(case_signal, CaseSignal.SYNC_CONNECTED)
+
+    if case_signal.sync_state == CaseSignal.SYNC_CONNECTED:
+        statuses = signal.statuses.exclude(case_status__zrc_link__isnull=False)
+        for status in statuses.order_by('created_at'):
+            add_status_to_case(signal, status)
+
+        for attachment in signal.attachments.filter(is_image=True):
+            case_document = create_document(signal, attachment)
+            add_document_to_case(signal, case_document)
+
+        CaseSignal.actions.complete_sync(case_signal)
+
+    return case_signal
+
+
+def _sync(case_signal):
+    try:
+        sync_case_signal(case_signal)
+    except Exception as error:
+        # The ZDS steps already log their errors, an unexpected error must not stop the batch
+        logger.exception(error)
+        CaseSignal.actions.sync_failed(case_signal, SYNC_MAX_ATTEMPTS, SYNC_BACKOFF)
+        return error
+
+
+def _sync_case(case_signal_id):
+    # The case is claimed in a short transaction, the requests to the ZDS are done without holding
+    # a lock. A case created in the ZRC is stored before the next step, a failing step does not
+    # roll it back and the next attempt does not create the case again.
+    case_signal = CaseSignal.actions.claim_sync(case_signal_id, SYNC_LEASE)
+    if case_signal is None:
+        return None, None
+
+    return case_signal, _sync(case_signal)
+
+
+@app.task
+def sync_case(case_signal_id):
+    """
+    Sync one case, queued when a signal is created or gets a new status or image. A failed sync is
+    queued again for the moment its backoff has passed.
+
+    :returns: the error if the sync failed
+    """
+    case_signal, error = _sync_case(case_signal_id)
+    if error is None:
+        return None
+
+    if case_signal.next_sync_at is not None:
+        sync_case.apply_async((case_signal_id, ), eta=case_signal.next_sync_at)
+    return repr(error)
+
+
+def _sync_pending_case(case_signal_id):
+    # The failed cases are retried by a next run, they are not queued again
+    _, error = _sync_case(case_signal_id)
+    return repr(error) if error is not None else None
+
+
+def _sync_pending_case_in_thread(case_signal_id):
+    try:
+        return _sync_pending_case(case_signal_id)
+    finally:
+        # Every thread has its own database connection
+        connection.close()
+
+
+@app.task
+def sync_pending_cases(batch_size=100, workers=1):
+    """
+    Sync all cases with pending work whose retry backoff has passed, in batches of case ids.
+
+    Every case is synced and stored in its own transaction, an interrupted run keeps the progress
+    of the cases it synced. With more than one worker the cases are synced by a thread pool, the
+    number of requests per ZDS host is limited by `ZDS_RATE_LIMIT`.
+
+    :returns: list of errors of the cases that failed
+    """
+    errors = []
+    executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    try:
+        last_id = 0
+        while True:
+            case_signal_ids = list(CaseSignal.actions.pending().filter(id__gt=last_id)
+                                   .values_list('id', flat=True)[:batch_size])
+            if not case_signal_ids:
+                return errors
+
+            if executor:
+                results = executor.map(_sync_pending_case_in_thread, case_signal_ids)
+            else:
+                results = map(_sync_pending_case, case_signal_ids)
+            errors.extend(error for error in results if error is not None)
+
+            last_id = case_signal_ids[-1]
+    finally:
+        if executor:
+            executor.shutdown()
@@ -1,10 +1,38 @@
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.cache import cache
+from django.db import transaction
 from rest_framework import exceptions
 
 USER_NOT_AUTHORIZED = "User {} is not authorized"
 USER_DOES_NOT_EXIST = -1
+USER_CACHE_TIMEOUT = 5 * 60
+
+
+def get_user(user_email):
+    """
+    Load the user with everything needed for the permission checks of a request.
+
+    The permissions are resolved and kept on the user (Django's `ModelBackend` stores them in
+    `_perm_cache`), so they are cached together with the user. The department ids of the user are
+    put in the cache as well.
+    """
+    from signals.apps.users.models import Profile
+
+    user = User.objects.select_related('profile').get(username=user_email)
+    user.get_all_permissions()
+    Profile.objects.get_department_ids(user)
+    return user
+
+
+def clear_cached_users(usernames):
+    """
+    Remove the users from the cache, they are loaded again on their next request.
+    """
+    keys = [username.lower() for username in usernames]
+    cache.delete_many(keys)
+    # Another process may have cached the user before the change was committed
+    transaction.on_commit(lambda: cache.delete_many(keys))
 
 
 class JWTAuthBackend:
@@ -32,15 +60,16 @@ class JWTAuthBackend:
         if user == USER_DOES_NOT_EXIST:
             raise exceptions.AuthenticationFailed(USER_NOT_AUTHORIZED.format(user_email))
 
-        # We hit the database max once per 5 minutes, and then cache the results.
+        # We hit the database max once per 5 minutes, and then cache the results. The cached user
+        # is removed when the user, its groups or its profile change.
         if user is None:  # i.e. cache miss
             try:
-                user = User.objects.get(username=user_email)
+                user = get_user(user_email)
             except User.DoesNotExist:
-                cache.set(user_email, USER_DOES_NOT_EXIST, 5 * 60)
+                cache.set(user_email, USER_DOES_NOT_EXIST, USER_CACHE_TIMEOUT)
                 raise exceptions.AuthenticationFailed(USER_NOT_AUTHORIZED.format(user_email))
             else:
-                cache.set(user_email, user, 5 * 60)
+                cache.set(user_email, user, USER_CACHE_TIMEOUT)
 
         # We return only when we have correct scope, and user is known to `signals`.
         return user, scope
@@ -264,6 +264,14 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'signals.apps.sigmax.tasks.fail_stuck_sending_signals',
         'schedule': crontab(minute='*/15'),
     },
+    'relay-signal-outbox': {
+        'task': 'signals.apps.signals.tasks.relay_outbox',
+        'schedule': crontab(minute='*'),
+    },
+    'purge-signal-outbox': {  # Run task every day at 03:00
+        'task': 'signals.apps.signals.tasks.purge_outbox',
+        'schedule': crontab(minute='0', hour='3'),
+    },
 }
 
 # E-mail settings for SMTP (SendGrid)
@@ -296,9 +304,16 @@ EMAIL_INTEGRATIONS = dict(
 NOREPLY = 'noreply@meldingen.amsterdam.nl'
 
 # Django cache settings
+# The cache must be shared by all processes, the cached users, category tree version and signal
+# details are invalidated through it. MEMCACHED_LOCATION is a comma separated host:port list. Only
+# the tests use a local cache.
+MEMCACHED_LOCATION = os.getenv('MEMCACHED_LOCATION',
+                               'memcached:11211' if in_docker() else 'localhost:11211')
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+        'LOCATION': MEMCACHED_LOCATION.split(','),
+        'KEY_PREFIX': 'signals',
     }
 }
 
@@ -494,6 +509,22 @@ SIGMAX_SEND_FAIL_TIMEOUT_MINUTES = os.getenv('SIGMAX_SEND_FAIL_TIMEOUT_MINUTES',
 SIGNAL_MIN_NUMBER_OF_CHILDREN = 2
 SIGNAL_MAX_NUMBER_OF_CHILDREN = 3
 
+# Maximum number of signals created with one request to the private bulk create endpoint
+SIGNAL_BULK_CREATE_MAX_ITEMS = int(os.getenv('SIGNAL_BULK_CREATE_MAX_ITEMS', 1000))
+
+# Maximum number of (newest) notes per signal in the private signal list, see `notes_count`
+SIGNAL_LIST_MAX_NOTES = int(os.getenv('SIGNAL_LIST_MAX_NOTES', 10))
+
+# Seconds the serialized detail of a signal is kept in the Django cache (which evicts the least
+# recently used entries when it is full), see `signals.apps.signals.detail_cache`
+SIGNAL_DETAIL_CACHE_TIMEOUT = int(os.getenv('SIGNAL_DETAIL_CACHE_TIMEOUT', 3600))
+
+# Number of rows fetched at a time from the server-side cursor of the private signal export
+SIGNAL_EXPORT_CHUNK_SIZE = int(os.getenv('SIGNAL_EXPORT_CHUNK_SIZE', 2000))
+
+# Days processed events are kept in the signal outbox, see the `purge_outbox` task
+SIGNAL_OUTBOX_RETENTION_DAYS = int(os.getenv('SIGNAL_OUTBOX_RETENTION_DAYS', 7))
+
 # SIG-1017
 FEEDBACK_ENV_FE_MAPPING = {
     'LOCAL': 'http://dummy_link',
@@ -517,6 +548,8 @@ FEATURE_FLAGS = {
     'API_FILTER_EXTRA_PROPERTIES': True,
     'API_SEARCH_ENABLED': True,
     'SEARCH_BUILD_INDEX': True,
+    # Enable after filling the read model with `manage.py rebuild_signal_read_model`
+    'API_USE_SIGNAL_READ_MODEL': False,
 
     # Permission feature flags
     'PERMISSION_SIAPERMISSIONS': True,
@@ -525,6 +558,7 @@ FEATURE_FLAGS = {
     'PERMISSION_SIGNALCREATENOTEPERMISSION': True,
     'PERMISSION_SIGNALCHANGESTATUSPERMISSION': True,
     'PERMISSION_SIGNALCHANGECATEGORYPERMISSION': True,
+    'PERMISSION_SIGNALEXPORTPERMISSION': True,
 
     # Departments permission
     'PERMISSION_DEPARTMENTS': False,
@@ -7,6 +7,11 @@ CELERY_TASK_ALWAYS_EAGER = True
 EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
 TEST_LOGIN = 'signals.admin@example.com'
 SITE_DOMAIN = 'localhost:8000'
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
 INSTALLED_APPS += [  # noqa
     'signals.apps.zds',
 ]
@@ -40,6 +45,7 @@ FEATURE_FLAGS = {
     'PERMISSION_SIGNALCREATENOTEPERMISSION': False,
     'PERMISSION_SIGNALCHANGESTATUSPERMISSION': False,
     'PERMISSION_SIGNALCHANGECATEGORYPERMISSION': False,
+    'PERMISSION_SIGNALEXPORTPERMISSION': True,
 
     # Departments permission
     'PERMISSION_DEPARTMENTS': False,
@@ -6,6 +6,10 @@ import os
 ZDS_BASE_PATH = '/api/v1/'
 RSIN_NUMBER = '002564440'
 HOST_URL = os.getenv('HOST_URL')
+ZDS_TIMEOUT = int(os.getenv('ZDS_TIMEOUT', 10))  # seconds, per request to a ZDS component
+ZDS_POOL_MAXSIZE = int(os.getenv('ZDS_POOL_MAXSIZE', 10))  # connections kept per ZDS component
+# Requests per second per host, 0 is unlimited
+ZDS_RATE_LIMIT = float(os.getenv('ZDS_RATE_LIMIT', 0))
 
 # ZTC settings
 ZTC_HOST = os.getenv('ZTC_HOST')
@@ -22,6 +26,7 @@ ZTC_CATALOGUS_ID = os.getenv('ZTC_CATALOGUS_ID')
 ZTC_ZAAKTYPE_ID = os.getenv('ZTC_ZAAKTYPE_ID')
 ZTC_INFORMATIEOBJECTTYPE_ID = os.getenv('ZTC_INFORMATIEOBJECTTYPE_ID')
 ZTC_APPENDED_PATH = ''
+ZTC_STATUSTYPES_CACHE_TIMEOUT = int(os.getenv('ZTC_STATUSTYPES_CACHE_TIMEOUT', 60 * 60))
 
 ZTC_URL = "{}://{}{}".format(ZTC_SCHEME, ZTC_HOST, ZTC_APPENDED_PATH)
 ZTC_CATALOGUS_URL = '{ztc_url}/api/v1/catalogussen/{catalogus_id}'.format(
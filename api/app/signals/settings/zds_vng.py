@@ -18,6 +18,9 @@ and add 'from .zds_vng import *'. Never place this in any other settings file.
 ZDS_BASE_PATH = '/{}/api/v1/'
 RSIN_NUMBER = '002564440'
 HOST_URL = 'https://example.com'
+ZDS_TIMEOUT = 10
+ZDS_POOL_MAXSIZE = 10
+ZDS_RATE_LIMIT = 0
 
 
 # ZTC settings
@@ -35,6 +38,7 @@ ZTC_CATALOGUS_ID = '8ffb11f0-c7cc-4e35-8a64-a0639aeb8f18'
 ZTC_ZAAKTYPE_ID = 'c2f952ca-298e-488c-b1be-a87f11bd5fa2'
 ZTC_INFORMATIEOBJECTTYPE_ID = '5ab00303-1b58-4668-b054-595c0635596c'
 ZTC_APPENDED_PATH = '/ztc'
+ZTC_STATUSTYPES_CACHE_TIMEOUT = 60 * 60
 
 ZTC_URL = "{}://{}{}".format(ZTC_SCHEME, ZTC_HOST, ZTC_APPENDED_PATH)
 
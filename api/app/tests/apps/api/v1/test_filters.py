@@ -1,11 +1,12 @@
 from datetime import datetime, timedelta
 from random import shuffle
 
+from django.test import override_settings
 from django.utils import timezone
 from freezegun import freeze_time
 
-from signals.apps.signals.models import Signal
-from signals.apps.signals.workflow import BEHANDELING, GEMELD, ON_HOLD
+from signals.apps.signals.models import STADSDEEL_CENTRUM, STADSDEEL_NOORD, Signal, SignalReadModel
+from signals.apps.signals.workflow import AFWACHTING, BEHANDELING, GEMELD, ON_HOLD
 from tests.apps.feedback.factories import FeedbackFactory
 from tests.apps.signals.factories import (
     CategoryAssignmentFactory,
@@ -457,3 +458,63 @@ class TestAnonymousFilter(SignalsBaseApiTestCase):
             len(set(self._request_filter_signals({'is_anonymous': 'GARBAGE'}))),
             4
         )
+
+
+@override_settings(FEATURE_FLAGS=dict(
+    API_VALIDATE_EXTRA_PROPERTIES=True,
+    PERMISSION_SIAPERMISSIONS=True,
+    API_USE_SIGNAL_READ_MODEL=True,
+))
+class TestSignalReadModelFilters(SignalsBaseApiTestCase):
+    """ Tests filtering and ordering on the private v1 list endpoint using the SignalReadModel """
+    LIST_ENDPOINT = '/signals/v1/private/signals/'
+
+    def setUp(self):
+        self.signal_centrum = SignalFactory.create(location__stadsdeel=STADSDEEL_CENTRUM,
+                                                   status__state=GEMELD)
+        self.signal_noord = SignalFactory.create(location__stadsdeel=STADSDEEL_NOORD,
+                                                 status__state=BEHANDELING)
+        self.signal_anonymous = SignalFactory.create(location__stadsdeel=STADSDEEL_NOORD,
+                                                     status__state=BEHANDELING,
+                                                     reporter__phone='', reporter__email='')
+
+        # The factories do not use the SignalManager actions, fill the read model explicitly
+        SignalReadModel.objects.rebuild()
+
+        self.client.force_authenticate(user=self.superuser)
+
+    def _request_filter_signals(self, filter_params: dict):
+        """ Does a filter request and returns the signal ID's present in the request """
+        resp = self.client.get(self.LIST_ENDPOINT, data=filter_params)
+        self.assertEqual(200, resp.status_code)
+
+        return [res['id'] for res in resp.json()['results']]
+
+    def test_filter_status(self):
+        ids = self._request_filter_signals({'status': BEHANDELING})
+        self.assertEqual(set(ids), {self.signal_noord.id, self.signal_anonymous.id})
+
+    def test_filter_stadsdeel(self):
+        ids = self._request_filter_signals({'stadsdeel': STADSDEEL_CENTRUM})
+        self.assertEqual(ids, [self.signal_centrum.id])
+
+    def test_filter_is_anonymous(self):
+        ids = self._request_filter_signals({'is_anonymous': 'true'})
+        self.assertEqual(ids, [self.signal_anonymous.id])
+
+    def test_filter_category_slug(self):
+        category = self.signal_centrum.category_assignment.category
+
+        ids = self._request_filter_signals({'category_slug': category.slug})
+        self.assertEqual(ids, [self.signal_centrum.id])
+
+    def test_ordering_stadsdeel(self):
+        ids = self._request_filter_signals({'ordering': '-stadsdeel'})
+        self.assertEqual(ids[-1], self.signal_centrum.id)
+
+    def test_read_model_follows_status_update(self):
+        Signal.actions.update_status({'state': AFWACHTING, 'text': 'Even geduld'},
+                                     self.signal_centrum)
+
+        ids = self._request_filter_signals({'status': AFWACHTING})
+        self.assertEqual(ids, [self.signal_centrum.id])
@@ -94,6 +94,46 @@ class TestHistoryAction(SIAReadWriteUserMixin, SignalsBaseApiTestCase):
         self.assertEqual(new_entry['who'], self.user.username)
         self.assertEqual(new_entry['description'], status.text)
 
+    def test_history_since(self):
+        self.client.force_authenticate(user=self.sia_read_write_user)
+        history_url = f'/signals/v1/private/signals/{self.signal.id}/history'
+
+        response = self.client.get(history_url)
+        latest = response.json()[0]['when']
+
+        response = self.client.get(history_url, {'since': latest})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [])
+
+        status = Signal.actions.update_status(
+            {'text': 'DIT IS EEN TEST', 'state': workflow.BEHANDELING}, self.signal)
+
+        response = self.client.get(history_url, {'since': latest})
+        self.assertEqual(response.status_code, 200)
+
+        data = response.json()
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]['identifier'], f'UPDATE_STATUS_{status.id}')
+
+    def test_history_since_invalid(self):
+        self.client.force_authenticate(user=self.sia_read_write_user)
+        response = self.client.get(f'/signals/v1/private/signals/{self.signal.id}/history',
+                                   {'since': 'not-a-datetime'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_history_paginated(self):
+        self.client.force_authenticate(user=self.sia_read_write_user)
+        history_url = f'/signals/v1/private/signals/{self.signal.id}/history'
+        n_entries = len(self.client.get(history_url).json())
+
+        response = self.client.get(history_url, {'page_size': 1})
+        self.assertEqual(response.status_code, 200)
+
+        data = response.json()
+        self.assertEqual(data['count'], n_entries)
+        self.assertEqual(len(data['results']), 1)
+        self.assertIsNotNone(data['_links']['next']['href'])
+
 
 class TestHistoryForFeedback(SignalsBaseApiTestCase, SIAReadUserMixin):
     def setUp(self):
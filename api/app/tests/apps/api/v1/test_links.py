@@ -0,0 +1,51 @@
+from unittest import mock
+
+from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.reverse import reverse
+from rest_framework.test import APIRequestFactory
+from rest_framework.versioning import NamespaceVersioning
+
+from signals.apps.api.generics import links
+from signals.apps.api.generics.links import LinkBuilder, get_link_builder
+
+
+class TestLinkBuilder(TestCase):
+    def setUp(self):
+        self.request = Request(APIRequestFactory().get('/signals/v1/private/signals/'))
+        self.request.versioning_scheme = NamespaceVersioning()
+        self.request.version = 'v1'
+
+    def test_url(self):
+        link_builder = LinkBuilder(self.request)
+
+        for view_name, kwargs in (
+            ('signal-namespace', {}),
+            ('private-signals-detail', {'pk': 1}),
+            ('signal-pdf-download', {'pk': 1234}),
+            ('category-detail', {'slug': 'main'}),
+            ('category-detail', {'slug': 'main', 'sub_slug': 'sub'}),
+            ('category-detail', {'slug': 'main', 'sub_slug': 'sub ç&{x}'}),
+        ):
+            with self.subTest(view_name=view_name, kwargs=kwargs):
+                self.assertEqual(link_builder.url(view_name, **kwargs),
+                                 reverse(view_name, kwargs=kwargs or None, request=self.request))
+
+    def test_url_other_version(self):
+        self.request.version = 'v0'
+
+        self.assertEqual(get_link_builder(self.request).url('v1:category-detail', slug='main'),
+                         'http://testserver/signals/v1/public/terms/categories/main')
+
+    def test_patterns_resolved_once(self):
+        link_builder = get_link_builder(self.request)
+        self.assertIs(get_link_builder(self.request), link_builder)
+
+        with mock.patch.object(links, 'reverse', wraps=reverse) as mocked_reverse:
+            for pk in range(5):
+                link_builder.url('private-signals-detail', pk=pk)
+                link_builder.url('signal-namespace')
+
+        self.assertEqual(mocked_reverse.call_count, 2)
+        self.assertEqual(link_builder.url('private-signals-detail', pk=4),
+                         'http://testserver/signals/v1/private/signals/4')
@@ -0,0 +1,90 @@
+import copy
+import json
+import os
+from unittest.mock import patch
+
+from django.test import override_settings
+from rest_framework import status
+
+from signals.apps.api.v1.validation import AddressValidationUnavailableException
+from signals.apps.signals import workflow
+from signals.apps.signals.models import History, Signal, SignalReadModel
+from tests.apps.signals.factories import CategoryFactory
+from tests.test import SIAReadWriteUserMixin, SignalsBaseApiTestCase
+
+THIS_DIR = os.path.dirname(__file__)
+
+
+@patch('signals.apps.api.v1.validation.AddressValidation.validate_address_dict',
+       side_effect=AddressValidationUnavailableException)  # Skip address validation
+class TestPrivateSignalBulkCreate(SIAReadWriteUserMixin, SignalsBaseApiTestCase):
+    bulk_endpoint = '/signals/v1/private/signals/bulk'
+
+    def setUp(self):
+        subcategory = CategoryFactory.create()
+        link_subcategory = '/signals/v1/public/terms/categories/{}/sub_categories/{}'.format(
+            subcategory.parent.slug, subcategory.slug
+        )
+
+        fixture_file = os.path.join(THIS_DIR, 'request_data', 'create_initial.json')
+        with open(fixture_file, 'r') as f:
+            self.create_initial_data = json.load(f)
+
+        self.create_initial_data['source'] = 'valid-source'
+        self.create_initial_data['category'] = {'category_url': link_subcategory}
+
+        self.client.force_authenticate(user=self.sia_read_write_user)
+
+    def test_bulk_create(self, validate_address_dict):
+        data = [copy.deepcopy(self.create_initial_data) for _ in range(3)]
+        data[1]['text'] = 'Tweede melding'
+
+        response = self.client.post(self.bulk_endpoint, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        ids = [item['id'] for item in response.json()]
+        self.assertEqual(len(ids), 3)
+
+        signal = Signal.objects.get(id=ids[1])
+        self.assertEqual(signal.text, 'Tweede melding')
+        self.assertEqual(signal.status.state, workflow.GEMELD)
+        self.assertEqual(signal.status.user, self.sia_read_write_user.email)
+        self.assertEqual(signal.location.created_by, self.sia_read_write_user.email)
+        self.assertEqual(signal.category_assignment.created_by, self.sia_read_write_user.email)
+        self.assertIsNotNone(signal.reporter)
+        self.assertIsNotNone(signal.priority)
+
+        self.assertEqual(History.objects.filter(_signal_id__in=ids).count(), 12)
+        self.assertEqual(SignalReadModel.objects.filter(_signal_id__in=ids).count(), 3)
+
+    def test_bulk_create_errors_per_item(self, validate_address_dict):
+        invalid = copy.deepcopy(self.create_initial_data)
+        del invalid['text']
+        data = [copy.deepcopy(self.create_initial_data), invalid]
+
+        response = self.client.post(self.bulk_endpoint, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        errors = response.json()
+        self.assertEqual(len(errors), 2)
+        self.assertEqual(errors[0], {})
+        self.assertIn('text', errors[1])
+        self.assertEqual(Signal.objects.count(), 0)
+
+    def test_bulk_create_not_a_list(self, validate_address_dict):
+        response = self.client.post(self.bulk_endpoint, self.create_initial_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(SIGNAL_BULK_CREATE_MAX_ITEMS=1)
+    def test_bulk_create_too_many_items(self, validate_address_dict):
+        data = [copy.deepcopy(self.create_initial_data) for _ in range(2)]
+
+        response = self.client.post(self.bulk_endpoint, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Signal.objects.count(), 0)
+
+    def test_bulk_create_not_authenticated(self, validate_address_dict):
+        self.client.logout()
+
+        response = self.client.post(self.bulk_endpoint, [self.create_initial_data], format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
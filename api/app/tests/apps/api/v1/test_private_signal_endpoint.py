@@ -13,6 +13,7 @@ from django.utils.http import urlencode
 from freezegun import freeze_time
 from rest_framework import status
 
+from signals.apps.api.v1.serializers import PrivateSignalSerializerDetail
 from signals.apps.api.v1.validation import AddressValidationUnavailableException, NoResultsException
 from signals.apps.signals import workflow
 from signals.apps.signals.models import Attachment, Signal
@@ -24,6 +25,7 @@ from tests.apps.signals.attachment_helpers import (
 from tests.apps.signals.factories import (
     CategoryFactory,
     DepartmentFactory,
+    NoteFactory,
     ParentCategoryFactory,
     SignalFactory,
     SignalFactoryValidLocation,
@@ -121,6 +123,42 @@ class TestPrivateSignalViewSet(SIAReadWriteUserMixin, SignalsBaseApiTestCase):
         data = response.json()
         self.assertJsonSchema(self.list_signals_schema, data)
 
+    def test_list_endpoint_fields(self):
+        response = self.client.get(self.list_endpoint, {'fields': 'id,status,has_attachments'})
+        self.assertEqual(response.status_code, 200)
+
+        results = {result['id']: result for result in response.json()['results']}
+        self.assertEqual(set(results[self.signal_with_image.id]),
+                         {'_links', 'id', 'status', 'has_attachments'})
+        self.assertTrue(results[self.signal_with_image.id]['has_attachments'])
+        self.assertFalse(results[self.signal_no_image.id]['has_attachments'])
+
+    def test_list_endpoint_exclude(self):
+        response = self.client.get(self.list_endpoint, {'exclude': 'notes,extra_properties'})
+        self.assertEqual(response.status_code, 200)
+
+        result = response.json()['results'][0]
+        self.assertNotIn('notes', result)
+        self.assertNotIn('extra_properties', result)
+        self.assertIn('location', result)
+
+    def test_list_endpoint_unknown_field(self):
+        response = self.client.get(self.list_endpoint, {'fields': 'id,unknown'})
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(SIGNAL_LIST_MAX_NOTES=2)
+    def test_list_endpoint_newest_notes(self):
+        notes = [NoteFactory.create(_signal=self.signal_no_image) for _ in range(3)]
+
+        response = self.client.get(self.list_endpoint, {'fields': 'id,notes,notes_count'})
+        self.assertEqual(response.status_code, 200)
+
+        result = next(result for result in response.json()['results']
+                      if result['id'] == self.signal_no_image.id)
+        self.assertEqual(result['notes_count'], 3)
+        self.assertEqual([note['text'] for note in result['notes']],
+                         [note.text for note in reversed(notes[1:])])
+
     def test_detail_endpoint(self):
         response = self.client.get(self.detail_endpoint.format(pk=self.signal_no_image.id))
         self.assertEqual(response.status_code, 200)
@@ -129,6 +167,80 @@ class TestPrivateSignalViewSet(SIAReadWriteUserMixin, SignalsBaseApiTestCase):
         data = response.json()
         self.assertJsonSchema(self.retrieve_signal_schema, data)
 
+    def test_detail_endpoint_links(self):
+        children = SignalFactory.create_batch(2, parent=self.signal_no_image)
+        detail_url = 'http://testserver/signals/v1/private/signals/{pk}'
+
+        response = self.client.get(self.detail_endpoint.format(pk=self.signal_no_image.id))
+        self.assertEqual(response.status_code, 200)
+
+        links = response.json()['_links']
+        self.assertEqual(links['self']['href'], detail_url.format(pk=self.signal_no_image.id))
+        self.assertEqual(links['sia:pdf']['href'],
+                         detail_url.format(pk=self.signal_no_image.id) + '/pdf')
+        self.assertEqual(sorted(link['href'] for link in links['sia:children']),
+                         sorted(detail_url.format(pk=child.id) for child in children))
+        self.assertNotIn('sia:parent', links)
+
+        response = self.client.get(self.detail_endpoint.format(pk=children[0].id))
+        links = response.json()['_links']
+        self.assertEqual(links['sia:parent']['href'], detail_url.format(pk=self.signal_no_image.id))
+        self.assertNotIn('sia:children', links)
+
+    def test_detail_endpoint_etag(self):
+        detail_url = self.detail_endpoint.format(pk=self.signal_no_image.id)
+
+        response = self.client.get(detail_url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/"'))
+
+        response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+        add_non_image_attachments(self.signal_no_image, 1)
+        response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['has_attachments'])
+        etag = response['ETag']
+
+        Signal.actions.update_priority({'priority': 'high'}, self.signal_no_image)
+        response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        etag = response['ETag']
+
+        # A note added with a PATCH of the detail changes the signal as well
+        response = self.client.patch(detail_url, {'notes': [{'text': 'New note'}]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['notes'][0]['text'], 'New note')
+
+    def test_detail_endpoint_cached(self):
+        detail_url = self.detail_endpoint.format(pk=self.signal_no_image.id)
+        data = self.client.get(detail_url).json()
+
+        with patch.object(PrivateSignalSerializerDetail, 'to_representation') as to_representation:
+            response = self.client.get(detail_url)
+        to_representation.assert_not_called()
+        self.assertEqual(response.json(), data)
+
+        response = self.client.patch(detail_url, {'notes': [{'text': 'New note'}]}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(detail_url)
+        self.assertEqual(response.json()['notes'][0]['text'], 'New note')
+
+    def test_detail_endpoint_etag_no_permission(self):
+        detail_url = self.detail_endpoint.format(pk=self.signal_no_image.id)
+        etag = self.client.get(detail_url)['ETag']
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 403)
+
     def test_history_action(self):
         response = self.client.get(self.history_endpoint.format(pk=self.signal_no_image.id))
         self.assertEqual(response.status_code, 200)
@@ -140,6 +252,24 @@ class TestPrivateSignalViewSet(SIAReadWriteUserMixin, SignalsBaseApiTestCase):
         data = response.json()
         self.assertJsonSchema(self.list_history_schema, data)
 
+    def test_history_action_etag(self):
+        history_url = self.history_endpoint.format(pk=self.signal_no_image.id)
+
+        response = self.client.get(history_url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        response = self.client.get(history_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+        Signal.actions.create_note({'text': 'New note'}, self.signal_no_image)
+
+        response = self.client.get(history_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(response.json()), 5)
+
     def test_history_action_filters(self):
         base_url = self.history_endpoint.format(pk=self.signal_no_image.id)
 
@@ -814,7 +944,10 @@ class TestPrivateSignalViewSet(SIAReadWriteUserMixin, SignalsBaseApiTestCase):
         self.signal_no_image.refresh_from_db()
         self.assertEqual(self.sia_read_write_user.email, self.signal_no_image.status.created_by)
 
-    def test_split_children_must_inherit_parent_images(self):
+    # The images are copied by a Celery task started after the split is committed, on_commit
+    # callbacks are not run in a TestCase so they are run immediately here.
+    @patch('django.db.transaction.on_commit', side_effect=lambda func: func())
+    def test_split_children_must_inherit_parent_images(self, patched_on_commit):
         # Split the signal, take note of the returned children
 
         def md5(fname):
@@ -855,7 +988,10 @@ class TestPrivateSignalViewSet(SIAReadWriteUserMixin, SignalsBaseApiTestCase):
         self.signal_with_image.refresh_from_db()
         self.assertEqual(self.sia_read_write_user.email, self.signal_with_image.status.created_by)
 
-    def test_split_children_must_inherit_parent_images_for_1st_child(self):
+    # The images are copied by a Celery task started after the split is committed, on_commit
+    # callbacks are not run in a TestCase so they are run immediately here.
+    @patch('django.db.transaction.on_commit', side_effect=lambda func: func())
+    def test_split_children_must_inherit_parent_images_for_1st_child(self, patched_on_commit):
         # Split the signal, take note of the returned children
         response = self.client.post(
             self.split_endpoint.format(pk=self.signal_with_image.id),
@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+
+from django.contrib.auth.models import Permission
+
+from signals.apps.signals.workflow import BEHANDELING, GEMELD
+from tests.apps.signals.factories import SignalFactory
+from tests.test import SIAReadUserMixin, SignalsBaseApiTestCase
+
+
+class TestPrivateSignalExport(SIAReadUserMixin, SignalsBaseApiTestCase):
+    export_endpoint = '/signals/v1/private/signals/export'
+
+    def setUp(self):
+        self.signals = SignalFactory.create_batch(3, status__state=GEMELD)
+        self.signal_in_progress = SignalFactory.create(status__state=BEHANDELING)
+
+        self.export_user = self.sia_read_user
+        self.export_user.user_permissions.add(Permission.objects.get(codename='sia_signal_export'))
+        self.client.force_authenticate(user=self.export_user)
+
+    def _get_content(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_export_csv(self):
+        response = self.client.get(self.export_endpoint, {'format': 'csv'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+
+        rows = list(csv.DictReader(io.StringIO(self._get_content(response))))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual({row['id'] for row in rows},
+                         {str(signal.id) for signal in self.signals + [self.signal_in_progress]})
+
+        row = next(row for row in rows if row['id'] == str(self.signal_in_progress.id))
+        self.assertEqual(row['status'], BEHANDELING)
+        self.assertEqual(row['sub_category'],
+                         self.signal_in_progress.category_assignment.category.slug)
+
+    def test_export_csv_formula(self):
+        signal = SignalFactory.create(text='=HYPERLINK("https://example.com")', text_extra='-1+1')
+
+        response = self.client.get(self.export_endpoint, {'format': 'csv'})
+        rows = list(csv.DictReader(io.StringIO(self._get_content(response))))
+
+        row = next(row for row in rows if row['id'] == str(signal.id))
+        self.assertEqual(row['text'], '\'=HYPERLINK("https://example.com")')
+        self.assertEqual(row['text_extra'], "'-1+1")
+
+    def test_export_ndjson_filtered(self):
+        response = self.client.get(self.export_endpoint, {'format': 'ndjson', 'status': GEMELD})
+        self.assertEqual(response.status_code, 200)
+
+        rows = [json.loads(line) for line in self._get_content(response).splitlines()]
+        self.assertEqual(sorted(row['id'] for row in rows),
+                         sorted(signal.id for signal in self.signals))
+        self.assertEqual(rows[0]['signal_id'], str(
+            next(signal for signal in self.signals if signal.id == rows[0]['id']).signal_id
+        ))
+
+    def test_export_no_permission(self):
+        self.client.force_authenticate(user=self.sia_read_user)
+
+        response = self.client.get(self.export_endpoint)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertIn('detail', json.loads(response.content))
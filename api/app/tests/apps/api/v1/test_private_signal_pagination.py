@@ -0,0 +1,155 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from freezegun import freeze_time
+from rest_framework import status
+
+from signals.apps.api.generics.pagination import EstimatedCountPaginator
+from signals.apps.signals.models import STADSDEEL_CENTRUM, STADSDEEL_NOORD, Signal
+from tests.apps.signals.factories import SignalFactory
+from tests.test import SIAReadWriteUserMixin, SignalsBaseApiTestCase
+
+
+class TestPrivateSignalCursorPagination(SIAReadWriteUserMixin, SignalsBaseApiTestCase):
+    list_endpoint = '/signals/v1/private/signals/'
+
+    def setUp(self):
+        now = timezone.now()
+        for i in range(5):
+            with freeze_time(now - timedelta(hours=i)):
+                signal = SignalFactory.create()
+            signal.location.stadsdeel = STADSDEEL_CENTRUM if i % 2 else STADSDEEL_NOORD
+            signal.location.save()
+
+        self.client.force_authenticate(user=self.sia_read_write_user)
+
+    def _walk(self, url, direction='next'):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            data = response.json()
+            self.assertNotIn('count', data)
+            self.assertLessEqual(len(data['results']), 2)
+
+            ids.extend([result['id'] for result in data['results']])
+            url = data['_links'][direction]['href']
+        return ids
+
+    def test_page_number_pagination_is_default(self):
+        response = self.client.get(self.list_endpoint, {'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['count'], 5)
+
+    def test_cursor_pagination(self):
+        expected = list(Signal.objects.order_by('-created_at').values_list('id', flat=True))
+
+        ids = self._walk(f'{self.list_endpoint}?cursor=&page_size=2')
+        self.assertEqual(ids, expected)
+
+    def test_cursor_pagination_previous(self):
+        response = self.client.get(f'{self.list_endpoint}?cursor=&page_size=2')
+        data = response.json()
+        self.assertIsNone(data['_links']['previous']['href'])
+
+        first_page_ids = [result['id'] for result in data['results']]
+
+        response = self.client.get(data['_links']['next']['href'])
+        data = response.json()
+        self.assertIsNotNone(data['_links']['previous']['href'])
+
+        response = self.client.get(data['_links']['previous']['href'])
+        data = response.json()
+        self.assertEqual([result['id'] for result in data['results']], first_page_ids)
+        self.assertIsNone(data['_links']['previous']['href'])
+        self.assertIsNotNone(data['_links']['next']['href'])
+
+    def test_cursor_pagination_ordering_with_duplicate_values(self):
+        expected = list(Signal.objects.order_by(
+            'location__stadsdeel', 'id'
+        ).values_list('id', flat=True))
+
+        ids = self._walk(f'{self.list_endpoint}?cursor=&page_size=2&ordering=stadsdeel')
+        self.assertEqual(ids, expected)
+
+    def test_cursor_pagination_no_count_query(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f'{self.list_endpoint}?cursor=&page_size=2')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertFalse(any('COUNT(' in query['sql'] for query in context.captured_queries))
+
+    def test_invalid_cursor(self):
+        response = self.client.get(f'{self.list_endpoint}?cursor=invalid')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_for_other_ordering(self):
+        response = self.client.get(f'{self.list_endpoint}?cursor=&page_size=2')
+        next_link = response.json()['_links']['next']['href']
+
+        response = self.client.get(f'{next_link}&ordering=stadsdeel')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TestPrivateSignalEstimatedCount(SIAReadWriteUserMixin, SignalsBaseApiTestCase):
+    list_endpoint = '/signals/v1/private/signals/'
+    count_endpoint = '/signals/v1/private/signals/count'
+
+    def setUp(self):
+        SignalFactory.create_batch(5)
+        self.client.force_authenticate(user=self.sia_read_write_user)
+
+    def test_exact_count_below_threshold(self):
+        response = self.client.get(self.list_endpoint)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = response.json()
+        self.assertEqual(data['count'], 5)
+        self.assertFalse(data['count_is_estimate'])
+
+    @patch.object(EstimatedCountPaginator, 'count_threshold', 2)
+    @patch.object(EstimatedCountPaginator, '_get_table_estimate', return_value=0)
+    @patch.object(EstimatedCountPaginator, '_get_planner_estimate', return_value=4)
+    def test_estimated_count_above_threshold(self, mocked_get_planner_estimate, *args):
+        response = self.client.get(self.list_endpoint, {'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = response.json()
+        self.assertTrue(data['count_is_estimate'])
+        self.assertEqual(data['count'], 4)
+        mocked_get_planner_estimate.assert_called_once()
+
+        # The estimate is too low, the pages after it can still be retrieved
+        response = self.client.get(self.list_endpoint, {'page_size': 2, 'page': 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = response.json()
+        self.assertEqual(len(data['results']), 1)
+        self.assertIsNone(data['_links']['next']['href'])
+
+    @patch.object(EstimatedCountPaginator, 'count_threshold', 2)
+    @patch.object(EstimatedCountPaginator, '_get_table_estimate', return_value=1000)
+    def test_table_estimate_unfiltered(self, mocked_get_table_estimate):
+        response = self.client.get(self.list_endpoint)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = response.json()
+        self.assertTrue(data['count_is_estimate'])
+        self.assertEqual(data['count'], 1000)
+
+    @patch.object(EstimatedCountPaginator, 'count_threshold', 2)
+    def test_count_endpoint(self):
+        response = self.client.get(self.count_endpoint)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['count'], 5)
+
+    def test_count_endpoint_filtered(self):
+        signal = Signal.objects.first()
+
+        response = self.client.get(self.count_endpoint, {'id': signal.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['count'], 1)
@@ -0,0 +1,90 @@
+from rest_framework import status
+
+from signals.apps.signals import workflow
+from signals.apps.signals.models import History, Signal
+from tests.apps.signals.factories import SignalFactory
+from tests.test import SIAReadWriteUserMixin, SignalsBaseApiTestCase
+
+
+class TestPrivateSignalStatusBulk(SIAReadWriteUserMixin, SignalsBaseApiTestCase):
+    bulk_status_endpoint = '/signals/v1/private/signals/bulk/status'
+
+    def setUp(self):
+        self.signals = SignalFactory.create_batch(3, status__state=workflow.GEMELD)
+        self.closed_signal = SignalFactory.create(status__state=workflow.AFGEHANDELD)
+
+        self.status_data = {
+            'state': workflow.BEHANDELING,
+            'text': 'In behandeling genomen',
+        }
+
+        self.client.force_authenticate(user=self.sia_read_write_user)
+
+    def test_bulk_status_signal_ids(self):
+        signal_ids = [self.signals[0].id, self.signals[1].id, self.closed_signal.id]
+        data = {'signal_ids': signal_ids, 'status': self.status_data}
+
+        response = self.client.post(self.bulk_status_endpoint, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response_json = response.json()
+        self.assertEqual(response_json['updated'], sorted(signal_ids[:2]))
+        self.assertEqual(response_json['not_updated'], [self.closed_signal.id])
+
+        for signal in Signal.objects.filter(id__in=signal_ids[:2]):
+            self.assertEqual(signal.status.state, workflow.BEHANDELING)
+            self.assertEqual(signal.status.user, self.sia_read_write_user.email)
+            self.assertTrue(History.objects.filter(_signal=signal,
+                                                   identifier='UPDATE_STATUS_{}'.format(
+                                                       signal.status.id)).exists())
+
+        # Signals that were not selected are left alone
+        self.signals[2].refresh_from_db()
+        self.assertEqual(self.signals[2].status.state, workflow.GEMELD)
+        self.closed_signal.refresh_from_db()
+        self.assertEqual(self.closed_signal.status.state, workflow.AFGEHANDELD)
+
+    def test_bulk_status_filter(self):
+        data = {'status': self.status_data}
+
+        response = self.client.post('{}?status={}'.format(self.bulk_status_endpoint,
+                                                          workflow.GEMELD), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response_json = response.json()
+        self.assertEqual(response_json['updated'], sorted(signal.id for signal in self.signals))
+        self.assertEqual(response_json['not_updated'], [])
+        self.assertEqual(Signal.objects.filter(status__state=workflow.BEHANDELING).count(), 3)
+
+    def test_bulk_status_no_signal_ids_or_filter(self):
+        response = self.client.post(self.bulk_status_endpoint, {'status': self.status_data},
+                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Signal.objects.filter(status__state=workflow.BEHANDELING).count(), 0)
+
+    def test_bulk_status_no_filter_parameters(self):
+        for query in ('format=json', 'page_size=1', 'stauts={}'.format(workflow.GEMELD), 'status='):
+            with self.subTest(query=query):
+                response = self.client.post('{}?{}'.format(self.bulk_status_endpoint, query),
+                                            {'status': self.status_data}, format='json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertEqual(
+                    Signal.objects.filter(status__state=workflow.BEHANDELING).count(), 0)
+
+    def test_bulk_status_invalid_status(self):
+        data = {
+            'signal_ids': [signal.id for signal in self.signals],
+            'status': {'state': workflow.AFGEHANDELD},
+        }
+
+        response = self.client.post(self.bulk_status_endpoint, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('status', response.json())
+        self.assertEqual(Signal.objects.filter(status__state=workflow.AFGEHANDELD).count(), 1)
+
+    def test_bulk_status_not_authenticated(self):
+        self.client.logout()
+
+        data = {'signal_ids': [self.signals[0].id], 'status': self.status_data}
+        response = self.client.post(self.bulk_status_endpoint, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
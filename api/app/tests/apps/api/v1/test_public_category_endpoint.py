@@ -1,7 +1,9 @@
 import os
 
+from rest_framework.test import APITransactionTestCase
+
 from signals.apps.signals.models import Category
-from tests.apps.signals.factories import CategoryFactory, ParentCategoryFactory
+from tests.apps.signals.factories import CategoryFactory, DepartmentFactory, ParentCategoryFactory
 from tests.test import SignalsBaseApiTestCase
 
 THIS_DIR = os.path.dirname(__file__)
@@ -78,3 +80,67 @@ class TestCategoryTermsEndpoints(SignalsBaseApiTestCase):
 
         self.assertEqual(data['name'], sub_category.name)
         self.assertIn('is_active', data)
+
+
+class TestCategoryTermsConditionalGet(APITransactionTestCase):
+    def setUp(self):
+        self.parent_category = ParentCategoryFactory.create()
+        self.sub_category = CategoryFactory.create(parent=self.parent_category)
+
+    def test_etag(self):
+        for url in (
+            '/signals/v1/public/terms/categories/',
+            '/signals/v1/public/terms/categories/{}'.format(self.parent_category.slug),
+            '/signals/v1/public/terms/categories/{}/sub_categories/{}'.format(
+                self.parent_category.slug, self.sub_category.slug),
+        ):
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+
+    def test_etag_changes_with_category(self):
+        url = '/signals/v1/public/terms/categories/{}'.format(self.parent_category.slug)
+        etag = self.client.get(url)['ETag']
+
+        self.sub_category.name = 'Renamed'
+        self.sub_category.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['sub_categories'][0]['name'], 'Renamed')
+
+    def test_tree(self):
+        CategoryFactory.create(parent=self.parent_category, is_active=False)
+        ParentCategoryFactory.create(is_active=False)
+        url = '/signals/v1/public/terms/categories/tree'
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        data = response.json()
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['results'][0]['slug'], self.parent_category.slug)
+        self.assertEqual([category['slug'] for category in data['results'][0]['sub_categories']],
+                         [self.sub_category.slug])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url).json(), data)
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_tree_changes_with_department(self):
+        department = DepartmentFactory.create(name='Before')
+        self.sub_category.departments.add(department, through_defaults={'is_responsible': True})
+        url = '/signals/v1/public/terms/categories/tree'
+        etag = self.client.get(url)['ETag']
+
+        department.name = 'After'
+        department.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        sub_category = response.json()['results'][0]['sub_categories'][0]
+        self.assertEqual([department['name'] for department in sub_category['departments']],
+                         ['After'])
@@ -2,6 +2,7 @@ from unittest import mock
 
 from django.test import TestCase
 
+from signals.apps.signals import workflow
 from signals.apps.signals.managers import create_initial, update_status
 from tests.apps.signals.factories import SignalFactory, StatusFactory
 
@@ -13,15 +14,23 @@ class TestSignalReceivers(TestCase):
         self.signal = SignalFactory.create()
 
     @mock.patch('signals.apps.zds.signal_receivers.tasks', autospec=True)
-    @mock.patch('signals.apps.email_integrations.reporter.signal_receivers.tasks', autospec=True)
-    def test_create_initial_handler(self, mocked_tasks, zds_tasks):
+    @mock.patch('signals.apps.email_integrations.reporter.signal_receivers.mail', autospec=True)
+    def test_create_initial_handler(self, mocked_mail, zds_tasks):
         create_initial.send_robust(sender=self.__class__, signal_obj=self.signal)
-        mocked_tasks.send_mail_reporter_created.delay.assert_called_once_with(pk=self.signal.id)
+        mocked_mail.send_mail_reporter_created.assert_called_once_with(self.signal)
 
-    @mock.patch('signals.apps.email_integrations.reporter.signal_receivers.tasks', autospec=True)
-    def test_update_status_handler(self, mocked_tasks):
+    @mock.patch('signals.apps.zds.signal_receivers.tasks', autospec=True)
+    @mock.patch('signals.apps.email_integrations.reporter.signal_receivers.mail', autospec=True)
+    def test_create_initial_handler_no_email(self, mocked_mail, zds_tasks):
+        signal = SignalFactory.create(reporter__email='')
+
+        create_initial.send_robust(sender=self.__class__, signal_obj=signal)
+        mocked_mail.send_mail_reporter_created.assert_not_called()
+
+    @mock.patch('signals.apps.email_integrations.reporter.signal_receivers.mail', autospec=True)
+    def test_update_status_handler(self, mocked_mail):
         prev_status = self.signal.status
-        new_status = StatusFactory.create(_signal=self.signal)
+        new_status = StatusFactory.create(_signal=self.signal, state=workflow.AFGEHANDELD)
 
         self.signal.status = new_status
         self.signal.save()
@@ -31,15 +40,33 @@ class TestSignalReceivers(TestCase):
                                   status=new_status,
                                   prev_status=prev_status)
 
-        mocked_tasks.send_mail_reporter_status_changed_afgehandeld.delay.assert_called_once_with(
-            signal_pk=self.signal.id, status_pk=new_status.id, prev_status_pk=prev_status.pk
+        mocked_mail.send_mail_reporter_status_changed_afgehandeld.assert_called_once_with(
+            self.signal, new_status, prev_status
         )
-        mocked_tasks.send_mail_reporter_status_changed_heropend.delay.assert_called_once_with(
-            signal_pk=self.signal.pk, status_pk=new_status.id, prev_status_pk=prev_status.pk
+        mocked_mail.send_mail_reporter_status_changed_heropend.assert_called_once_with(
+            self.signal, new_status
         )
-        mocked_tasks.send_mail_reporter_status_changed_ingepland.delay.assert_called_once_with(
-            signal_pk=self.signal.pk, status_pk=new_status.id, prev_status_pk=prev_status.pk
+        mocked_mail.send_mail_reporter_status_changed_ingepland.assert_called_once_with(
+            self.signal, new_status
         )
-        mocked_tasks.send_mail_reporter_status_changed_split.delay.assert_called_once_with(
-            signal_pk=self.signal.pk, status_pk=new_status.id, prev_status_pk=prev_status.pk
+        mocked_mail.send_mail_reporter_status_changed_split.assert_called_once_with(
+            self.signal, new_status
         )
+
+    @mock.patch('signals.apps.email_integrations.reporter.signal_receivers.mail', autospec=True)
+    def test_update_status_handler_not_notified(self, mocked_mail):
+        prev_status = self.signal.status
+        new_status = StatusFactory.create(_signal=self.signal, state=workflow.BEHANDELING)
+
+        self.signal.status = new_status
+        self.signal.save()
+
+        update_status.send_robust(sender=self.__class__,
+                                  signal_obj=self.signal,
+                                  status=new_status,
+                                  prev_status=prev_status)
+
+        mocked_mail.send_mail_reporter_status_changed_afgehandeld.assert_not_called()
+        mocked_mail.send_mail_reporter_status_changed_heropend.assert_not_called()
+        mocked_mail.send_mail_reporter_status_changed_ingepland.assert_not_called()
+        mocked_mail.send_mail_reporter_status_changed_split.assert_not_called()
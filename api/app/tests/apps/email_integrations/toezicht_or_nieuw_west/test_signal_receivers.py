@@ -18,18 +18,25 @@ class TestSignalReceivers(TestCase):
         )
 
     @mock.patch('signals.apps.zds.signal_receivers.tasks', autospec=True)
-    @mock.patch('signals.apps.email_integrations.toezicht_or_nieuw_west.signal_receivers.tasks',
-                autospec=True)
-    def test_create_initial_handler(self, mocked_tasks, zds_tasks):
+    @mock.patch('signals.apps.email_integrations.toezicht_or_nieuw_west.signal_receivers.is_signal_applicable',
+                return_value=True)
+    @mock.patch('signals.apps.email_integrations.toezicht_or_nieuw_west.signal_receivers.mail', autospec=True)
+    def test_create_initial_handler(self, mocked_mail, mocked_is_signal_applicable, zds_tasks):
         create_initial.send_robust(sender=self.__class__, signal_obj=self.signal)
-        mocked_tasks.send_mail_toezicht_or_nieuw_west.delay.assert_called_once_with(
-            pk=self.signal.id
-        )
+        mocked_mail.send_mail.assert_called_once_with(self.signal)
 
-    @mock.patch('signals.apps.email_integrations.toezicht_or_nieuw_west.signal_receivers.tasks',
-                autospec=True)
-    def test_create_child_handler(self, mocked_tasks):
+    @mock.patch('signals.apps.email_integrations.toezicht_or_nieuw_west.signal_receivers.is_signal_applicable',
+                return_value=True)
+    @mock.patch('signals.apps.email_integrations.toezicht_or_nieuw_west.signal_receivers.mail', autospec=True)
+    def test_create_child_handler(self, mocked_mail, mocked_is_signal_applicable):
         create_child.send_robust(sender=self.__class__, signal_obj=self.signal)
-        mocked_tasks.send_mail_toezicht_or_nieuw_west.delay.assert_called_once_with(
-            pk=self.signal.id
-        )
+        mocked_mail.send_mail.assert_called_once_with(self.signal)
+
+    @mock.patch('signals.apps.zds.signal_receivers.tasks', autospec=True)
+    @mock.patch('signals.apps.email_integrations.toezicht_or_nieuw_west.signal_receivers.is_signal_applicable',
+                return_value=False)
+    @mock.patch('signals.apps.email_integrations.toezicht_or_nieuw_west.signal_receivers.mail', autospec=True)
+    def test_create_initial_handler_not_applicable(self, mocked_mail, mocked_is_signal_applicable,
+                                                   zds_tasks):
+        create_initial.send_robust(sender=self.__class__, signal_obj=self.signal)
+        mocked_mail.send_mail.assert_not_called()
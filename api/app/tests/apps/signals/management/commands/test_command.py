@@ -4,6 +4,8 @@ from unittest.mock import patch
 from django.core.management import call_command
 from django.test import TransactionTestCase
 
+from tests.apps.signals.factories import SignalFactoryWithImage
+
 
 class TestCommand(TransactionTestCase):
     @patch('signals.apps.signals.tasks.anonymize_reporters')
@@ -21,3 +23,42 @@ class TestCommand(TransactionTestCase):
 
         call_command('anonymize_reporters', days=1, stdout=out, stderr=err)
         patched_anonymize_reporters.assert_not_called()
+
+    @patch('signals.apps.signals.models.SignalReadModel.objects.rebuild', return_value=0)
+    def test_rebuild_signal_read_model(self, patched_rebuild):
+        out = StringIO()
+        err = StringIO()
+
+        call_command('rebuild_signal_read_model', batch_size=100, stdout=out, stderr=err)
+        patched_rebuild.assert_called_once_with(batch_size=100)
+
+    @patch('signals.apps.signals.models.SignalReadModel.objects.rebuild', return_value=0)
+    def test_rebuild_signal_read_model_invalid_batch_size(self, patched_rebuild):
+        out = StringIO()
+        err = StringIO()
+
+        call_command('rebuild_signal_read_model', batch_size=0, stdout=out, stderr=err)
+        patched_rebuild.assert_not_called()
+
+    @patch('signals.apps.signals.models.History.objects.fill_descriptions', return_value=0)
+    @patch('signals.apps.signals.models.History.objects.backfill', return_value=0)
+    def test_backfill_signal_history(self, patched_backfill, patched_fill_descriptions):
+        out = StringIO()
+        err = StringIO()
+
+        call_command('backfill_signal_history', batch_size=100, stdout=out, stderr=err)
+        patched_backfill.assert_called_once_with(batch_size=100)
+        patched_fill_descriptions.assert_called_once()
+
+    @patch('signals.apps.signals.management.commands.generate_attachment_renditions.'
+           'generate_attachment_renditions')
+    def test_generate_attachment_renditions(self, patched_generate_attachment_renditions):
+        signal = SignalFactoryWithImage.create()
+        attachment = signal.attachments.first()
+
+        out = StringIO()
+        err = StringIO()
+
+        call_command('generate_attachment_renditions', stdout=out, stderr=err)
+        patched_generate_attachment_renditions.delay.assert_called_once_with(
+            attachment_id=attachment.pk)
@@ -0,0 +1,129 @@
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase
+from freezegun import freeze_time
+
+from signals.apps.signals.category_tree import (
+    CATEGORY_TREE_VERSION_KEY,
+    get_category_tree,
+    get_visible_category_ids
+)
+from signals.apps.signals.models import Category, CategoryDepartment, CategoryTranslation
+from tests.apps.signals.factories import CategoryFactory, DepartmentFactory, ParentCategoryFactory
+from tests.apps.users.factories import UserFactory
+
+
+class TestCategoryTree(TestCase):
+    def setUp(self):
+        self.department = DepartmentFactory.create()
+        self.parent_category = ParentCategoryFactory.create(slug='main')
+        self.category = CategoryFactory.create(parent=self.parent_category, slug='sub',
+                                               departments=[self.department])
+
+    def test_get_by_slugs(self):
+        category_tree = get_category_tree()
+
+        self.assertEqual(category_tree.get_by_slugs('main'), self.parent_category)
+        self.assertEqual(category_tree.get_by_slugs('main', 'sub'), self.category)
+        self.assertEqual(category_tree.get(self.category.pk), self.category)
+
+        with self.assertRaises(Category.DoesNotExist):
+            category_tree.get_by_slugs('sub')
+        with self.assertRaises(Category.DoesNotExist):
+            category_tree.get_by_slugs('main', 'unknown')
+
+    def test_relations_loaded(self):
+        category_tree = get_category_tree()
+
+        with self.assertNumQueries(0):
+            category = category_tree.get_by_slugs('main', 'sub')
+            self.assertEqual(category.parent.slug, 'main')
+            self.assertEqual(list(category.departments.all()), [self.department])
+            self.assertEqual(list(category.slo.all()), [])
+
+    def test_changes_in_transaction(self):
+        get_category_tree()
+        category = CategoryFactory.create(parent=self.parent_category, slug='new')
+
+        self.assertEqual(get_category_tree().get_by_slugs('main', 'new'), category)
+
+    def test_translated_to(self):
+        new_category = CategoryFactory.create(parent=self.parent_category)
+        self.category.is_active = False
+        self.category.save()
+        CategoryTranslation.objects.create(old_category=self.category, new_category=new_category,
+                                           text='Translated')
+
+        category_tree = get_category_tree()
+        category = category_tree.get_by_slugs('main', 'sub')
+        self.assertEqual(category_tree.translated_to(category), new_category)
+        self.assertEqual(category_tree.get_translation(category).text, 'Translated')
+        self.assertIsNone(category_tree.translated_to(new_category))
+
+    def test_get_from_url(self):
+        url = '/signals/v1/public/terms/categories/main/sub_categories/sub'
+
+        self.assertEqual(Category.objects.get_from_url(url), self.category)
+        with self.assertRaises(Category.DoesNotExist):
+            Category.objects.get_from_url('/signals/v1/public/terms/categories/unknown')
+
+    def test_get_visible_category_ids(self):
+        other_department = DepartmentFactory.create()
+        CategoryDepartment.objects.create(category=self.parent_category,
+                                          department=other_department, can_view=True)
+        CategoryDepartment.objects.create(category=self.category,
+                                          department=other_department, can_view=False)
+        user = UserFactory.create()
+
+        self.assertEqual(get_visible_category_ids(user), set())
+
+        user.profile.departments.add(self.department)
+        self.assertEqual(get_visible_category_ids(user), {self.category.pk})
+
+        user.profile.departments.add(other_department)
+        self.assertEqual(get_visible_category_ids(user),
+                         {self.category.pk, self.parent_category.pk})
+
+        self.department.profile_set.clear()
+        self.assertEqual(get_visible_category_ids(user), {self.parent_category.pk})
+
+
+class TestCategoryTreeInvalidation(TransactionTestCase):
+    def test_tree_kept_until_change(self):
+        parent_category = ParentCategoryFactory.create(slug='main')
+        category_tree = get_category_tree()
+
+        with self.assertNumQueries(0):
+            self.assertIs(get_category_tree(), category_tree)
+
+        category = CategoryFactory.create(parent=parent_category, slug='sub')
+        self.assertIsNot(get_category_tree(), category_tree)
+        self.assertEqual(get_category_tree().get_by_slugs('main', 'sub'), category)
+
+        category_tree = get_category_tree()
+        category.departments.add(DepartmentFactory.create())
+        self.assertIsNot(get_category_tree(), category_tree)
+
+    def test_version_expires(self):
+        cache.delete(CATEGORY_TREE_VERSION_KEY)
+
+        with freeze_time('2020-02-14 10:00:00'):
+            category_tree = get_category_tree()
+        with freeze_time('2020-02-14 10:04:00'):
+            self.assertIs(get_category_tree(), category_tree)
+
+        # A change of the version that was not seen is picked up once the version expired
+        with freeze_time('2020-02-14 10:06:00'):
+            self.assertIsNot(get_category_tree(), category_tree)
+
+    def test_department_ids_cached(self):
+        department = DepartmentFactory.create()
+        category = CategoryFactory.create(departments=[department])
+        user = UserFactory.create()
+        user.profile.departments.add(department)
+
+        self.assertEqual(get_visible_category_ids(user), {category.pk})
+        with self.assertNumQueries(0):
+            self.assertEqual(get_visible_category_ids(user), {category.pk})
+
+        user.profile.departments.remove(department)
+        self.assertEqual(get_visible_category_ids(user), set())
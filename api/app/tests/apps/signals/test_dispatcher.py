@@ -0,0 +1,102 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from signals.apps.signals import dispatcher, workflow
+from signals.apps.signals.managers import update_priority, update_status
+from signals.apps.signals.models import OutboxEvent
+from tests.apps.signals.factories import SignalFactory, StatusFactory
+
+
+class TestDispatcher(TestCase):
+    def setUp(self):
+        self.signal = SignalFactory.create()
+
+        self.handler = mock.Mock(__name__='handler')
+        self.failing_handler = mock.Mock(__name__='failing_handler', side_effect=[Exception, None])
+        self.not_applicable_handler = mock.Mock(__name__='not_applicable_handler')
+
+        handlers = {'update_priority': [
+            (self.failing_handler, None),
+            (self.not_applicable_handler, lambda signal, **kwargs: False),
+            (self.handler, lambda signal, **kwargs: signal.pk == self.signal.pk),
+        ]}
+        patcher = mock.patch.dict('signals.apps.signals.dispatcher._handlers', handlers)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_dispatch(self):
+        # Only the failed handler is retried, the retry loads the signal again
+        with self.assertNumQueries(2):
+            dispatcher.dispatch.delay('update_priority', self.signal.pk)
+
+        self.assertEqual(self.failing_handler.call_count, 2)
+        self.failing_handler.assert_called_with(self.signal)
+        self.not_applicable_handler.assert_not_called()
+        self.handler.assert_called_once_with(self.signal)
+
+    def test_dispatch_update_status(self):
+        handler = mock.Mock(__name__='handler')
+        prev_status = self.signal.status
+        status = StatusFactory.create(_signal=self.signal, state=workflow.BEHANDELING)
+
+        with mock.patch.dict('signals.apps.signals.dispatcher._handlers',
+                             {'update_status': [(handler, None)]}):
+            dispatcher.dispatch('update_status', self.signal.pk, status_id=status.pk,
+                                prev_status_id=prev_status.pk)
+
+        handler.assert_called_once_with(self.signal, status=status, prev_status=prev_status)
+
+    def test_dispatch_idempotency_key(self):
+        idempotency_key = 'update_priority_{}'.format(self.signal.priority.pk)
+        OutboxEvent.objects.create(event='update_priority', kwargs={},
+                                   idempotency_key=idempotency_key)
+
+        dispatcher.dispatch.delay('update_priority', self.signal.pk,
+                                  idempotency_key=idempotency_key)
+        dispatcher.dispatch.delay('update_priority', self.signal.pk,
+                                  idempotency_key=idempotency_key)
+
+        self.handler.assert_called_once_with(self.signal)
+        self.assertEqual(self.failing_handler.call_count, 2)
+        self.assertIsNotNone(OutboxEvent.objects.get().dispatched_at)
+
+    def test_dispatch_handler_keeps_failing(self):
+        self.failing_handler.side_effect = Exception
+        idempotency_key = 'update_priority_{}'.format(self.signal.priority.pk)
+        OutboxEvent.objects.create(event='update_priority', kwargs={},
+                                   idempotency_key=idempotency_key)
+
+        dispatcher.dispatch.delay('update_priority', self.signal.pk,
+                                  idempotency_key=idempotency_key)
+
+        self.assertEqual(self.failing_handler.call_count, dispatcher.DISPATCH_MAX_RETRIES + 1)
+        self.handler.assert_called_once_with(self.signal)
+
+        # The event was not dispatched, it is not skipped when it is delivered again
+        self.assertIsNone(OutboxEvent.objects.get().dispatched_at)
+        self.failing_handler.side_effect = None
+        dispatcher.dispatch.delay('update_priority', self.signal.pk,
+                                  idempotency_key=idempotency_key)
+        self.assertIsNotNone(OutboxEvent.objects.get().dispatched_at)
+
+    def test_dispatch_signal_does_not_exist(self):
+        dispatcher.dispatch('update_priority', 999)
+        self.handler.assert_not_called()
+
+    @mock.patch('signals.apps.signals.signal_receivers.dispatcher.dispatch', autospec=True)
+    def test_receiver_queues_one_task(self, patched_dispatch):
+        update_priority.send_robust(sender=self.__class__, signal_obj=self.signal,
+                                    priority=self.signal.priority, prev_priority=None)
+
+        patched_dispatch.delay.assert_called_once_with(
+            'update_priority', self.signal.pk, status_id=None, prev_status_id=None,
+            idempotency_key='update_priority_{}'.format(self.signal.priority.pk))
+
+    @mock.patch('signals.apps.signals.signal_receivers.dispatcher.dispatch', autospec=True)
+    def test_receiver_no_handlers(self, patched_dispatch):
+        with mock.patch.dict('signals.apps.signals.dispatcher._handlers', {'update_status': []}):
+            update_status.send_robust(sender=self.__class__, signal_obj=self.signal,
+                                      status=self.signal.status, prev_status=None)
+
+        patched_dispatch.delay.assert_not_called()
@@ -1,10 +1,27 @@
 from unittest.mock import patch
 
+from django.contrib.gis.geos import Point
 from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
 from django.test import TestCase
+from django.utils import timezone
+from freezegun import freeze_time
 
-from signals.apps.signals.models import CategoryAssignment, Signal
-from tests.apps.signals.factories import CategoryFactory, SignalFactory
+from signals.apps.signals import workflow
+from signals.apps.signals.models import (
+    STADSDEEL_CENTRUM,
+    Category,
+    CategoryAssignment,
+    CategoryTranslation,
+    History,
+    OutboxEvent,
+    Priority,
+    Signal,
+    SignalReadModel
+)
+from tests.apps.signals.attachment_helpers import small_gif
+from tests.apps.signals.factories import CategoryFactory, ParentCategoryFactory, SignalFactory
 
 
 class TestSignalManager(TestCase):
@@ -44,3 +61,349 @@ class TestSignalManager(TestCase):
             )
 
         self.assertEqual(ve.exception.message, 'Category not found in data')
+
+
+class TestOutboxEvent(TestCase):
+    def setUp(self):
+        self.signal = SignalFactory.create(status__state=workflow.GEMELD)
+        self.status_data = {'state': workflow.BEHANDELING, 'text': 'In behandeling'}
+
+    def test_event_added_in_transaction(self):
+        status = Signal.actions.update_status(self.status_data, self.signal)
+
+        outbox_event = OutboxEvent.objects.get()
+        self.assertEqual(outbox_event.event, 'update_status')
+        self.assertEqual(outbox_event.idempotency_key, 'update_status_{}'.format(status.pk))
+        self.assertEqual(outbox_event.kwargs['signal_obj'], ['signals.Signal', self.signal.pk])
+        self.assertIsNone(outbox_event.processed_at)
+
+    def test_event_rolled_back(self):
+        with self.assertRaises(ValidationError):
+            with transaction.atomic():
+                Signal.actions.update_status(self.status_data, self.signal)
+                raise ValidationError('Rollback')
+
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_add_image(self):
+        attachments = [
+            Signal.actions.add_image(SimpleUploadedFile('image.gif', small_gif), self.signal)
+            for _ in range(2)
+        ]
+
+        # Every image is its own event, the second one is not skipped as already dispatched
+        keys = OutboxEvent.objects.filter(event='add_image').order_by('id').values_list(
+            'idempotency_key', flat=True)
+        self.assertEqual(list(keys), ['add_image_{}'.format(attachment.pk) for attachment in attachments])
+        self.assertEqual(OutboxEvent.objects.filter(event='add_attachment').count(), 2)
+
+    def test_add_same_event_twice(self):
+        to_send = [('create_initial', {'signal_obj': self.signal})]
+        OutboxEvent.objects.add(to_send)
+        OutboxEvent.objects.add(to_send)
+
+        self.assertEqual(OutboxEvent.objects.count(), 1)
+
+    @patch('signals.apps.signals.managers.update_status', autospec=True)
+    def test_relay(self, patched_update_status):
+        signals = [self.signal] + SignalFactory.create_batch(2, status__state=workflow.GEMELD)
+        prev_status = signals[-1].status
+        for signal in signals:
+            status = Signal.actions.update_status(self.status_data, signal)
+
+        self.assertEqual(OutboxEvent.objects.relay(batch_size=2), 3)
+
+        self.assertEqual(patched_update_status.send_robust.call_count, 3)
+        patched_update_status.send_robust.assert_called_with(sender=Signal.actions.__class__,
+                                                             signal_obj=signals[-1],
+                                                             status=status,
+                                                             prev_status=prev_status)
+        self.assertFalse(OutboxEvent.objects.filter(processed_at__isnull=True).exists())
+
+        # Processed events are not sent again
+        self.assertEqual(OutboxEvent.objects.relay(), 0)
+        self.assertEqual(patched_update_status.send_robust.call_count, 3)
+
+    @patch('signals.apps.signals.managers.update_status', autospec=True)
+    def test_relay_receiver_failed(self, patched_update_status):
+        receiver = object()
+        patched_update_status.send_robust.side_effect = [[(receiver, Exception('Failed'))],
+                                                         [(receiver, None)]]
+        with freeze_time('2020-02-14 10:00:00'):
+            Signal.actions.update_status(self.status_data, self.signal)
+
+            # The event stays unprocessed and is not sent again before the backoff passed
+            self.assertEqual(OutboxEvent.objects.relay(backoff=60), 1)
+            outbox_event = OutboxEvent.objects.get()
+            self.assertIsNone(outbox_event.processed_at)
+            self.assertEqual(outbox_event.attempts, 1)
+            self.assertEqual(OutboxEvent.objects.relay(backoff=60), 0)
+
+        with freeze_time('2020-02-14 10:01:00'):
+            self.assertEqual(OutboxEvent.objects.relay(backoff=60), 1)
+
+        self.assertEqual(patched_update_status.send_robust.call_count, 2)
+        self.assertIsNotNone(OutboxEvent.objects.get().processed_at)
+
+    @patch('signals.apps.signals.managers.update_status', autospec=True)
+    def test_relay_dead_event(self, patched_update_status):
+        patched_update_status.send_robust.return_value = [(object(), Exception('Failed'))]
+        with freeze_time('2020-02-14 10:00:00'):
+            Signal.actions.update_status(self.status_data, self.signal)
+
+            with self.assertLogs('signals.apps.signals.managers', level='ERROR') as logs:
+                self.assertEqual(OutboxEvent.objects.relay(max_attempts=1), 1)
+            self.assertIn('is no longer sent', logs.output[-1])
+
+        with freeze_time('2020-02-15 10:00:00'):
+            self.assertEqual(OutboxEvent.objects.relay(max_attempts=1), 0)
+
+        self.assertEqual(list(OutboxEvent.objects.dead(max_attempts=1)), [OutboxEvent.objects.get()])
+
+    @patch('signals.apps.signals.managers.update_status', autospec=True)
+    def test_relay_claimed(self, patched_update_status):
+        with freeze_time('2020-02-14 10:00:00'):
+            Signal.actions.update_status(self.status_data, self.signal)
+
+            # A batch claimed by a relay that died is not sent before the claim expired
+            OutboxEvent.objects._claim_batch(batch_size=100, max_attempts=10, lease=300)
+            self.assertEqual(OutboxEvent.objects.relay(), 0)
+
+        with freeze_time('2020-02-14 10:05:00'):
+            self.assertEqual(OutboxEvent.objects.relay(), 1)
+
+        self.assertEqual(patched_update_status.send_robust.call_count, 1)
+        self.assertIsNotNone(OutboxEvent.objects.get().processed_at)
+
+    def test_purge(self):
+        with freeze_time('2020-02-14 10:00:00'):
+            Signal.actions.update_status(self.status_data, self.signal)
+            OutboxEvent.objects.update(processed_at=timezone.now())
+            Signal.actions.update_status({'state': workflow.AFGEHANDELD, 'text': 'Afgehandeld'},
+                                         self.signal)
+
+        with freeze_time('2020-02-21 10:00:01'):
+            self.assertEqual(OutboxEvent.objects.purge(days=7), 1)
+
+        # Unprocessed events are never purged
+        self.assertEqual(OutboxEvent.objects.get().event, 'update_status')
+        self.assertIsNone(OutboxEvent.objects.get().processed_at)
+
+
+class TestSignalReadModel(TestCase):
+    def setUp(self):
+        self.signal = SignalFactory.create()
+
+    def test_rebuild(self):
+        self.assertFalse(SignalReadModel.objects.exists())
+
+        SignalReadModel.objects.rebuild(batch_size=1)
+
+        read_model = SignalReadModel.objects.get(_signal=self.signal)
+        self.assertEqual(read_model.created_at, self.signal.created_at)
+        self.assertEqual(read_model.state, self.signal.status.state)
+        self.assertEqual(read_model.stadsdeel, self.signal.location.stadsdeel)
+        self.assertEqual(read_model.buurt_code, self.signal.location.buurt_code)
+        self.assertEqual(read_model.category_id, self.signal.category_assignment.category_id)
+        self.assertEqual(read_model.main_category_id,
+                         self.signal.category_assignment.category.parent_id)
+        self.assertEqual(read_model.priority, self.signal.priority.priority)
+        self.assertFalse(read_model.is_anonymous)
+
+    def test_update_status(self):
+        Signal.actions.update_status({'state': workflow.AFWACHTING}, self.signal)
+
+        read_model = SignalReadModel.objects.get(_signal=self.signal)
+        self.assertEqual(read_model.state, workflow.AFWACHTING)
+
+    def test_update_category_assignment(self):
+        category = CategoryFactory.create()
+        Signal.actions.update_category_assignment({'category': category}, self.signal)
+
+        read_model = SignalReadModel.objects.get(_signal=self.signal)
+        self.assertEqual(read_model.category_id, category.id)
+        self.assertEqual(read_model.category_slug, category.slug)
+        self.assertEqual(read_model.main_category_slug, category.parent.slug)
+
+    def test_category_moved(self):
+        SignalReadModel.objects.update_signals([self.signal.pk])
+        parent_category = ParentCategoryFactory.create()
+        category = self.signal.category_assignment.category
+        category.parent = parent_category
+        category.save()
+
+        read_model = SignalReadModel.objects.get(_signal=self.signal)
+        self.assertEqual(read_model.main_category_id, parent_category.id)
+        self.assertEqual(read_model.main_category_slug, parent_category.slug)
+
+    def test_rebuild_after_queryset_update(self):
+        SignalReadModel.objects.update_signals([self.signal.pk])
+        Category.objects.filter(pk=self.signal.category_assignment.category_id).update(
+            slug='updated')
+
+        SignalReadModel.objects.rebuild()
+        self.assertEqual(SignalReadModel.objects.get(_signal=self.signal).category_slug, 'updated')
+
+    def test_update_reporter(self):
+        Signal.actions.update_reporter({'email': '', 'phone': ''}, self.signal)
+
+        read_model = SignalReadModel.objects.get(_signal=self.signal)
+        self.assertTrue(read_model.is_anonymous)
+
+    def test_update_multiple(self):
+        Signal.actions.update_multiple({
+            'location': {'geometrie': self.signal.location.geometrie,
+                         'stadsdeel': STADSDEEL_CENTRUM},
+            'priority': {'priority': Priority.PRIORITY_HIGH},
+        }, self.signal)
+
+        read_model = SignalReadModel.objects.get(_signal=self.signal)
+        self.assertEqual(read_model.stadsdeel, STADSDEEL_CENTRUM)
+        self.assertEqual(read_model.priority, Priority.PRIORITY_HIGH)
+
+
+class TestHistory(TestCase):
+    def setUp(self):
+        self.signal = SignalFactory.create()
+
+    def test_entries_added_on_write(self):
+        self.assertEqual(
+            set(History.objects.filter(_signal=self.signal).values_list('what', flat=True)),
+            {'UPDATE_STATUS', 'UPDATE_LOCATION', 'UPDATE_CATEGORY_ASSIGNMENT', 'UPDATE_PRIORITY'}
+        )
+
+        note = Signal.actions.create_note({'text': 'Notitie'}, self.signal)
+
+        entry = History.objects.get(identifier=f'CREATE_NOTE_{note.id}')
+        self.assertEqual(entry._signal_id, self.signal.id)
+        self.assertEqual(entry.when, note.created_at)
+        self.assertEqual(entry.description, 'Notitie')
+
+    def test_location_description_stored(self):
+        location = self.signal.location
+        entry = History.objects.get(identifier=f'UPDATE_LOCATION_{location.id}')
+
+        self.assertIsNotNone(entry.description)
+        self.assertEqual(entry.get_description(), entry.description)
+
+    def test_entries_are_append_only(self):
+        entry = History.objects.filter(_signal=self.signal).first()
+
+        with self.assertRaises(NotImplementedError):
+            entry.save()
+        with self.assertRaises(NotImplementedError):
+            entry.delete()
+
+    def test_backfill(self):
+        expected = {entry.identifier: entry.description
+                    for entry in History.objects.filter(_signal=self.signal)}
+        History.objects.all().delete()
+
+        self.assertEqual(History.objects.backfill(batch_size=1), len(expected))
+        self.assertEqual(History.objects.backfill(), 0)
+        self.assertTrue(History.objects.filter(description__isnull=True,
+                                               what='UPDATE_LOCATION').exists())
+
+        self.assertEqual(History.objects.fill_descriptions(), 1)
+        self.assertEqual(
+            {entry.identifier: entry.description
+             for entry in History.objects.filter(_signal=self.signal)},
+            expected
+        )
+
+
+class TestCategoryTranslation(TestCase):
+    def setUp(self):
+        self.old_category = CategoryFactory.create(name='old category')
+        self.new_category = CategoryFactory.create(name='new category')
+
+        self.signal_data = {
+            'text': 'text message',
+            'text_extra': 'test message extra',
+            'incident_date_start': timezone.now(),
+        }
+        self.location_data = {
+            'geometrie': Point(4.898466, 52.361585),
+            'stadsdeel': STADSDEEL_CENTRUM,
+            'buurt_code': 'aaa1',
+        }
+        self.reporter_data = {
+            'email': 'test_reporter@example.com',
+            'phone': '0123456789',
+        }
+        self.status_data = {
+            'state': workflow.GEMELD,
+            'text': 'text message',
+            'user': 'test@example.com',
+        }
+
+    def _create_translation(self):
+        CategoryTranslation.objects.create(
+            created_by='somebody@example.com',
+            old_category=self.old_category,
+            new_category=self.new_category,
+            text='WAAROM? DAAROM!',
+        )
+
+    def _create_initial(self):
+        return Signal.actions.create_initial(
+            signal_data=self.signal_data,
+            location_data=self.location_data,
+            status_data=self.status_data,
+            category_assignment_data={'category': self.old_category},
+            reporter_data=self.reporter_data,
+        )
+
+    def _split(self):
+        signal = SignalFactory.create()
+        split_data = [{'text': 'Test', 'category': {'sub_category': self.old_category}}]
+        Signal.actions.split(split_data=split_data, signal=signal)
+        return signal.children.get()
+
+    def test_translation_happens(self):
+        self._create_translation()
+
+        signal = self._create_initial()
+
+        signal.refresh_from_db()
+        self.assertEqual(signal.category_assignment.category, self.new_category)
+        self.assertEqual(signal.category_assignment.text, 'WAAROM? DAAROM!')
+        self.assertIsNone(signal.category_assignment.created_by)
+        self.assertEqual(CategoryAssignment.objects.filter(_signal=signal).count(), 1)
+        self.assertEqual(list(OutboxEvent.objects.values_list('event', flat=True)),
+                         ['create_initial'])
+
+    def test_translation_skipped_category_not_in_translations(self):
+        signal = self._create_initial()
+
+        signal.refresh_from_db()
+        self.assertEqual(signal.category_assignment.category, self.old_category)
+        self.assertEqual(CategoryAssignment.objects.filter(_signal=signal).count(), 1)
+
+    def test_translation_happens_bulk(self):
+        self._create_translation()
+
+        signals = Signal.actions.create_initial_bulk([{
+            'signal_data': self.signal_data,
+            'location_data': self.location_data,
+            'status_data': self.status_data,
+            'category_assignment_data': {'category': self.old_category},
+            'reporter_data': self.reporter_data,
+        }])
+
+        self.assertEqual(CategoryAssignment.objects.get(_signal=signals[0]).category,
+                         self.new_category)
+
+    def test_translation_happens_split(self):
+        self._create_translation()
+
+        child_signal = self._split()
+
+        self.assertEqual(child_signal.category_assignment.category, self.new_category)
+        self.assertEqual(CategoryAssignment.objects.filter(_signal=child_signal).count(), 1)
+
+    def test_translation_skipped_category_not_in_translations_split(self):
+        child_signal = self._split()
+
+        self.assertEqual(child_signal.category_assignment.category, self.old_category)
+        self.assertEqual(CategoryAssignment.objects.filter(_signal=child_signal).count(), 1)
@@ -1,3 +1,4 @@
+import hashlib
 import os
 from unittest import mock
 
@@ -100,6 +101,40 @@ class TestSignalManager(TransactionTestCase):
 
         self.assertEqual(signal.priority.priority, Priority.PRIORITY_HIGH)
 
+    @mock.patch('signals.apps.signals.managers.create_initial', autospec=True)
+    def test_create_initial_bulk(self, patched_create_initial):
+        signals_data = [{
+            'signal_data': dict(self.signal_data, text='text message {}'.format(i)),
+            'location_data': self.location_data,
+            'status_data': self.status_data,
+            'category_assignment_data': self.category_assignment_data,
+            'reporter_data': self.reporter_data,
+            'priority_data': self.priority_data,
+        } for i in range(3)]
+
+        signals = Signal.actions.create_initial_bulk(signals_data)
+
+        self.assertEqual(Signal.objects.count(), 3)
+        self.assertEqual(Location.objects.count(), 3)
+        self.assertEqual(Status.objects.count(), 3)
+        self.assertEqual(CategoryAssignment.objects.count(), 3)
+        self.assertEqual(Reporter.objects.count(), 3)
+        self.assertEqual(Priority.objects.count(), 3)
+
+        for i, signal in enumerate(signals):
+            signal.refresh_from_db()
+            self.assertEqual(signal.text, 'text message {}'.format(i))
+            self.assertEqual(signal.location._signal_id, signal.id)
+            self.assertEqual(signal.status.state, workflow.GEMELD)
+            self.assertEqual(signal.category_assignment._signal_id, signal.id)
+            self.assertEqual(signal.reporter.email, 'test_reporter@example.com')
+            self.assertEqual(signal.priority.priority, Priority.PRIORITY_HIGH)
+
+        # Check that we sent the correct Django signals
+        self.assertEqual(patched_create_initial.send_robust.call_count, 3)
+        patched_create_initial.send_robust.assert_called_with(sender=Signal.actions.__class__,
+                                                              signal_obj=signals[-1])
+
     @mock.patch('signals.apps.signals.managers.update_location', autospec=True)
     def test_update_location(self, patched_update_location):
         signal = factories.SignalFactory.create()
@@ -146,6 +181,42 @@ class TestSignalManager(TransactionTestCase):
             status=status,
             prev_status=prev_status)
 
+    @mock.patch('signals.apps.signals.managers.update_status', autospec=True)
+    def test_update_status_bulk(self, patched_update_status):
+        signals = factories.SignalFactory.create_batch(3, status__state=workflow.GEMELD)
+        closed_signal = factories.SignalFactory.create(status__state=workflow.AFGEHANDELD)
+
+        data = {
+            'state': workflow.BEHANDELING,
+            'text': 'In behandeling genomen',
+        }
+        updated = Signal.actions.update_status_bulk(data, Signal.objects.all())
+
+        self.assertEqual(sorted(signal.id for signal in updated),
+                         sorted(signal.id for signal in signals))
+        for signal in signals:
+            signal.refresh_from_db()
+            self.assertEqual(signal.status.state, workflow.BEHANDELING)
+            self.assertEqual(signal.status.text, 'In behandeling genomen')
+            self.assertEqual(signal.statuses.count(), 2)
+
+        # A closed signal cannot be taken into treatment
+        closed_signal.refresh_from_db()
+        self.assertEqual(closed_signal.status.state, workflow.AFGEHANDELD)
+        self.assertEqual(closed_signal.statuses.count(), 1)
+
+        # Check that we sent the correct Django signals
+        self.assertEqual(patched_update_status.send_robust.call_count, 3)
+
+    def test_update_status_bulk_invalid_data(self):
+        factories.SignalFactory.create(status__state=workflow.BEHANDELING)
+
+        # Closing a signal requires a text
+        with self.assertRaises(ValidationError):
+            Signal.actions.update_status_bulk({'state': workflow.AFGEHANDELD},
+                                              Signal.objects.all())
+        self.assertEqual(Status.objects.filter(state=workflow.AFGEHANDELD).count(), 0)
+
     @mock.patch('signals.apps.signals.managers.update_category_assignment', autospec=True)
     def test_update_category_assignment(self, patched_update_category_assignment):
         signal = factories.SignalFactory.create()
@@ -324,7 +395,7 @@ class TestSignalModel(TestCase):
 
         self.assertEqual('http://localhost:8000{}'.format(signal.image_crop.url), image_url)
 
-    @mock.patch('imagekit.cachefiles.ImageCacheFile.url', new_callable=mock.PropertyMock)
+    @mock.patch('django.db.models.fields.files.FieldFile.url', new_callable=mock.PropertyMock)
     @mock.patch('signals.apps.signals.models.signal.isinstance', return_value=True)
     def test_get_fqdn_image_crop_url_with_swift_image(self, mocked_isinstance, mocked_url):
         mocked_url.return_value = 'https://objectstore.com/url/coming/from/swift/image.jpg'
@@ -681,8 +752,15 @@ class TestAttachmentModel(LiveServerTestCase):
         attachment.mimetype = "image/gif"
         attachment.save()
 
+        # The original image is used until the renditions are generated
+        self.assertEqual(attachment.image_crop.url, attachment.file.url)
+
+        attachment.generate_renditions()
+
         self.assertIsInstance(attachment.image_crop.url, str)
         self.assertTrue(attachment.image_crop.url.endswith(".jpg"))
+        self.assertTrue(attachment.thumbnail.name.endswith('_thumbnail.jpg'))
+        self.assertTrue(attachment.pdf_image.name.endswith('_pdf_image.jpg'))
 
         resp = requests.get(self.live_server_url + attachment.file.url)
         self.assertEqual(200, resp.status_code, "Original image is not reachable")
@@ -743,6 +821,57 @@ class TestAttachmentModel(LiveServerTestCase):
         resp = requests.get(self.live_server_url + attachment.file.url)
         self.assertEqual(200, resp.status_code, "Original file is not reachable")
 
+    def test_duplicate_upload_reuses_stored_file(self):
+        attachment = Attachment.objects.create(_signal=self.signal, file=self.gif_upload)
+
+        sha256 = hashlib.sha256(small_gif).hexdigest()
+        self.assertEqual(attachment.sha256, sha256)
+        self.assertEqual(attachment.file.name, 'attachments/{}/{}.gif'.format(sha256[:2], sha256))
+
+        other_signal = factories.SignalFactory.create()
+        duplicate = Attachment.objects.create(
+            _signal=other_signal,
+            file=SimpleUploadedFile('other.gif', small_gif, content_type='image/gif')
+        )
+
+        self.assertEqual(duplicate.sha256, sha256)
+        self.assertEqual(duplicate.file.name, attachment.file.name)
+        self.assertTrue(duplicate.is_image)
+        self.assertEqual(duplicate.mimetype, 'image/gif')
+
+    @mock.patch('signals.apps.signals.tasks.generate_attachment_renditions', autospec=True)
+    def test_add_attachment_generates_renditions(self, patched_generate_attachment_renditions):
+        attachment = Signal.actions.add_attachment(self.gif_upload, self.signal)
+
+        patched_generate_attachment_renditions.delay.assert_called_once_with(
+            attachment_id=attachment.pk)
+
+    def test_renditions_shared_by_digest(self):
+        attachment = Attachment.objects.create(_signal=self.signal, file=self.gif_upload)
+        attachment.generate_renditions()
+
+        other_signal = factories.SignalFactory.create()
+        duplicate = Attachment.objects.create(
+            _signal=other_signal,
+            file=SimpleUploadedFile('other.gif', small_gif, content_type='image/gif')
+        )
+        duplicate.generate_renditions()
+
+        for field_name, _ in Attachment.RENDITIONS:
+            self.assertEqual(getattr(duplicate, field_name).name,
+                             getattr(attachment, field_name).name)
+
+    def test_copy_to(self):
+        attachment = Attachment.objects.create(_signal=self.signal, file=self.gif_upload)
+
+        other_signal = factories.SignalFactory.create()
+        copy = attachment.copy_to(other_signal)
+
+        self.assertEqual(copy._signal, other_signal)
+        self.assertEqual(copy.file.name, attachment.file.name)
+        self.assertEqual(copy.sha256, attachment.sha256)
+        self.assertTrue(copy.is_image)
+
 
 class TestCategoryTranslation(TestCase):
     def setUp(self):
@@ -1,140 +1,83 @@
-from django.contrib.gis.geos import Point
 from django.test import TransactionTestCase
-from django.utils import timezone
 
-from signals.apps.signals import workflow
-from signals.apps.signals.models.category_assignment import CategoryAssignment
-from signals.apps.signals.models.category_translation import CategoryTranslation
-from signals.apps.signals.models.location import STADSDEEL_CENTRUM
-from signals.apps.signals.models.priority import Priority
 from signals.apps.signals.models.signal import Signal
+from signals.apps.signals.tasks import (
+    copy_attachments_to_split_signal,
+    generate_attachment_renditions
+)
 from tests.apps.signals import factories
 
 
-class TestTaskTranslateCategory(TransactionTestCase):
+class TestTaskCopyAttachmentsToSplitSignal(TransactionTestCase):
     def setUp(self):
-        self.test_category_old = factories.CategoryFactory.create()
-        self.test_category_old.name = 'old category'
-        self.test_category_old.save()
-        self.test_category_new = factories.CategoryFactory.create()
-        self.test_category_new.name = 'new category'
-        self.test_category_new.save()
-
-        # Deserialized data (taken from test_models.py)
-        self.signal_data = {
-            'text': 'text message',
-            'text_extra': 'test message extra',
-            'incident_date_start': timezone.now(),
-        }
-        self.location_data = {
-            'geometrie': Point(4.898466, 52.361585),
-            'stadsdeel': STADSDEEL_CENTRUM,
-            'buurt_code': 'aaa1',
-        }
-        self.reporter_data = {
-            'email': 'test_reporter@example.com',
-            'phone': '0123456789',
-        }
-        self.category_assignment_data = {
-            'category': self.test_category_old,
-        }
-        self.status_data = {
-            'state': workflow.GEMELD,
-            'text': 'text message',
-            'user': 'test@example.com',
-        }
-        self.priority_data = {
-            'priority': Priority.PRIORITY_HIGH,
-        }
-        self.note_data = {
-            'text': 'Dit is een test notitie.',
-            'created_by': 'test@example.com',
-        }
-
-    def test_translation_happens(self):
-        CategoryTranslation.objects.create(
-            created_by='somebody@example.com',
-            old_category=self.test_category_old,
-            new_category=self.test_category_new,
-            text='WAAROM? DAAROM!',
-        )
-
-        signal = Signal.actions.create_initial(
-            signal_data=self.signal_data,
-            location_data=self.location_data,
-            status_data=self.status_data,
-            category_assignment_data=self.category_assignment_data,
-            reporter_data=self.reporter_data,
-            priority_data=self.priority_data,
-        )
-
-        signal.refresh_from_db()
-        self.assertEqual(signal.category_assignment.category, self.test_category_new)
-
-        cats = CategoryAssignment.objects.filter(_signal=signal)
-        self.assertEqual(cats.count(), 2)
-
-    def test_translation_skipped_category_not_in_translations(self):
-        signal = Signal.actions.create_initial(
-            signal_data=self.signal_data,
-            location_data=self.location_data,
-            status_data=self.status_data,
-            category_assignment_data=self.category_assignment_data,
-            reporter_data=self.reporter_data,
-            priority_data=self.priority_data,
-        )
-
-        signal.refresh_from_db()
-        self.assertEqual(signal.category_assignment.category, self.test_category_old)
-
-        cats = CategoryAssignment.objects.filter(_signal=signal)
-        self.assertEqual(cats.count(), 1)
-
-    def test_translation_happens_split(self):
-        CategoryTranslation.objects.create(
-            created_by='somebody@example.com',
-            old_category=self.test_category_old,
-            new_category=self.test_category_new,
-            text='WAAROM? DAAROM!',
-        )
-
-        signal = factories.SignalFactory.create()
+        self.parent_signal = factories.SignalFactoryWithImage.create()
+        self.category = factories.CategoryFactory.create()
 
+    def test_copy_attachments_after_split(self):
         split_data = [
             {
-                'text': 'Test',
-                'category': {
-                    'sub_category': self.test_category_old,
-                }
+                'text': 'Child #1',
+                'reuse_parent_image': True,
+                'category': {'sub_category': self.category},
+            },
+            {
+                'text': 'Child #2',
+                'category': {'sub_category': self.category},
             }
         ]
+        Signal.actions.split(split_data=split_data, signal=self.parent_signal)
+
+        child_1, child_2 = self.parent_signal.children.order_by('id')
+
+        # The copy shares the stored file of the parent image
+        self.assertEqual(child_1.attachments.filter(is_image=True).count(), 1)
+        self.assertEqual(child_1.attachments.first().file.name,
+                         self.parent_signal.attachments.first().file.name)
+        self.assertEqual(
+            list(child_1.notes.order_by('id').values_list('text', flat=True)),
+            ['Afbeeldingen van de hoofdmelding worden gekopieerd.',
+             '1 van 1 afbeelding(en) van de hoofdmelding gekopieerd.']
+        )
 
-        signal = Signal.actions.split(split_data=split_data, signal=signal)
-        signal.refresh_from_db()
+        self.assertEqual(child_2.attachments.count(), 0)
+        self.assertEqual(child_2.notes.count(), 0)
 
-        child_signal = signal.children.first()
+    def test_copy_attachments_file_not_found(self):
+        child_signal = factories.SignalFactory.create(parent=self.parent_signal)
+        parent_image = self.parent_signal.attachments.first()
+        parent_image.file.storage.delete(parent_image.file.name)
 
-        self.assertEqual(child_signal.category_assignment.category, self.test_category_new)
+        copied = copy_attachments_to_split_signal(signal_id=child_signal.pk,
+                                                  attachment_ids=[parent_image.pk])
 
-        cats = CategoryAssignment.objects.filter(_signal=child_signal)
-        self.assertEqual(cats.count(), 2)
+        self.assertEqual(copied, 0)
+        self.assertEqual(child_signal.attachments.count(), 0)
+        self.assertEqual(child_signal.notes.count(), 0)
 
-    def test_translation_skipped_category_not_in_translations_split(self):
-        signal = factories.SignalFactory.create()
+    def test_copy_attachments_again(self):
+        child_signal = factories.SignalFactory.create(parent=self.parent_signal)
+        attachment_ids = [self.parent_signal.attachments.first().pk]
 
-        split_data = [
-            {
-                'text': 'Test',
-                'category': {
-                    'sub_category': self.test_category_old,
-                }
-            }
-        ]
-        signal = Signal.actions.split(split_data=split_data, signal=signal)
-        signal.refresh_from_db()
-        child_signal = signal.children.first()
+        self.assertEqual(copy_attachments_to_split_signal(signal_id=child_signal.pk,
+                                                          attachment_ids=attachment_ids), 1)
+        # A retry or redelivery of the task does not copy the image or add the note again
+        self.assertEqual(copy_attachments_to_split_signal(signal_id=child_signal.pk,
+                                                          attachment_ids=attachment_ids), 0)
+
+        self.assertEqual(child_signal.attachments.count(), 1)
+        self.assertEqual(list(child_signal.notes.values_list('text', flat=True)),
+                         ['1 van 1 afbeelding(en) van de hoofdmelding gekopieerd.'])
+
+
+class TestTaskGenerateAttachmentRenditions(TransactionTestCase):
+    def test_generate_attachment_renditions(self):
+        signal = factories.SignalFactoryWithImage.create()
+        attachment = signal.attachments.first()
 
-        self.assertEqual(child_signal.category_assignment.category, self.test_category_old)
+        generate_attachment_renditions(attachment_id=attachment.pk)
 
-        cats = CategoryAssignment.objects.filter(_signal=child_signal)
-        self.assertEqual(cats.count(), 1)
+        attachment.refresh_from_db()
+        self.assertTrue(attachment.thumbnail)
+        self.assertTrue(attachment.cropped_image)
+        self.assertTrue(attachment.pdf_image)
+        self.assertEqual(attachment.image_crop, attachment.cropped_image)
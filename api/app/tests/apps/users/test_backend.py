@@ -1,11 +1,13 @@
 from unittest import mock
 
 from django.conf import settings
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
 from django.test import TestCase
 from rest_framework import exceptions
 
 from signals.auth import backend
-from tests.apps.users.factories import SuperUserFactory, UserFactory
+from tests.apps.users.factories import GroupFactory, SuperUserFactory, UserFactory
 
 
 class TestJWTAuthBackend(TestCase):
@@ -135,3 +137,45 @@ class TestJWTAuthBackend(TestCase):
         user, scope = jwt_auth_backend.authenticate(mocked_request)
         self.assertEqual(user, test_user)
         self.assertEqual(scope, 'SIG/ALL')
+
+
+class TestJWTAuthBackendCache(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory.create(username='normie@example.com', email='normie@example.com')
+        self.group = GroupFactory.create(name='Test group')
+        self.user.groups.add(self.group)
+        self.read_permission = Permission.objects.get(codename='sia_read')
+
+        self.request = mock.Mock()
+        self.request.is_authorized_for.return_value = True
+        self.request.get_token_subject = 'normie@example.com'
+
+    def authenticate(self):
+        user, _ = backend.JWTAuthBackend().authenticate(self.request)
+        return user
+
+    def test_cached_with_permissions(self):
+        self.group.permissions.add(self.read_permission)
+        self.authenticate()
+
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+            self.assertTrue(user.has_perm('signals.sia_read'))
+            self.assertEqual(user.profile.user_id, self.user.pk)
+
+    def test_group_permissions_changed(self):
+        self.assertFalse(self.authenticate().has_perm('signals.sia_read'))
+
+        self.group.permissions.add(self.read_permission)
+        self.assertTrue(self.authenticate().has_perm('signals.sia_read'))
+
+        self.user.groups.remove(self.group)
+        self.assertFalse(self.authenticate().has_perm('signals.sia_read'))
+
+    def test_user_saved(self):
+        self.authenticate()
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertFalse(self.authenticate().is_active)
@@ -32,4 +32,6 @@ class CaseDocumentFactory(factory.DjangoModelFactory):
         model = "zds.CaseDocument"
 
     case_signal = factory.SubFactory(CaseSignalFactory)
+    attachment = factory.LazyAttribute(
+        lambda obj: obj.case_signal.signal.attachments.filter(is_image=True).first())
     drc_link = 'http://amsterdam.nl/'
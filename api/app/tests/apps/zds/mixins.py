@@ -1,5 +1,10 @@
 import os
 
+from django.core.cache import cache
+
+from signals.apps.zds import zds_client
+from signals.apps.zds.tasks import STATUS_TYPES_CACHE_KEY
+
 
 class ZDSMockMixin(object):
     """This will help with writing mocks for the ZDS compoments.
@@ -13,6 +18,10 @@ class ZDSMockMixin(object):
     post_error_mock()
     """
     def setUp(self):
+        # Every test mocks the schemas and statustypes it needs
+        zds_client.reset()
+        cache.delete(STATUS_TYPES_CACHE_KEY)
+
         self.dir_path = os.path.dirname(os.path.realpath(__file__))
         self.files_path = os.path.join(self.dir_path, 'files')
 
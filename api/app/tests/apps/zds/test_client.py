@@ -1,6 +1,13 @@
+import base64
+import json
+from unittest import mock
+
+from django.conf import settings
+from django.core.files.base import ContentFile
 from django.test import TestCase
 
 from signals.apps.zds import zds_client
+from signals.apps.zds.client import RateLimiter, iter_base64, iter_json
 
 
 class TestZDSClient(TestCase):
@@ -13,3 +20,63 @@ class TestZDSClient(TestCase):
 
     def test_get_correct_ztc_client(self):
         self.assertEqual(zds_client.ztc.base_url, zds_client.get_client('ztc').base_url)
+
+    def test_clients_are_reused(self):
+        zrc_client = zds_client.zrc
+        self.assertIs(zds_client.zrc, zrc_client)
+        self.assertEqual(zrc_client.timeout, settings.ZDS_TIMEOUT)
+
+        zds_client.reset()
+        self.assertIsNot(zds_client.zrc, zrc_client)
+
+
+class TestRateLimiter(TestCase):
+    @mock.patch('signals.apps.zds.client.time')
+    def test_wait(self, mocked_time):
+        mocked_time.monotonic.return_value = 100.0
+        rate_limiter = RateLimiter(rate=10)
+
+        rate_limiter.wait('zrc.example.com')
+        mocked_time.sleep.assert_not_called()
+
+        rate_limiter.wait('zrc.example.com')
+        rate_limiter.wait('zrc.example.com')
+        self.assertEqual(mocked_time.sleep.call_count, 2)
+        self.assertAlmostEqual(mocked_time.sleep.call_args_list[0][0][0], 0.1)
+        self.assertAlmostEqual(mocked_time.sleep.call_args_list[1][0][0], 0.2)
+
+        # Other hosts are limited separately
+        rate_limiter.wait('drc.example.com')
+        self.assertEqual(mocked_time.sleep.call_count, 2)
+
+    @mock.patch('signals.apps.zds.client.time')
+    def test_no_limit(self, mocked_time):
+        rate_limiter = RateLimiter(rate=0)
+        rate_limiter.wait('zrc.example.com')
+        rate_limiter.wait('zrc.example.com')
+        mocked_time.sleep.assert_not_called()
+
+
+class TestStreaming(TestCase):
+    def test_iter_base64(self):
+        content = bytes(range(256)) * 3
+        chunks = list(iter_base64(ContentFile(content), chunk_size=64))
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(b''.join(chunks), base64.b64encode(content))
+
+    def test_iter_base64_short_chunks(self):
+        content = b'abcdefgh'
+        file = ContentFile(content)
+        # A storage backend returning chunks that are not a multiple of 3 bytes
+        with mock.patch.object(file, 'chunks', return_value=iter([b'abcd', b'efgh'])):
+            self.assertEqual(b''.join(iter_base64(file)), base64.b64encode(content))
+
+    def test_iter_json(self):
+        content = b'image data'
+        body = b''.join(iter_json({'titel': 'image.jpg'}, 'inhoud', ContentFile(content)))
+
+        self.assertEqual(json.loads(body.decode()), {
+            'titel': 'image.jpg',
+            'inhoud': base64.b64encode(content).decode(),
+        })
@@ -2,7 +2,7 @@ from io import StringIO
 
 import requests_mock
 from django.core.management import call_command
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
 from freezegun import freeze_time
 
 from signals.apps.zds.models import CaseSignal
@@ -38,6 +38,7 @@ class TestCommand(ZDSMockMixin, TestCase):
         self.assertEqual(self.err.getvalue(), '')
         self.assertEqual(CaseSignal.objects.count(), 1)
         self.assertIsNotNone(signal.case)
+        self.assertEqual(signal.case.sync_state, CaseSignal.SYNC_COMPLETED)
 
     @requests_mock.Mocker()
     def test_with_signal_with_image(self, mock):
@@ -71,3 +72,29 @@ class TestCommand(ZDSMockMixin, TestCase):
         self.call_management_command()
         self.assertEqual(self.out.getvalue(), '')
         self.assertNotEqual(self.err.getvalue(), '')
+
+        # The case is retried after a backoff
+        case_signal = CaseSignal.objects.get()
+        self.assertEqual(case_signal.sync_state, CaseSignal.SYNC_NEW)
+        self.assertEqual(case_signal.sync_attempts, 1)
+        self.assertIsNotNone(case_signal.next_sync_at)
+
+
+class TestCommandWorkers(ZDSMockMixin, TransactionTestCase):
+    @requests_mock.Mocker()
+    def test_with_workers(self, mock):
+        self.get_mock(mock, 'zrc_openapi')
+        self.get_mock(mock, 'ztc_openapi')
+        self.get_mock(mock, 'ztc_statustypen_list')
+        self.post_mock(mock, 'zrc_zaak_create')
+        self.post_mock(mock, 'zrc_zaakobject_create')
+        self.post_mock(mock, 'zrc_status_create')
+
+        with freeze_time("2018-01-14"):
+            SignalFactory.create_batch(3)
+        self.err = StringIO()
+        call_command('sync_zds', '--workers', '2', '--batch-size', '2', stderr=self.err)
+
+        self.assertEqual(self.err.getvalue(), '')
+        self.assertEqual(CaseSignal.objects.filter(sync_state=CaseSignal.SYNC_COMPLETED).count(),
+                         3)
@@ -1,6 +1,8 @@
 from django.test import TestCase
+from django.utils import timezone
+from freezegun import freeze_time
 
-from signals.apps.zds.models import CaseDocument, CaseSignal
+from signals.apps.zds.models import CaseDocument, CaseSignal, SyncCheckpoint
 from tests.apps.signals.factories import SignalFactory
 from tests.apps.zds.factories import CaseSignalFactory
 
@@ -17,3 +19,58 @@ class TestCaseSignalManager(TestCase):
         self.assertEqual(CaseDocument.objects.count(), 0)
         case_signal = CaseSignalFactory()
         CaseSignal.actions.add_document(case_signal)
+
+    def test_create_case_signals(self):
+        signals = SignalFactory.create_batch(2)
+        CaseSignal.actions.create_case_signals([signal.pk for signal in signals])
+        self.assertEqual(CaseSignal.objects.filter(sync_state=CaseSignal.SYNC_NEW).count(), 2)
+
+    def test_sync_failed(self):
+        case_signal = CaseSignalFactory()
+
+        with freeze_time('2020-02-12 12:00:00'):
+            CaseSignal.actions.sync_failed(case_signal, max_attempts=3, backoff=60)
+            self.assertEqual(case_signal.next_sync_at,
+                             timezone.now() + timezone.timedelta(seconds=60))
+            self.assertFalse(CaseSignal.actions.pending().exists())
+
+            CaseSignal.actions.sync_failed(case_signal, max_attempts=3, backoff=60)
+            self.assertEqual(case_signal.next_sync_at,
+                             timezone.now() + timezone.timedelta(seconds=120))
+
+        with freeze_time('2020-02-12 12:05:00'):
+            self.assertEqual(list(CaseSignal.actions.pending()), [case_signal])
+
+            CaseSignal.actions.sync_failed(case_signal, max_attempts=3, backoff=60)
+            self.assertEqual(case_signal.sync_state, CaseSignal.SYNC_FAILED)
+            self.assertEqual(case_signal.sync_attempts, 3)
+            self.assertFalse(CaseSignal.actions.pending().exists())
+
+    def test_create_missing_case_signals(self):
+        with freeze_time('2020-02-12 12:00:00'):
+            old_signals = SignalFactory.create_batch(3)
+        CaseSignalFactory(signal=old_signals[1])
+        with freeze_time('2020-02-12 13:00:00'):
+            new_signal = SignalFactory()
+
+        with freeze_time('2020-02-12 12:30:00'):
+            created = CaseSignal.actions.create_missing_case_signals(timezone.now(), batch_size=2)
+        self.assertEqual(created, 2)
+        self.assertTrue(CaseSignal.objects.filter(signal=old_signals[0]).exists())
+        self.assertTrue(CaseSignal.objects.filter(signal=old_signals[2]).exists())
+        self.assertFalse(CaseSignal.objects.filter(signal=new_signal).exists())
+
+        # The next run continues after the checkpoint
+        self.assertEqual(SyncCheckpoint.objects.get(name='case_signals').value, old_signals[2].pk)
+        with freeze_time('2020-02-12 13:30:00'):
+            created = CaseSignal.actions.create_missing_case_signals(timezone.now())
+        self.assertEqual(created, 1)
+        self.assertTrue(CaseSignal.objects.filter(signal=new_signal).exists())
+
+    def test_create_missing_case_signals_full(self):
+        signal = SignalFactory()
+        SyncCheckpoint.objects.create(name='case_signals', value=signal.pk)
+
+        self.assertEqual(CaseSignal.actions.create_missing_case_signals(timezone.now()), 0)
+        self.assertEqual(
+            CaseSignal.actions.create_missing_case_signals(timezone.now(), full=True), 1)
@@ -3,6 +3,7 @@ from unittest import mock
 from django.test import TestCase
 
 from signals.apps.signals.managers import add_image, create_initial, update_status
+from signals.apps.zds.models import CaseSignal
 from tests.apps.signals.factories import SignalFactory, SignalFactoryWithImage, StatusFactory
 from tests.apps.zds.factories import CaseSignalFactory
 
@@ -18,30 +19,15 @@ class TestSignalReceivers(TestCase):
             signal_obj=signal,
         )
 
-        mocked_tasks.create_case.assert_called_once_with(signal=signal)
-        mocked_tasks.connect_signal_to_case.assert_called_once_with(signal=signal)
-        mocked_tasks.add_status_to_case.assert_called_once_with(signal=signal, status=signal.status)
-        mocked_tasks.create_document.assert_not_called()
-        mocked_tasks.add_document_to_case.assert_not_called()
-
-    @mock.patch('signals.apps.zds.signal_receivers.tasks', autospec=True)
-    def test_create_initial_handler_with_image(self, mocked_tasks):
-        signal = SignalFactoryWithImage.create()
-
-        create_initial.send_robust(
-            sender=self.__class__,
-            signal_obj=signal,
-        )
-
-        mocked_tasks.create_case.assert_called_once_with(signal=signal)
-        mocked_tasks.connect_signal_to_case.assert_called_once_with(signal=signal)
-        mocked_tasks.add_status_to_case.assert_called_once_with(signal=signal, status=signal.status)
-        mocked_tasks.create_document.assert_called_once_with(signal)
-        mocked_tasks.add_document_to_case.assert_called_once()
+        case_signal = CaseSignal.objects.get(signal=signal)
+        self.assertEqual(case_signal.sync_state, CaseSignal.SYNC_NEW)
+        mocked_tasks.sync_case.delay.assert_called_once_with(case_signal.pk)
 
     @mock.patch('signals.apps.zds.signal_receivers.tasks', autospec=True)
     def test_status_update_handler(self, mocked_tasks):
         signal = SignalFactory.create()
+        case_signal = CaseSignalFactory.create(signal=signal,
+                                               sync_state=CaseSignal.SYNC_COMPLETED)
         prev_status = signal.status
 
         new_status = StatusFactory.create(_signal=signal)
@@ -55,40 +41,24 @@ class TestSignalReceivers(TestCase):
             prev_status=prev_status,
         )
 
-        mocked_tasks.add_status_to_case.assert_called_once_with(signal=signal, status=signal.status)
-
-    def test_status_update_handler_object_does_not_exist(self):
-        signal = SignalFactory.create()
-        prev_status = signal.status
-
-        new_status = StatusFactory.create(_signal=signal)
-        signal.status = new_status
-        signal.save()
-
-        update_status.send_robust(
-            sender=self.__class__,
-            signal_obj=signal,
-            status=new_status,
-            prev_status=prev_status,
-        )
+        # The new status has to be added to the case
+        case_signal.refresh_from_db()
+        self.assertEqual(case_signal.sync_state, CaseSignal.SYNC_CONNECTED)
+        mocked_tasks.sync_case.delay.assert_called_once_with(case_signal.pk)
 
     @mock.patch('signals.apps.zds.signal_receivers.tasks', autospec=True)
-    def test_add_image_handler(self, mocked_tasks):
+    def test_add_image_handler_failed_case(self, mocked_tasks):
         signal = SignalFactoryWithImage.create()
-        CaseSignalFactory(signal=signal)
+        case_signal = CaseSignalFactory.create(signal=signal, sync_state=CaseSignal.SYNC_FAILED,
+                                               sync_attempts=5)
 
         add_image.send_robust(
             sender=self.__class__,
             signal_obj=signal,
         )
 
-        mocked_tasks.create_document.assert_called_once_with(signal)
-        mocked_tasks.add_document_to_case.assert_called_once()
-
-    def test_add_image_handler_no_case(self):
-        signal = SignalFactoryWithImage.create()
-
-        add_image.send_robust(
-            sender=self.__class__,
-            signal_obj=signal,
-        )
+        # A failed case starts over
+        case_signal.refresh_from_db()
+        self.assertEqual(case_signal.sync_state, CaseSignal.SYNC_NEW)
+        self.assertEqual(case_signal.sync_attempts, 0)
+        mocked_tasks.sync_case.delay.assert_called_once_with(case_signal.pk)
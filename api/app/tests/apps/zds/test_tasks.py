@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import requests_mock
 from django.core.exceptions import ObjectDoesNotExist
 from django.test import TestCase, override_settings
@@ -10,6 +12,7 @@ from signals.apps.zds.exceptions import (
     DocumentNotCreatedException,
     StatusNotCreatedException
 )
+from signals.apps.zds.models import CaseSignal
 from signals.apps.zds.tasks import (
     add_document_to_case,
     add_status_to_case,
@@ -22,9 +25,17 @@ from signals.apps.zds.tasks import (
     get_information_object,
     get_status,
     get_status_history,
-    get_status_type
+    get_status_type,
+    refresh_status_types,
+    sync_case,
+    sync_pending_cases
+)
+from tests.apps.signals.factories import (
+    ImageAttachmentFactory,
+    SignalFactory,
+    SignalFactoryWithImage,
+    StatusFactory
 )
-from tests.apps.signals.factories import SignalFactory, SignalFactoryWithImage
 from tests.apps.zds.factories import CaseDocumentFactory, CaseSignalFactory, CaseStatusFactory
 from tests.apps.zds.mixins import ZDSMockMixin
 
@@ -73,6 +84,19 @@ class TestTasks(ZDSMockMixin, TestCase):
             'volgnummer': 1
         })
 
+    @requests_mock.Mocker()
+    def test_get_status_cached(self, mock):
+        self.get_mock(mock, 'ztc_openapi')
+        statustypen_mock = self.get_mock(mock, 'ztc_statustypen_list')
+
+        self.assertEqual(get_status('Gemeld')['omschrijving'], 'Gemeld')
+        self.assertEqual(get_status('Done')['omschrijving'], 'Done')
+        self.assertEqual(statustypen_mock.call_count, 1)
+
+        refresh_status_types()
+        self.assertEqual(get_status('Gemeld')['omschrijving'], 'Gemeld')
+        self.assertEqual(statustypen_mock.call_count, 2)
+
     @requests_mock.Mocker()
     def test_get_status_no_match(self, mock):
         self.get_mock(mock, 'ztc_openapi')
@@ -162,6 +186,22 @@ class TestTasks(ZDSMockMixin, TestCase):
         case_signal = CaseSignalFactory()
         add_status_to_case(case_signal.signal, case_signal.signal.status)
 
+    @requests_mock.Mocker()
+    def test_add_status_to_case_one_request(self, mock):
+        self.get_mock(mock, 'zrc_openapi')
+        self.get_mock(mock, 'ztc_openapi')
+        self.get_mock(mock, 'ztc_statustypen_list')
+        self.post_mock(mock, 'zrc_status_create')
+
+        case_signal = CaseSignalFactory()
+        add_status_to_case(case_signal.signal, case_signal.signal.status)
+
+        # The schemas and statustypes are known, only the status is created
+        status = StatusFactory(_signal=case_signal.signal)
+        call_count = mock.call_count
+        add_status_to_case(case_signal.signal, status)
+        self.assertEqual(mock.call_count, call_count + 1)
+
     @requests_mock.Mocker()
     def test_add_status_to_case_status_already_exists(self, mock):
         self.get_mock(mock, 'zrc_openapi')
@@ -222,8 +262,24 @@ class TestTasks(ZDSMockMixin, TestCase):
 
         signal = SignalFactoryWithImage()
         case_signal = CaseSignalFactory(signal=signal)
-        CaseDocumentFactory(case_signal=case_signal)
-        create_document(signal)
+        case_document = CaseDocumentFactory(case_signal=case_signal)
+        self.assertEqual(create_document(signal), case_document)
+        self.assertFalse(mock.called)
+
+    @requests_mock.Mocker()
+    def test_create_document_every_image(self, mock):
+        self.get_mock(mock, 'drc_openapi')
+        self.post_mock(mock, 'drc_enkelvoudiginformatieobject_create')
+
+        signal = SignalFactoryWithImage()
+        ImageAttachmentFactory(_signal=signal)
+        case_signal = CaseSignalFactory(signal=signal)
+
+        for attachment in signal.attachments.all():
+            case_document = create_document(signal, attachment)
+            self.assertEqual(case_document.attachment, attachment)
+            self.assertIsNotNone(case_document.drc_link)
+        self.assertEqual(case_signal.documents.count(), 2)
 
     @requests_mock.Mocker()
     def test_create_document_with_error(self, mock):
@@ -418,3 +474,81 @@ class TestTasks(ZDSMockMixin, TestCase):
         documents = get_documents_from_case(case_document.case_signal.signal)
         response = get_information_object(documents[0].get('informatieobject'))
         self.assertIsNotNone(response)
+
+
+class TestSyncTasks(ZDSMockMixin, TestCase):
+    def mock_sync(self, mock):
+        self.get_mock(mock, 'zrc_openapi')
+        self.get_mock(mock, 'ztc_openapi')
+        self.get_mock(mock, 'ztc_statustypen_list')
+        self.post_mock(mock, 'zrc_zaak_create')
+        self.post_mock(mock, 'zrc_zaakobject_create')
+        self.post_mock(mock, 'zrc_status_create')
+        self.get_mock(mock, 'drc_openapi')
+        self.post_mock(mock, 'drc_enkelvoudiginformatieobject_create')
+        self.post_mock(mock, 'drc_objectinformatieobject_create')
+
+    @requests_mock.Mocker()
+    def test_sync_case(self, mock):
+        self.mock_sync(mock)
+
+        signal = SignalFactoryWithImage()
+        case_signal = CaseSignal.actions.request_sync(signal)
+        sync_case(case_signal.pk)
+
+        case_signal.refresh_from_db()
+        self.assertEqual(case_signal.sync_state, CaseSignal.SYNC_COMPLETED)
+        self.assertIsNotNone(case_signal.zrc_link)
+        self.assertTrue(case_signal.connected_in_external_system)
+        self.assertIsNotNone(case_signal.statusses.get(status=signal.status).zrc_link)
+        self.assertTrue(case_signal.documents.get().connected_in_external_system)
+
+    @requests_mock.Mocker()
+    def test_sync_case_completed(self, mock):
+        case_signal = CaseSignalFactory(sync_state=CaseSignal.SYNC_COMPLETED)
+        sync_case(case_signal.pk)
+        self.assertFalse(mock.called)
+
+    @requests_mock.Mocker()
+    def test_sync_case_error(self, mock):
+        self.get_mock(mock, 'zrc_openapi')
+        self.post_mock(mock, 'zrc_zaak_create')
+        self.post_error_mock(mock, 'zrc_zaakobject_create')
+
+        signal = SignalFactory()
+        case_signal = CaseSignal.actions.request_sync(signal)
+        with patch.object(sync_case, 'apply_async') as patched_apply_async:
+            sync_case(case_signal.pk)
+
+        # The case is created and stored, connecting it is retried later
+        case_signal.refresh_from_db()
+        self.assertEqual(case_signal.sync_state, CaseSignal.SYNC_CASE_CREATED)
+        self.assertIsNotNone(case_signal.zrc_link)
+        self.assertEqual(case_signal.sync_attempts, 1)
+        self.assertGreater(case_signal.next_sync_at, timezone.now())
+        self.assertIsNone(case_signal.sync_locked_until)
+        patched_apply_async.assert_called_once_with((case_signal.pk, ),
+                                                    eta=case_signal.next_sync_at)
+
+    @requests_mock.Mocker()
+    def test_sync_case_claimed(self, mock):
+        signal = SignalFactory()
+        case_signal = CaseSignal.actions.request_sync(signal)
+        self.assertIsNotNone(CaseSignal.actions.claim_sync(case_signal.pk, lease=60))
+
+        # Another worker syncs the case, until its lease expired
+        sync_case(case_signal.pk)
+        self.assertFalse(mock.called)
+        self.assertFalse(CaseSignal.actions.pending().exists())
+
+    @requests_mock.Mocker()
+    def test_sync_pending_cases(self, mock):
+        self.mock_sync(mock)
+
+        case_signals = [CaseSignal.actions.request_sync(signal)
+                        for signal in SignalFactory.create_batch(3)]
+        self.assertEqual(sync_pending_cases(batch_size=2), [])
+
+        for case_signal in case_signals:
+            case_signal.refresh_from_db()
+            self.assertEqual(case_signal.sync_state, CaseSignal.SYNC_COMPLETED)